@@ -0,0 +1,36 @@
+"""
+Models used by the benchmarks.
+"""
+
+from django.db import models
+import multilingual
+
+
+class Item(models.Model):
+    number = models.IntegerField()
+
+    class Translation(multilingual.Translation):
+        title = models.CharField(max_length=200)
+        slug = models.SlugField()
+        content = models.TextField(blank=True)
+
+    class Meta:
+        ordering = ('number',)
+
+
+class JSONItem(models.Model):
+    """
+    An Item with the translations stored in a JSON document.
+    """
+    number = models.IntegerField()
+
+    class Translation(multilingual.Translation):
+        title = models.CharField(max_length=200)
+        slug = models.SlugField()
+        content = models.TextField(blank=True)
+
+        class Meta:
+            storage = 'json'
+
+    class Meta:
+        ordering = ('number',)
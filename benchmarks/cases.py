@@ -0,0 +1,190 @@
+"""
+The benchmarked operations.
+
+Every case is a function taking a dictionary describing the benchmark
+environment (number of rows and languages, the benchmarked model) and
+returning a callable; the setup is done once, only the returned callable
+is timed.
+"""
+
+import itertools
+from types import ClassType
+
+from django.db import connection, models, transaction
+from django.utils import simplejson
+
+import multilingual
+from multilingual.bulk import save_translations
+from multilingual.languages import (get_language_code,
+                                    get_translation_column_name,
+                                    set_default_language)
+
+from benchmarks.bench_app.models import Item, JSONItem
+
+CASES = []
+
+# the benchmarked models, by translation storage
+MODELS = {
+    'table': Item,
+    'json': JSONItem,
+    }
+
+
+def case(func):
+    """
+    Register a benchmark case.
+    """
+    CASES.append(func)
+    return func
+
+
+@case
+def queryset_compilation(env):
+    model = env['model']
+    def run():
+        qs = model.objects.filter(title__startswith='item 1').order_by('title')
+        qs.query.as_sql()
+    return run
+
+
+@case
+def iteration(env):
+    model = env['model']
+    # translations stored in the master table are loaded with it
+    fill = getattr(model, 'fill_translation_cache', lambda item: None)
+    def run():
+        for item in model.objects.all():
+            fill(item)
+    return run
+
+
+@case
+def proxy_reads(env):
+    items = list(env['model'].objects.all())
+    names = [get_translation_column_name('title', lang)
+             for lang in range(1, env['languages'] + 1)]
+    def run():
+        for item in items:
+            item.title
+            item.content
+            for name in names:
+                getattr(item, name)
+    return run
+
+
+@case
+def save(env):
+    items = list(env['model'].objects.all()[:100])
+    state = {'counter': 0}
+    def run():
+        state['counter'] += 1
+        for item in items:
+            item.title = 'item %s (%s)' % (item.number, state['counter'])
+            item.save()
+    return run
+
+
+@case
+def filter_translated(env):
+    model = env['model']
+    def run():
+        list(model.objects.filter(title__startswith='item 1'))
+    return run
+
+
+@case
+def order_translated(env):
+    model = env['model']
+    def run():
+        list(model.objects.order_by('-title')[:50])
+    return run
+
+
+@case
+def count(env):
+    model = env['model']
+    def run():
+        model.objects.count()
+        model.objects.filter(title__startswith='item 1').count()
+    return run
+
+
+# model names must be unique, or Django returns the existing models
+_model_numbers = itertools.count(1)
+
+
+def define_model():
+    fields = {}
+    for i in range(20):
+        fields['field%d' % i] = models.CharField(max_length=100)
+    return models.base.ModelBase('StartupItem%d' % _model_numbers.next(),
+                                 (models.Model,), {
+        '__module__': Item.__module__,
+        'Translation': ClassType('Translation', (multilingual.Translation,),
+                                 fields),
+        })
+
+
+@case
+def model_creation(env):
+    """
+    Define a multilingual model with 20 translated fields, as done
+    for every model when applications are loaded.
+    """
+    return define_model
+
+
+@case
+def model_first_use(env):
+    """
+    Define a multilingual model and create its first instance.
+    """
+    def run():
+        define_model()()
+    return run
+
+
+def populate(model, rows, languages):
+    """
+    Create `rows` objects of model, translated to all the languages.
+    """
+    set_default_language(1)
+    cursor = connection.cursor()
+    qn = connection.ops.quote_name
+    opts = model._meta
+    if hasattr(opts, 'translation_document'):
+        # the documents are filled in below, once all the IDs are known
+        cursor.executemany('INSERT INTO %s (%s, %s) VALUES (%%s, %%s)' % (
+            qn(opts.db_table), qn(opts.get_field('number').column),
+            qn(opts.translation_document_field.column)),
+                           [(number, '{}') for number in range(rows)])
+    else:
+        cursor.executemany('INSERT INTO %s (%s) VALUES (%%s)' % (
+            qn(opts.db_table), qn(opts.get_field('number').column)),
+                           [(number,) for number in range(rows)])
+    transaction.commit_unless_managed()
+    master_ids = model.objects.values_list('id', flat=True)
+    values = {}
+    for language_id in range(1, languages + 1):
+        code = get_language_code(language_id)
+        values[code] = {}
+        for number, master_id in enumerate(master_ids):
+            values[code][master_id] = {
+                'title': 'item %s' % number,
+                'slug': 'item-%s-%s' % (number, code),
+                'content': 'Content of item %s in %s.' % (number, code),
+                }
+        if hasattr(opts, 'translation_model'):
+            save_translations(model, language_id, values.pop(code))
+
+    if hasattr(opts, 'translation_document'):
+        documents = {}
+        for code, translations in values.items():
+            for master_id, field_values in translations.items():
+                documents.setdefault(master_id, {})[code] = field_values
+        cursor.executemany('UPDATE %s SET %s = %%s WHERE %s = %%s' % (
+            qn(opts.db_table), qn(opts.translation_document_field.column),
+            qn(opts.pk.column)),
+                           [(simplejson.dumps(document), master_id)
+                            for master_id, document in documents.items()])
+        transaction.commit_unless_managed()
@@ -0,0 +1,46 @@
+#!/usr/bin/env python
+"""
+Compare two result files written by run.py.
+
+Usage:
+
+    python benchmarks/compare.py before.json after.json
+
+For every language count and case prints the best times of both runs
+and their ratio; ratios above 1 mean that the second run was slower.
+"""
+
+import sys
+
+from django.utils import simplejson
+
+
+def load(filename):
+    f = open(filename)
+    try:
+        return simplejson.load(f)['results']
+    finally:
+        f.close()
+
+
+def main():
+    if len(sys.argv) != 3:
+        sys.exit(__doc__.strip())
+    before, after = load(sys.argv[1]), load(sys.argv[2])
+    print '%-10s %-22s %12s %12s %8s' % ('languages', 'case', 'before',
+                                         'after', 'ratio')
+    for count in sorted(before, key=int):
+        if count not in after:
+            continue
+        for name in sorted(before[count]):
+            if name not in after[count]:
+                continue
+            old = before[count][name]['min']
+            new = after[count][name]['min']
+            ratio = old and new / old or 0
+            print '%-10s %-22s %12.6f %12.6f %8.2f' % (count, name, old,
+                                                       new, ratio)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,124 @@
+#!/usr/bin/env python
+"""
+Run the django-multilingual benchmarks.
+
+Usage (from the directory containing this file's parent):
+
+    python benchmarks/run.py --languages=3,10,50 --rows=1000 --output=out.json
+
+Every language count is benchmarked in a separate process, with a fresh
+in-memory sqlite database.  The results are written as JSON: for every
+language count and every case the best, mean and worst time of the
+repeated runs, in seconds.
+
+--storage=json benchmarks a model storing its translations in a JSON
+document instead of the translation table; compare the two result files
+with compare.py.
+"""
+
+import os
+import sys
+import time
+from optparse import OptionParser
+from subprocess import Popen, PIPE
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def run_worker(options):
+    """
+    Run all the cases in the current process and write the results to
+    stdout.
+    """
+    from django.core.management import call_command
+    from django.utils import simplejson
+    from benchmarks import cases
+
+    call_command('syncdb', verbosity=0, interactive=False)
+    env = {'rows': options.rows, 'languages': int(options.languages),
+           'model': cases.MODELS[options.storage]}
+    cases.populate(env['model'], env['rows'], env['languages'])
+
+    results = {}
+    for func in cases.CASES:
+        if options.cases and func.__name__ not in options.cases:
+            continue
+        bench = func(env)
+        timings = []
+        for i in range(options.repeat):
+            start = time.time()
+            bench()
+            timings.append(time.time() - start)
+        results[func.__name__] = {
+            'min': min(timings),
+            'mean': sum(timings) / len(timings),
+            'max': max(timings),
+            }
+    sys.stdout.write(simplejson.dumps(results))
+
+
+def main():
+    parser = OptionParser(usage='%prog [options]')
+    parser.add_option('-l', '--languages', default='3,10,50',
+                      help='comma-separated language counts (3 or more)')
+    parser.add_option('-r', '--rows', type='int', default=1000,
+                      help='number of multilingual objects')
+    parser.add_option('-n', '--repeat', type='int', default=5,
+                      help='number of timed runs of every case')
+    parser.add_option('-s', '--storage', type='choice',
+                      choices=('table', 'json'), default='table',
+                      help=('the translation storage of the benchmarked '
+                            'model: table (default) or json'))
+    parser.add_option('-c', '--case', action='append', dest='cases',
+                      default=[], help='run only this case (repeatable)')
+    parser.add_option('-o', '--output',
+                      help='write the results to this file instead of stdout')
+    parser.add_option('--worker', action='store_true',
+                      help=('internal: run the benchmarks in this process '
+                            'for a single language count'))
+    options, args = parser.parse_args()
+
+    sys.path.insert(0, ROOT)
+    if options.worker:
+        run_worker(options)
+        return
+
+    # simplejson is usable without configured Django settings
+    from django.utils import simplejson
+
+    results = {}
+    for count in options.languages.split(','):
+        count = int(count)
+        sys.stderr.write('Running benchmarks for %d languages...\n' % count)
+        environ = os.environ.copy()
+        environ['DJANGO_SETTINGS_MODULE'] = 'benchmarks.settings'
+        environ['MULTILINGUAL_BENCH_LANGUAGES'] = str(count)
+        environ['PYTHONPATH'] = os.pathsep.join(
+            [ROOT] + filter(None, [environ.get('PYTHONPATH')]))
+        args = [sys.executable, os.path.abspath(__file__), '--worker',
+                '--languages=%d' % count, '--rows=%d' % options.rows,
+                '--repeat=%d' % options.repeat,
+                '--storage=%s' % options.storage]
+        args += ['--case=%s' % name for name in options.cases]
+        worker = Popen(args, stdout=PIPE, env=environ)
+        output = worker.communicate()[0]
+        if worker.returncode:
+            sys.exit('The benchmarks for %d languages failed.' % count)
+        results[str(count)] = simplejson.loads(output)
+
+    data = simplejson.dumps({'rows': options.rows,
+                             'repeat': options.repeat,
+                             'storage': options.storage,
+                             'results': results}, indent=2)
+    if options.output:
+        f = open(options.output, 'w')
+        try:
+            f.write(data)
+        finally:
+            f.close()
+    else:
+        sys.stdout.write(data)
+
+
+if __name__ == '__main__':
+    main()
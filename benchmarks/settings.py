@@ -0,0 +1,32 @@
+"""
+Settings for the benchmarks: the bundled testproject settings with an
+in-memory database and a configurable number of languages.
+
+The number of languages is read from the MULTILINGUAL_BENCH_LANGUAGES
+environment variable; run.py sets it for every benchmark process.
+"""
+
+import os
+
+from testproject.settings import *
+
+DEBUG = False
+TEMPLATE_DEBUG = False
+
+DATABASE_ENGINE = 'sqlite3'
+DATABASE_NAME = ':memory:'
+
+# the first three languages are the ones used by testproject, so that
+# MULTILINGUAL_FALLBACK_LANGUAGES stays valid
+LANGUAGE_COUNT = max(3, int(os.environ.get('MULTILINGUAL_BENCH_LANGUAGES', 3)))
+LANGUAGES = LANGUAGES[:3] + [['x%02d' % i, 'Language %d' % i]
+                             for i in range(4, LANGUAGE_COUNT + 1)]
+
+MIDDLEWARE_CLASSES = ()
+
+INSTALLED_APPS = (
+    'django.contrib.auth',
+    'django.contrib.contenttypes',
+    'multilingual',
+    'benchmarks.bench_app',
+)
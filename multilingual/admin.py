@@ -1,10 +1,22 @@
+from django import template
 from django.contrib import admin
-from django.forms.models import BaseInlineFormSet
+from django.contrib.admin import helpers
+from django.contrib.admin.util import unquote
+from django.core.exceptions import PermissionDenied
+from django.core.paginator import Paginator, InvalidPage
+from django.db import models
+from django.forms.models import BaseInlineFormSet, model_to_dict
 from django.forms.fields import BooleanField
 from django.forms.formsets import DELETION_FIELD_NAME
 from django.forms.util import ErrorDict
+from django.http import Http404, HttpResponseRedirect
+from django.shortcuts import render_to_response
+from django.utils.encoding import force_unicode
 from django.utils.translation import ugettext as _
 
+from multilingual.bulk import (get_translated_field_names,
+                               get_translation_values, save_translations)
+from multilingual.exceptions import LanguageDoesNotExist
 from multilingual.languages import *
 from multilingual.utils import is_multilingual_model
 
@@ -42,7 +54,16 @@ def _translation_form_full_clean(self, previous_full_clean):
 
 class TranslationInlineFormSet(BaseInlineFormSet):
 
+    # set by TranslationModelAdmin.get_formset
+    lazy_languages = False
+
     def _construct_forms(self):
+        if self.is_bound and self.lazy_languages:
+            # we will add data for the translations that were not
+            # loaded in the browser
+            self.data = self.data.copy()
+            self._unloaded_forms = set()
+
         ## set the right default values for language_ids of empty (new) forms
         super(TranslationInlineFormSet, self)._construct_forms()
 
@@ -62,7 +83,63 @@ class TranslationInlineFormSet(BaseInlineFormSet):
             if form is None:
                 form = empty_forms.pop(0)
                 form.initial['language_id'] = language_id
-    
+
+        if self.lazy_languages:
+            self._mark_loaded_forms()
+
+    def _construct_form(self, i, **kwargs):
+        if (self.is_bound and self.lazy_languages
+            and i < self.initial_form_count()
+            and '%s-language_id' % self.add_prefix(i) not in self.data):
+            # the form of an existing translation that was not loaded
+            # in the browser: the formset reads its primary key from
+            # the data, so the saved values have to be there before
+            # the form is built
+            self._unloaded_forms.add(i)
+            instance = self.get_queryset()[i]
+            self._set_data(self.add_prefix(i), model_to_dict(instance))
+            self.data[self.add_prefix(i) + '-' + instance._meta.pk.name] = \
+                instance._get_pk_val()
+        return super(TranslationInlineFormSet, self)._construct_form(i,
+                                                                     **kwargs)
+
+    def _set_data(self, prefix, values):
+        for name, value in values.items():
+            if value is None:
+                continue
+            key = '%s-%s' % (prefix, name)
+            if (isinstance(value, (list, tuple))
+                and hasattr(self.data, 'setlist')):
+                self.data.setlist(key, value)
+            else:
+                self.data[key] = value
+
+    def _mark_loaded_forms(self):
+        """
+        Mark the forms that have to be rendered with the change form.
+
+        Only the form for the default language is rendered at first.
+        Other forms are fetched by the browser on demand and submitted
+        only if they were fetched; the forms that were not submitted
+        get their initial values as data, so they are left untouched
+        when the formset is saved.
+        """
+        default_language_id = get_default_language()
+        for i, form in enumerate(self.forms):
+            if not self.is_bound:
+                form.is_loaded = (form.initial['language_id'] ==
+                                  default_language_id)
+            elif i in self._unloaded_forms:
+                # the data were set by _construct_form
+                form.is_loaded = False
+            elif form.add_prefix('language_id') in self.data:
+                form.is_loaded = True
+            else:
+                form.is_loaded = False
+                self._set_data(form.prefix, dict([
+                            (name, form.initial.get(name, field.initial))
+                            for name, field in form.fields.items()]))
+
     def add_fields(self, form, index):
         super(TranslationInlineFormSet, self).add_fields(form, index)
 
@@ -73,11 +150,26 @@ class TranslationInlineFormSet(BaseInlineFormSet):
 
 class TranslationModelAdmin(admin.StackedInline):
     template = "admin/edit_inline_translations_newforms.html"
+    lazy_template = "admin/edit_inline_translations_lazy.html"
     fk_name = 'master'
     extra = get_language_count()
     max_num = get_language_count()
     formset = TranslationInlineFormSet
 
+    # If True, the change form contains only the translation in the
+    # default language; the other ones are loaded on demand.
+    lazy_languages = False
+
+    def __init__(self, parent_model, admin_site):
+        super(TranslationModelAdmin, self).__init__(parent_model, admin_site)
+        if self.lazy_languages:
+            self.template = self.lazy_template
+
+    def get_formset(self, request, obj=None):
+        formset = super(TranslationModelAdmin, self).get_formset(request, obj)
+        formset.lazy_languages = self.lazy_languages
+        return formset
+
 
 class ModelAdminClass(admin.ModelAdmin.__metaclass__):
     """
@@ -99,7 +191,62 @@ class ModelAdmin(admin.ModelAdmin):
     instead of django.contrib.admin.ModelAdmin.
     """
     __metaclass__ = ModelAdminClass
-    
+
+    # If True, search_fields that refer to translated fields without a
+    # language suffix match translations in all the languages instead
+    # of the default one only.
+    search_all_languages = False
+
+    def changelist_view(self, request, extra_context=None):
+        # the change list reads its objects from the queryset method of
+        # the admin, which is changelist_queryset for this copy (not
+        # made with copy.copy, which would call the __new__ installed
+        # by install_multilingual_modeladmin_new)
+        changelist_admin = object.__new__(self.__class__)
+        changelist_admin.__dict__.update(self.__dict__)
+        changelist_admin.queryset = self.changelist_queryset
+        return super(ModelAdmin, changelist_admin).changelist_view(
+            request, extra_context)
+
+    def changelist_queryset(self, request):
+        """
+        Return the queryset of objects displayed by the change list.
+
+        Only the translations in the languages of get_list_language_ids
+        are loaded, so the objects must not be used by other views; if
+        search_all_languages is set, translated search_fields match
+        all the languages.
+        """
+        qs = self.queryset(request)
+        if not (hasattr(qs, 'with_languages')
+                and is_multilingual_model(self.model)):
+            # not a multilingual manager, or translations stored in
+            # columns, which are always loaded
+            return qs
+        qs = qs.with_languages(*self.get_list_language_ids(request))
+        if self.search_all_languages:
+            qs = qs.any_language()
+        return qs
+
+    def get_list_language_ids(self, request):
+        """
+        Return the IDs of languages whose translations are loaded with
+        the objects displayed by this admin: the default language, its
+        fallbacks and the languages of translated fields in
+        list_display.
+        """
+        trans_fields = self.model._meta.translation_model._meta.translated_fields
+        language_ids = get_fallback_language_ids(get_default_language())
+        for field_name in self.list_display:
+            if not isinstance(field_name, basestring):
+                continue
+            if field_name.endswith(FALLBACK_FIELD_SUFFIX):
+                field_name = field_name[:-len(FALLBACK_FIELD_SUFFIX)]
+            field_and_lang = trans_fields.get(field_name)
+            if field_and_lang and field_and_lang[1] not in language_ids + [None]:
+                language_ids.append(field_and_lang[1])
+        return language_ids
+
     def _media(self):
         media = super(ModelAdmin, self)._media()
         if getattr(self.__class__, '_dm_prepopulated_fields', None):
@@ -150,6 +297,171 @@ class ModelAdmin(admin.ModelAdmin):
         return super(ModelAdmin, self).render_change_form(request, context,
             add, change, form_url, obj)
 
+    def __call__(self, request, url):
+        # add the URLs of multilingual views:
+        #  * <object_id>/translations/<language_code>/
+        #  * add/translations/<language_code>/
+        #  * translate/
+        if url is not None:
+            bits = url.rstrip('/').split('/')
+            if len(bits) == 3 and bits[1] == 'translations':
+                return self.translation_form_view(request, bits[0], bits[2])
+            if bits == ['translate']:
+                return self.translation_grid_view(request)
+        return super(ModelAdmin, self).__call__(request, url)
+
+    def translation_form_view(self, request, object_id, language_code):
+        """
+        Render the translation form for a single language.
+
+        Used by TranslationModelAdmin with lazy_languages to load the
+        translations on demand.
+        """
+        if object_id == 'add':
+            if not self.has_add_permission(request):
+                raise PermissionDenied
+            obj = None
+        else:
+            try:
+                obj = self.queryset(request).get(pk=unquote(object_id))
+            except self.model.DoesNotExist:
+                raise Http404
+            if not self.has_change_permission(request, obj):
+                raise PermissionDenied
+
+        try:
+            language_id = get_language_id_from_id_or_code(language_code)
+        except LanguageDoesNotExist:
+            raise Http404
+
+        for inline in self.inline_instances:
+            if isinstance(inline, TranslationModelAdmin):
+                break
+        else:
+            raise Http404
+
+        FormSet = inline.get_formset(request, obj)
+        formset = FormSet(instance=obj or self.model())
+        fieldsets = list(inline.get_fieldsets(request, obj))
+        inline_admin_formset = helpers.InlineAdminFormSet(inline, formset,
+                                                          fieldsets)
+        for inline_admin_form in inline_admin_formset:
+            if inline_admin_form.form.initial['language_id'] == language_id:
+                break
+        else:
+            raise Http404
+
+        context = {
+            'inline_admin_formset': inline_admin_formset,
+            'inline_admin_form': inline_admin_form,
+        }
+        return render_to_response("admin/edit_inline_translation_form.html",
+            context, context_instance=template.RequestContext(request))
+
+    def translation_grid_view(self, request):
+        """
+        Edit the translations of many objects in one language.
+
+        Displays a page of objects with their translated fields in the
+        source language next to editable fields in the target language.
+        Changed values are saved with multilingual.bulk, so neither
+        the objects nor their translations are saved one by one.
+        """
+        if not self.has_change_permission(request, None):
+            raise PermissionDenied
+
+        opts = self.model._meta
+        trans_opts = opts.translation_model._meta
+        field_names = get_translated_field_names(self.model)
+        try:
+            source_id = get_language_id_from_id_or_code(
+                request.REQUEST.get('source') or get_default_language())
+            target = request.REQUEST.get('target')
+            if not target:
+                other_ids = [l for l in get_language_id_list()
+                             if l != source_id]
+                if not other_ids:
+                    # there is nothing to translate to
+                    raise Http404
+                target = other_ids[0]
+            target_id = get_language_id_from_id_or_code(target)
+        except LanguageDoesNotExist:
+            raise Http404
+
+        if request.method == 'POST':
+            values = {}
+            for key, value in request.POST.items():
+                if not key.startswith('t-') or '-' not in key[2:]:
+                    continue
+                master_id, field_name = key[2:].rsplit('-', 1)
+                try:
+                    master_id = int(master_id)
+                except ValueError:
+                    continue
+                if field_name in field_names:
+                    values.setdefault(master_id, {})[field_name] = value
+            # only the objects this admin may show can be changed
+            allowed_ids = set(self.queryset(request).filter(
+                    pk__in=values.keys()).values_list('pk', flat=True))
+            for master_id in values.keys():
+                if master_id not in allowed_ids:
+                    del values[master_id]
+            current = get_translation_values(self.model, target_id,
+                                             values.keys())
+            changed = {}
+            for master_id, field_values in values.items():
+                old_values = current.get(master_id)
+                if old_values is None:
+                    # do not create empty translations
+                    if [v for v in field_values.values() if v]:
+                        changed[master_id] = field_values
+                    continue
+                for field_name, value in field_values.items():
+                    if value != (old_values[field_name] or ''):
+                        changed.setdefault(master_id, {})[field_name] = value
+            save_translations(self.model, target_id, changed)
+            if changed:
+                request.user.message_set.create(
+                    message=_('The translations of %(count)d objects were '
+                              'saved.') % {'count': len(changed)})
+            return HttpResponseRedirect(request.get_full_path())
+
+        queryset = self.queryset(request).with_languages(source_id, target_id)
+        paginator = Paginator(queryset.order_by('pk'), self.list_per_page)
+        try:
+            page = paginator.page(int(request.GET.get('p', 1)))
+        except (ValueError, InvalidPage):
+            raise Http404
+
+        rows = []
+        for obj in page.object_list:
+            cells = []
+            for field_name in field_names:
+                field = trans_opts.get_field(field_name)
+                cells.append({
+                    'name': 't-%s-%s' % (obj._get_pk_val(), field_name),
+                    'source': getattr(obj, 'get_' + field_name)(source_id),
+                    'target': getattr(obj, 'get_' + field_name)(target_id),
+                    'multiline': isinstance(field, models.TextField),
+                    })
+            rows.append({'object': obj, 'cells': cells})
+
+        context = {
+            'title': _('Translate %s') % force_unicode(opts.verbose_name_plural),
+            'opts': opts,
+            'app_label': opts.app_label,
+            'root_path': self.admin_site.root_path,
+            'fields': [trans_opts.get_field(f).verbose_name for f in field_names],
+            'languages': get_language_choices(),
+            'source_id': source_id,
+            'target_id': target_id,
+            'rows': rows,
+            'page': page,
+            'paginator': paginator,
+        }
+        return render_to_response("admin/translation_grid.html",
+            context, context_instance=template.RequestContext(request))
+
 
 def get_translation_modeladmin(cls, model):
     if hasattr(cls, 'Translation'):
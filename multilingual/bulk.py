@@ -0,0 +1,244 @@
+"""
+Django-multilingual: saving translations of many objects at once.
+
+The functions here write directly to the translation tables, without
+creating translation model instances and without sending any model
+signals; only the translation version stamp and the denormalized
+fields of the objects are updated.
+"""
+
+from django.db import connection, transaction
+
+from multilingual.cache import bump_translation_version
+from multilingual.languages import get_language_id_from_id_or_code
+from multilingual.utils import get_translation_model
+
+# the maximum number of master IDs used in a single IN clause
+CHUNK_SIZE = 500
+
+
+def get_translation_values(model, language_id_or_code, master_ids,
+                           field_names=None):
+    """
+    Return a dictionary mapping master IDs to dictionaries of
+    translated field values in the given language.
+
+    Objects without a translation in that language are not included.
+    """
+    language_id = get_language_id_from_id_or_code(language_id_or_code)
+    trans_model = get_translation_model(model._meta, language_id)
+    if field_names is None:
+        field_names = get_translated_field_names(model)
+    master_ids = list(master_ids)
+
+    result = {}
+    for start in range(0, len(master_ids), CHUNK_SIZE):
+        translations = trans_model._default_manager.filter(
+            language_id=language_id,
+            master__in=master_ids[start:start + CHUNK_SIZE])
+        for row in translations.values('master', *field_names):
+            master_id = row.pop('master')
+            result[master_id] = row
+    return result
+
+
+def get_translated_field_names(model):
+    """
+    Return the names of translated fields of model, in the order of
+    their definition.
+    """
+    trans_opts = model._meta.translation_model._meta
+    return [f.name for f in trans_opts.fields
+            if f.name in trans_opts.translated_fields]
+
+
+def save_translations(model, language_id_or_code, values):
+    """
+    Save translations of many objects of model in one language.
+
+    `values` maps master IDs to dictionaries of translated field
+    values.  Existing translations are updated and the missing ones
+    are inserted; all the rows are written with one executemany call
+    per distinct set of fields.
+
+    Returns a tuple (number of updated rows, number of inserted rows).
+    """
+    language_id = get_language_id_from_id_or_code(language_id_or_code)
+    trans_model = get_translation_model(model._meta, language_id)
+    opts = trans_model._meta
+    qn = connection.ops.quote_name
+    master_column = opts.get_field('master').column
+    language_column = opts.get_field('language_id').column
+
+    existing = get_translation_values(model, language_id, values.keys(),
+                                      field_names=[])
+
+    updates = {}
+    inserts = []
+    for master_id, field_values in values.items():
+        if master_id in existing:
+            names = field_values.keys()
+            names.sort()
+            if not names:
+                continue
+            params = [opts.get_field(name).get_db_prep_save(field_values[name])
+                      for name in names]
+            updates.setdefault(tuple(names), []).append(
+                params + [master_id, language_id])
+        else:
+            inserts.append((master_id, field_values))
+
+    cursor = connection.cursor()
+    for names, rows in updates.items():
+        sql = 'UPDATE %s SET %s WHERE %s = %%s AND %s = %%s' % (
+            qn(opts.db_table),
+            ', '.join(['%s = %%s' % qn(opts.get_field(name).column)
+                       for name in names]),
+            qn(master_column),
+            qn(language_column))
+        cursor.executemany(sql, rows)
+
+    if inserts:
+        fields = [f for f in opts.local_fields
+                  if f.name not in ('master', 'language_id')
+                  and f is not opts.pk]
+        sql = 'INSERT INTO %s (%s) VALUES (%s)' % (
+            qn(opts.db_table),
+            ', '.join([qn(master_column), qn(language_column)] +
+                      [qn(f.column) for f in fields]),
+            ', '.join(['%s'] * (len(fields) + 2)))
+        rows = []
+        for master_id, field_values in inserts:
+            row = [master_id, language_id]
+            for f in fields:
+                value = field_values.get(f.name, f.get_default())
+                row.append(f.get_db_prep_save(value))
+            rows.append(row)
+        cursor.executemany(sql, rows)
+
+    if language_id == model._meta.primary_language_id:
+        update_denormalized_fields(model, values.keys())
+
+    transaction.commit_unless_managed()
+    if updates or inserts:
+        bump_translation_version(model)
+    return (sum([len(rows) for rows in updates.values()]), len(inserts))
+
+
+def update_denormalized_fields(model, master_ids=None):
+    """
+    Copy the translations in the primary language to the denormalized
+    fields of objects of model (see Translation.Meta.denormalize), for
+    the given master IDs or for all the objects.
+
+    Returns the number of updated objects.
+    """
+    opts = model._meta
+    if not opts.denormalized_fields:
+        return 0
+    trans_opts = get_translation_model(opts, opts.primary_language_id)._meta
+    qn = connection.ops.quote_name
+    master_table = qn(opts.db_table)
+    trans_table = qn(trans_opts.db_table)
+    pk_column = '%s.%s' % (master_table, qn(opts.pk.column))
+
+    assignments = []
+    for fname, field in opts.denormalized_fields.items():
+        assignments.append(
+            '%s = (SELECT %s.%s FROM %s WHERE %s.%s = %s AND %s.%s = %d)' % (
+                qn(field.column), trans_table,
+                qn(trans_opts.get_field(fname).column), trans_table,
+                trans_table, qn(trans_opts.get_field('master').column),
+                pk_column, trans_table,
+                qn(trans_opts.get_field('language_id').column),
+                opts.primary_language_id))
+    sql = 'UPDATE %s SET %s' % (master_table, ', '.join(assignments))
+
+    cursor = connection.cursor()
+    if master_ids is None:
+        cursor.execute(sql)
+        updated = cursor.rowcount
+    else:
+        master_ids = list(master_ids)
+        updated = 0
+        for start in range(0, len(master_ids), CHUNK_SIZE):
+            chunk = master_ids[start:start + CHUNK_SIZE]
+            cursor.execute('%s WHERE %s IN (%s)' % (
+                    sql, pk_column, ', '.join(['%s'] * len(chunk))), chunk)
+            updated += cursor.rowcount
+    transaction.commit_unless_managed()
+    return updated
+
+
+def copy_translations(model, source_language, target_language,
+                      chunk_size=CHUNK_SIZE, callback=None):
+    """
+    Copy the translations of objects of model in source_language to
+    target_language, for the objects that are not translated to
+    target_language yet.
+
+    Every chunk of chunk_size objects is copied with one INSERT ...
+    SELECT statement and committed, so an interrupted copy can be
+    restarted.  callback, if given, is called after every chunk with
+    the number of rows inserted so far.
+
+    Returns the number of inserted rows.
+    """
+    source_id = get_language_id_from_id_or_code(source_language)
+    target_id = get_language_id_from_id_or_code(target_language)
+    opts = model._meta
+    source_opts = get_translation_model(opts, source_id)._meta
+    target_opts = get_translation_model(opts, target_id)._meta
+    qn = connection.ops.quote_name
+    source_table = qn(source_opts.db_table)
+    target_table = qn(target_opts.db_table)
+    source_master = qn(source_opts.get_field('master').column)
+    source_language_column = qn(source_opts.get_field('language_id').column)
+    target_master = qn(target_opts.get_field('master').column)
+    target_language_column = qn(target_opts.get_field('language_id').column)
+    fields = [f for f in target_opts.local_fields
+              if f.name not in ('master', 'language_id')
+              and f is not target_opts.pk]
+
+    select_ids_sql = ('SELECT %s FROM %s WHERE %s = %d%%s ORDER BY %s '
+                      'LIMIT %d' % (source_master, source_table,
+                                    source_language_column, source_id,
+                                    source_master, chunk_size))
+    insert_sql = ('INSERT INTO %s (%s) SELECT %s FROM %s WHERE %s = %d '
+                  'AND %s >= %%s AND %s <= %%s AND NOT EXISTS '
+                  '(SELECT 1 FROM %s existing WHERE existing.%s = %s.%s '
+                  'AND existing.%s = %d)' % (
+            target_table,
+            ', '.join([target_master, target_language_column] +
+                      [qn(f.column) for f in fields]),
+            ', '.join(['%s.%s' % (source_table, source_master), str(target_id)] +
+                      ['%s.%s' % (source_table,
+                                  qn(source_opts.get_field(f.name).column))
+                       for f in fields]),
+            source_table, source_language_column, source_id,
+            source_master, source_master,
+            target_table, target_master, source_table, source_master,
+            target_language_column, target_id))
+
+    cursor = connection.cursor()
+    cursor.execute(select_ids_sql % '')
+    inserted = 0
+    while True:
+        master_ids = [row[0] for row in cursor.fetchall()]
+        if not master_ids:
+            break
+        cursor.execute(insert_sql, [master_ids[0], master_ids[-1]])
+        inserted += cursor.rowcount
+        if target_id == opts.primary_language_id:
+            update_denormalized_fields(model, master_ids)
+        transaction.commit_unless_managed()
+        if callback is not None:
+            callback(inserted)
+        if len(master_ids) < chunk_size:
+            break
+        cursor.execute(select_ids_sql % (' AND %s > %%s' % source_master),
+                       [master_ids[-1]])
+
+    if inserted:
+        bump_translation_version(model)
+    return inserted
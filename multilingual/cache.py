@@ -0,0 +1,59 @@
+"""
+Django-multilingual: version stamps of translation models.
+
+Every translation model has a version number stored in the cache.  It
+changes whenever a translation is saved or deleted, so it can be made a
+part of cache keys of anything built from translated content.
+"""
+
+import time
+
+from django.core.cache import cache
+
+VERSION_KEY = 'multilingual.version.%s.%s'
+
+# version stamps should not expire, but some cache backends do not
+# accept a timeout of 0
+VERSION_TIMEOUT = 60 * 60 * 24 * 30
+
+
+def _get_version_key(model):
+    opts = model._meta
+    if hasattr(opts, 'translation_model'):
+        opts = opts.translation_model._meta
+    if hasattr(opts, 'partition_of'):
+        opts = opts.partition_of._meta
+    return VERSION_KEY % (opts.app_label, opts.object_name.lower())
+
+
+def get_translation_version(model):
+    """
+    Return the current version stamp of translations of model.
+
+    `model` may be a multilingual model, its translation model or one
+    of the per-language models of a partitioned translation table.
+    """
+    key = _get_version_key(model)
+    version = cache.get(key)
+    if version is None:
+        # start from the current time, so that a version stamp that
+        # was evicted from the cache will not be reused
+        version = int(time.time())
+        cache.add(key, version, VERSION_TIMEOUT)
+        version = cache.get(key, version)
+    return version
+
+
+def bump_translation_version(model):
+    """
+    Change the version stamp of translations of model.
+    """
+    key = _get_version_key(model)
+    cache.set(key, get_translation_version(model) + 1, VERSION_TIMEOUT)
+
+
+def translation_changed(sender, **kwargs):
+    """
+    A post_save and post_delete signal handler for translation models.
+    """
+    bump_translation_version(sender)
@@ -1,11 +1,21 @@
+from django.utils.functional import lazy
+
 from multilingual.languages import (
     get_language_code_list,
     get_default_language_code)
 
+# LANGUAGES does not change while the process is running
+LANGUAGE_CODES = get_language_code_list()
+
+# the code of the default language, looked up when a template uses it
+lazy_default_language_code = lazy(get_default_language_code, unicode)
+
 
 def multilingual(request):
     """
     Returns context variables containing information about available languages.
+
+    DEFAULT_LANGUAGE_CODE is evaluated only if a template uses it.
     """
-    return {'LANGUAGE_CODES': get_language_code_list(),
-            'DEFAULT_LANGUAGE_CODE': get_default_language_code()}
+    return {'LANGUAGE_CODES': LANGUAGE_CODES,
+            'DEFAULT_LANGUAGE_CODE': lazy_default_language_code()}
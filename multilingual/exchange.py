@@ -0,0 +1,350 @@
+"""
+Django-multilingual: exchanging translations with translators as XLIFF
+and PO files.
+
+Every translated field of an object is one translation unit, with an
+ID of the form 'app_label.modelname:pk:field name'.  Units are written
+and read one at a time and the objects are processed in chunks ordered
+by primary key, so the memory use does not depend on the number of
+exported or imported strings.
+"""
+
+from xml.sax.saxutils import escape, quoteattr
+
+try:
+    from xml.etree import cElementTree as ElementTree
+except ImportError:
+    try:
+        from xml.etree import ElementTree
+    except ImportError:
+        import cElementTree as ElementTree
+
+from django.db import connection, models
+from django.utils.encoding import smart_unicode
+
+from multilingual.bulk import (CHUNK_SIZE, get_translated_field_names,
+                               get_translation_values, save_translations)
+from multilingual.languages import (get_language_code,
+                                    get_language_id_from_id_or_code)
+
+FORMATS = ('xliff', 'po')
+
+XLIFF_NAMESPACE = 'urn:oasis:names:tc:xliff:document:1.2'
+
+
+def get_model_label(model):
+    opts = model._meta
+    return '%s.%s' % (opts.app_label, opts.object_name.lower())
+
+
+def get_unit_id(model, master_id, field_name):
+    return '%s:%s:%s' % (get_model_label(model), master_id, field_name)
+
+
+def parse_unit_id(unit_id):
+    """
+    Return a tuple (model, master ID, field name) for a unit ID.
+    """
+    try:
+        label, master_id, field_name = unit_id.split(':', 2)
+        app_label, model_name = label.split('.', 1)
+    except ValueError:
+        raise ValueError('Invalid translation unit ID: %r' % unit_id)
+    model = models.get_model(app_label, model_name)
+    if model is None or not hasattr(model._meta, 'translation_model'):
+        raise ValueError('Invalid translation unit ID: %r' % unit_id)
+    if field_name not in get_translated_field_names(model):
+        raise ValueError('Invalid translation unit ID: %r' % unit_id)
+    return model, model._meta.pk.to_python(master_id), field_name
+
+
+def iter_master_ids(model, chunk_size=CHUNK_SIZE):
+    """
+    Yield lists of at most chunk_size primary keys of objects of model,
+    in ascending order; every list is read with a separate query.
+    """
+    opts = model._meta
+    qn = connection.ops.quote_name
+    pk_column = qn(opts.pk.column)
+    sql = 'SELECT %s FROM %s%%s ORDER BY %s LIMIT %d' % (
+        pk_column, qn(opts.db_table), pk_column, chunk_size)
+    cursor = connection.cursor()
+    cursor.execute(sql % '')
+    while True:
+        master_ids = [row[0] for row in cursor.fetchall()]
+        if not master_ids:
+            return
+        yield master_ids
+        if len(master_ids) < chunk_size:
+            return
+        cursor.execute(sql % (' WHERE %s > %%s' % pk_column),
+                       [master_ids[-1]])
+
+
+def iter_units(model, source_language, target_language, field_names=None,
+               untranslated=False, chunk_size=CHUNK_SIZE):
+    """
+    Yield tuples (unit ID, source text, target text) for the translated
+    fields of objects of model that are not empty in source_language.
+
+    The target text is an empty string if the field is not translated
+    to target_language; with `untranslated` only such units are
+    returned.
+    """
+    if field_names is None:
+        field_names = get_translated_field_names(model)
+    for master_ids in iter_master_ids(model, chunk_size):
+        sources = get_translation_values(model, source_language, master_ids,
+                                         field_names)
+        targets = get_translation_values(model, target_language, master_ids,
+                                         field_names)
+        for master_id in master_ids:
+            source = sources.get(master_id)
+            if source is None:
+                continue
+            target = targets.get(master_id, {})
+            for field_name in field_names:
+                source_text = source[field_name]
+                if source_text in (None, ''):
+                    continue
+                target_text = target.get(field_name)
+                if target_text is None:
+                    target_text = ''
+                if untranslated and target_text != '':
+                    continue
+                yield (get_unit_id(model, master_id, field_name),
+                       smart_unicode(source_text), smart_unicode(target_text))
+
+
+def write_xliff(stream, models_and_units, source_language, target_language):
+    """
+    Write an XLIFF 1.2 document to stream, with a <file> element for
+    every (model, units) pair of models_and_units.
+    """
+    source_code = get_language_code(
+        get_language_id_from_id_or_code(source_language))
+    target_code = get_language_code(
+        get_language_id_from_id_or_code(target_language))
+    write = lambda text: stream.write(text.encode('utf-8'))
+    write(u'<?xml version="1.0" encoding="utf-8"?>\n'
+          u'<xliff version="1.2" xmlns="%s">\n' % XLIFF_NAMESPACE)
+    for model, units in models_and_units:
+        write(u'<file original=%s datatype="plaintext" source-language=%s '
+              u'target-language=%s>\n<body>\n' % (
+                quoteattr(get_model_label(model)), quoteattr(source_code),
+                quoteattr(target_code)))
+        for unit_id, source_text, target_text in units:
+            write(u'<trans-unit id=%s>\n<source>%s</source>\n' % (
+                    quoteattr(unit_id), escape(source_text)))
+            if target_text:
+                write(u'<target>%s</target>\n' % escape(target_text))
+            write(u'</trans-unit>\n')
+        write(u'</body>\n</file>\n')
+    write(u'</xliff>\n')
+
+
+def _po_quote(text):
+    text = text.replace('\\', '\\\\').replace('"', '\\"').replace(
+        '\t', '\\t').replace('\r', '\\r')
+    lines = text.split('\n')
+    if len(lines) == 1:
+        return u'"%s"' % lines[0]
+    result = [u'""']
+    for line in lines[:-1]:
+        result.append(u'"%s\\n"' % line)
+    if lines[-1]:
+        result.append(u'"%s"' % lines[-1])
+    return u'\n'.join(result)
+
+
+def _po_unquote(text):
+    text = text.strip()[1:-1]
+    result = []
+    i = 0
+    while i < len(text):
+        char = text[i]
+        if char == '\\' and i + 1 < len(text):
+            i += 1
+            char = {'n': '\n', 't': '\t', 'r': '\r'}.get(text[i], text[i])
+        result.append(char)
+        i += 1
+    return u''.join(result)
+
+
+def write_po(stream, models_and_units, source_language, target_language):
+    """
+    Write a PO file to stream, with the unit IDs of models_and_units
+    as message contexts.
+    """
+    source_code = get_language_code(
+        get_language_id_from_id_or_code(source_language))
+    target_code = get_language_code(
+        get_language_id_from_id_or_code(target_language))
+    write = lambda text: stream.write(text.encode('utf-8'))
+    write(u'msgid ""\nmsgstr ""\n'
+          u'"Content-Type: text/plain; charset=UTF-8\\n"\n'
+          u'"Language: %s\\n"\n'
+          u'"X-Source-Language: %s\\n"\n' % (target_code, source_code))
+    for model, units in models_and_units:
+        for unit_id, source_text, target_text in units:
+            write(u'\nmsgctxt %s\nmsgid %s\nmsgstr %s\n' % (
+                    _po_quote(unit_id), _po_quote(source_text),
+                    _po_quote(target_text)))
+
+
+def read_xliff(stream):
+    """
+    Yield tuples (unit ID, target language code, target text) for the
+    translation units of an XLIFF document that have a target.
+    """
+    target_code = None
+    body = None
+    for event, element in ElementTree.iterparse(stream, ('start', 'end')):
+        tag = element.tag.split('}')[-1]
+        if event == 'start':
+            if tag == 'file':
+                target_code = element.get('target-language')
+            elif tag == 'body':
+                body = element
+            continue
+        if tag != 'trans-unit':
+            continue
+        target = element.find('{%s}target' % XLIFF_NAMESPACE)
+        if target is None:
+            target = element.find('target')
+        if target is not None and target.text:
+            yield element.get('id'), target_code, smart_unicode(target.text)
+        # keep the memory use constant
+        element.clear()
+        if body is not None:
+            body.remove(element)
+
+
+def read_po(stream):
+    """
+    Yield tuples (unit ID, target language code, target text) for the
+    translated messages of a PO file.  Fuzzy messages are skipped.
+    """
+    target_code = None
+    entry = {}
+    fuzzy = False
+    keyword = None
+    lines = iter(stream)
+    while True:
+        try:
+            line = smart_unicode(lines.next()).strip()
+        except StopIteration:
+            line = None
+        if line is not None and line.startswith('"'):
+            if keyword is not None:
+                entry[keyword] += _po_unquote(line)
+            continue
+        if line is not None and (not line or line.startswith('#')):
+            if line.startswith('#,') and 'fuzzy' in line:
+                fuzzy = True
+            continue
+        if line is not None:
+            keyword, value = line.split(None, 1)
+        if line is None or (keyword in ('msgctxt', 'msgid')
+                            and 'msgstr' in entry):
+            # the end of a message
+            if 'msgctxt' not in entry and entry.get('msgid') == u'':
+                for header in entry.get('msgstr', u'').split('\n'):
+                    if header.startswith('Language:'):
+                        target_code = header.split(':', 1)[1].strip()
+            elif ('msgctxt' in entry and entry.get('msgstr')
+                  and not entry['fuzzy']):
+                yield entry['msgctxt'], target_code, entry['msgstr']
+            entry = {}
+        if line is None:
+            return
+        if not entry:
+            entry['fuzzy'] = fuzzy
+            fuzzy = False
+        entry[keyword] = _po_unquote(value)
+
+
+def read_units(stream, format):
+    if format == 'po':
+        return read_po(stream)
+    return read_xliff(stream)
+
+
+def import_units(units, chunk_size=CHUNK_SIZE):
+    """
+    Save translations read with read_xliff or read_po.
+
+    Units are collected in chunks of chunk_size objects of one model and
+    language, which are saved with multilingual.bulk.save_translations;
+    values equal to the saved translations and units of objects that do
+    not exist are skipped.
+
+    Returns a tuple (number of updated translations, number of inserted
+    translations, number of skipped units).
+    """
+    counts = [0, 0, 0]
+    pending = {}
+    current = [None, None]
+
+    def flush():
+        model, language_id = current
+        if not pending:
+            return
+        master_ids = pending.keys()
+        field_names = set()
+        for values in pending.values():
+            field_names.update(values.keys())
+        existing = get_existing_master_ids(model, master_ids)
+        saved = get_translation_values(model, language_id, master_ids,
+                                       list(field_names))
+        changed = {}
+        for master_id, values in pending.items():
+            if master_id not in existing:
+                counts[2] += len(values)
+                continue
+            old_values = saved.get(master_id, {})
+            for field_name, value in values.items():
+                if master_id in saved and old_values[field_name] == value:
+                    counts[2] += 1
+                else:
+                    changed.setdefault(master_id, {})[field_name] = value
+        pending.clear()
+        if changed:
+            updated, inserted = save_translations(model, language_id, changed)
+            counts[0] += updated
+            counts[1] += inserted
+
+    for unit_id, target_code, target_text in units:
+        model, master_id, field_name = parse_unit_id(unit_id)
+        if not target_code:
+            raise ValueError('Unknown target language of %r' % unit_id)
+        language_id = get_language_id_from_id_or_code(target_code)
+        if current != [model, language_id]:
+            flush()
+            current[:] = [model, language_id]
+        trans_opts = model._meta.translation_model._meta
+        value = trans_opts.get_field(field_name).to_python(target_text)
+        if master_id not in pending and len(pending) >= chunk_size:
+            flush()
+        pending.setdefault(master_id, {})[field_name] = value
+    flush()
+    return tuple(counts)
+
+
+def get_existing_master_ids(model, master_ids):
+    """
+    Return the set of master_ids that are primary keys of objects of
+    model.
+    """
+    opts = model._meta
+    qn = connection.ops.quote_name
+    cursor = connection.cursor()
+    result = set()
+    master_ids = list(master_ids)
+    for start in range(0, len(master_ids), CHUNK_SIZE):
+        chunk = master_ids[start:start + CHUNK_SIZE]
+        cursor.execute('SELECT %s FROM %s WHERE %s IN (%s)' % (
+                qn(opts.pk.column), qn(opts.db_table), qn(opts.pk.column),
+                ', '.join(['%s'] * len(chunk))), chunk)
+        result.update([row[0] for row in cursor.fetchall()])
+    return result
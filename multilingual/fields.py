@@ -1,7 +1,39 @@
 from django.db import models
+from django.utils import simplejson
 
 
 class TranslationForeignKey(models.ForeignKey):
     """
     """
     pass
+
+
+class TranslationsJSONField(models.TextField):
+    """
+    A text column holding all the translations of an object as a JSON
+    document: {'language code': {'field name': value, ...}, ...}.
+
+    The value of the field is the decoded dictionary.
+    """
+    __metaclass__ = models.SubfieldBase
+
+    def __init__(self, *args, **kwargs):
+        kwargs.setdefault('default', dict)
+        kwargs.setdefault('editable', False)
+        kwargs.setdefault('blank', True)
+        super(TranslationsJSONField, self).__init__(*args, **kwargs)
+
+    def to_python(self, value):
+        if isinstance(value, dict):
+            return value
+        if not value:
+            return {}
+        return simplejson.loads(value)
+
+    def get_db_prep_value(self, value):
+        if value is None:
+            value = {}
+        return simplejson.dumps(value)
+
+    def value_to_string(self, obj):
+        return self.get_db_prep_value(self._get_val_from_obj(obj))
@@ -25,15 +25,18 @@ def multilingual_flatpage(request, url):
         return HttpResponseRedirect("%s/" % request.path)
     if not url.startswith('/'):
         url = "/" + url
-    f = get_object_or_404(MultilingualFlatPage, url__exact=url, sites__id__exact=settings.SITE_ID)
+    # Serve the content in the language defined by the Django translation module
+    # if possible else serve the default language.  Only the translations
+    # that can be displayed are fetched from the database.
+    language_id = multilingual.languages.get_language_id_from_id_or_code(get_language())
+    pages = MultilingualFlatPage.objects.all().for_language(language_id).with_languages(
+        *multilingual.languages.get_fallback_language_ids(language_id))
+    f = get_object_or_404(pages, url__exact=url, sites__id__exact=settings.SITE_ID)
     # If registration is required for accessing this page, and the user isn't
     # logged in, redirect to the login page.
     if f.registration_required and not request.user.is_authenticated():
         from django.contrib.auth.views import redirect_to_login
         return redirect_to_login(request.path)
-    # Serve the content in the language defined by the Django translation module
-    # if possible else serve the default language.
-    f._default_language = multilingual.languages.get_language_id_from_id_or_code(get_language())
     if f.template_name:
         t = loader.select_template((f.template_name, DEFAULT_TEMPLATE))
     else:
@@ -46,6 +46,15 @@ def get_language_choices():
     return [(language_id, get_language_code(language_id))
             for language_id in get_language_id_list()]
 
+def _get_language_ids():
+    language_ids = {}
+    for language_id, (code, desc) in zip(get_language_id_list(), LANGUAGES):
+        language_ids.setdefault(code, language_id)
+    return language_ids
+
+# maps language codes to language IDs
+LANGUAGE_IDS = _get_language_ids()
+
 def get_language_id_from_id_or_code(language_id_or_code, use_default=True):
     if language_id_or_code is None:
         if use_default:
@@ -56,19 +65,28 @@ def get_language_id_from_id_or_code(language_id_or_code, use_default=True):
     if isinstance(language_id_or_code, int):
         return language_id_or_code
 
-    i = 0
-    for (code, desc) in LANGUAGES:
-        i += 1
-        if code == language_id_or_code:
-            return i
-        if language_id_or_code.startswith("%s-" % code):
-            return i
+    # The code matches a language if it is equal to the language code
+    # or starts with the language code followed by a dash; the
+    # language that comes first in LANGUAGES wins.
+    candidates = []
+    code = language_id_or_code
+    while True:
+        language_id = LANGUAGE_IDS.get(code)
+        if language_id is not None:
+            candidates.append(language_id)
+        if '-' not in code:
+            break
+        code = code[:code.rindex('-')]
+    if candidates:
+        return min(candidates)
     raise LanguageDoesNotExist(language_id_or_code)
 
 def get_language_idx(language_id_or_code):
-    # to do: optimize
+    # language IDs are consecutive numbers starting with 1
     language_id = get_language_id_from_id_or_code(language_id_or_code)
-    return get_language_id_list().index(language_id)
+    if not 0 < language_id <= get_language_count():
+        raise ValueError("%r is not a valid language ID" % language_id)
+    return language_id - 1
 
 def set_default_language(language_id_or_code):
     """
@@ -121,7 +139,30 @@ def get_translated_field_alias(field_name, language_id=None):
             + field_name
             + '_' + _to_db_identifier(get_language_code(language_id)))
 
+def get_translation_column_name(field_name, language_id):
+    """
+    Return the name of the field or column holding field_name in the
+    given language, e.g. 'title_zh_cn'.  Used by the 'field
+    name'_'language code' proxies and by the column storage of
+    translations.
+    """
+    return (field_name
+            + '_' + _to_db_identifier(get_language_code(language_id)))
+
 FALLBACK_LANGUAGE_IDS = [get_language_id_from_id_or_code(lang_code) for lang_code in FALLBACK_LANGUAGES]
 
+def get_fallback_language_ids(language_id_or_code=None):
+    """
+    Return the list of language IDs that may be needed to display
+    content in the given language: the language itself followed by
+    FALLBACK_LANGUAGE_IDS.
+    """
+    language_id = get_language_id_from_id_or_code(language_id_or_code)
+    result = [language_id]
+    for fb_lang_id in FALLBACK_LANGUAGE_IDS:
+        if fb_lang_id not in result:
+            result.append(fb_lang_id)
+    return result
+
 FALLBACK_FIELD_SUFFIX = '_any'
 
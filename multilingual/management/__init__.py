@@ -0,0 +1,37 @@
+"""
+Helpers shared by the multilingual management commands.
+"""
+
+from django.core.management.base import CommandError
+from django.db import models
+
+from multilingual.utils import is_multilingual_model
+
+
+def get_multilingual_models(labels):
+    """
+    Return the multilingual models named by labels, which are
+    application labels or app_label.ModelName strings.  All the
+    multilingual models are returned if labels are empty.
+    """
+    if not labels:
+        return [model for model in models.get_models()
+                if is_multilingual_model(model)]
+    result = []
+    for label in labels:
+        if '.' in label:
+            app_label, model_name = label.split('.', 1)
+            model = models.get_model(app_label, model_name)
+            if model is None:
+                raise CommandError('Unknown model: %s' % label)
+            if not is_multilingual_model(model):
+                raise CommandError('%s is not a multilingual model' % label)
+            result.append(model)
+        else:
+            try:
+                app = models.get_app(label)
+            except Exception, e:
+                raise CommandError(str(e))
+            result.extend([model for model in models.get_models(app)
+                           if is_multilingual_model(model)])
+    return result
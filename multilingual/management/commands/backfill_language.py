@@ -0,0 +1,87 @@
+from optparse import make_option
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from multilingual.bulk import CHUNK_SIZE, copy_translations
+from multilingual.languages import (get_language_code,
+                                    get_language_id_from_id_or_code)
+from multilingual.management import get_multilingual_models
+
+
+def backfill_model(args):
+    """
+    Copy the translations of one model; args is a tuple (model label,
+    source language ID, target language ID, chunk size, verbosity).
+    """
+    label, source_id, target_id, chunk_size, verbosity = args
+    model = get_multilingual_models([label])[0]
+
+    def report(inserted):
+        if verbosity > 1:
+            print '%s: %d translations copied' % (label, inserted)
+
+    inserted = copy_translations(model, source_id, target_id, chunk_size,
+                                 report)
+    if verbosity > 0:
+        print '%s: %d translations copied from %s to %s.' % (
+            label, inserted, get_language_code(source_id),
+            get_language_code(target_id))
+    return inserted
+
+
+class Command(BaseCommand):
+    option_list = BaseCommand.option_list + (
+        make_option('--source', dest='source',
+            help='The language to copy the translations from.'),
+        make_option('--target', dest='target',
+            help='The language to copy the translations to.'),
+        make_option('--chunk-size', type='int', dest='chunk_size',
+            default=CHUNK_SIZE,
+            help='Copy the translations of this many objects with one '
+                 'statement (default: %d).' % CHUNK_SIZE),
+        make_option('--processes', type='int', dest='processes', default=1,
+            help='Copy the translations of this many models at once, in '
+                 'separate processes (default: 1).'),
+    )
+    help = ('Copies the translations of multilingual models in the source '
+            'language to the target language, for the objects that are not '
+            'translated to the target language yet.  It can be run again '
+            'after it is interrupted.')
+    args = '[appname ...] [appname.ModelName ...]'
+
+    def handle(self, *labels, **options):
+        source, target = options.get('source'), options.get('target')
+        if not source or not target:
+            raise CommandError('Enter the languages with --source and '
+                               '--target.')
+        source_id = get_language_id_from_id_or_code(source)
+        target_id = get_language_id_from_id_or_code(target)
+        if source_id == target_id:
+            raise CommandError('The source and target languages are the same.')
+        chunk_size = int(options.get('chunk_size') or CHUNK_SIZE)
+        processes = int(options.get('processes') or 1)
+        verbosity = int(options.get('verbosity', 1))
+
+        tasks = [('%s.%s' % (model._meta.app_label, model._meta.object_name),
+                  source_id, target_id, chunk_size, verbosity)
+                 for model in get_multilingual_models(labels)]
+        if processes > 1 and len(tasks) > 1:
+            try:
+                from multiprocessing import Pool
+            except ImportError:
+                raise CommandError('--processes needs the multiprocessing '
+                                   'module (Python 2.6 or later).')
+            # the worker processes must not share the connection of this
+            # process; they open their own ones
+            connection.close()
+            pool = Pool(min(processes, len(tasks)))
+            try:
+                inserted = pool.map(backfill_model, tasks)
+            finally:
+                pool.close()
+                pool.join()
+        else:
+            inserted = [backfill_model(task) for task in tasks]
+        if verbosity > 0 and len(tasks) > 1:
+            print '%d translations copied.' % sum(inserted)
@@ -0,0 +1,67 @@
+from optparse import make_option
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from multilingual.bulk import CHUNK_SIZE
+from multilingual.exchange import FORMATS, iter_units, write_po, write_xliff
+from multilingual.languages import get_language_id_from_id_or_code
+from multilingual.management import get_multilingual_models
+
+
+class Command(BaseCommand):
+    option_list = BaseCommand.option_list + (
+        make_option('--source', dest='source', default=None,
+            help='The language translated from (default: DEFAULT_LANGUAGE).'),
+        make_option('--target', dest='target',
+            help='The language translated to.'),
+        make_option('--format', dest='format', default='xliff',
+            help='The file format: %s (default: xliff).' % ', '.join(FORMATS)),
+        make_option('--output', dest='output', default=None,
+            help='Write to this file instead of the standard output.'),
+        make_option('--untranslated', action='store_true',
+            dest='untranslated', default=False,
+            help='Export only the fields not translated to the target '
+                 'language.'),
+        make_option('--chunk-size', type='int', dest='chunk_size',
+            default=CHUNK_SIZE,
+            help='Read this many objects with one query (default: %d).'
+                 % CHUNK_SIZE),
+    )
+    help = ('Exports the translated fields of multilingual models as an '
+            'XLIFF or PO file for translators.')
+    args = '[appname ...] [appname.ModelName ...]'
+
+    def handle(self, *labels, **options):
+        source = options.get('source') or settings.DEFAULT_LANGUAGE
+        target = options.get('target')
+        if not target:
+            raise CommandError('Enter the target language with --target.')
+        format = options.get('format')
+        if format not in FORMATS:
+            raise CommandError('Unknown format: %s' % format)
+        source_id = get_language_id_from_id_or_code(source)
+        target_id = get_language_id_from_id_or_code(target)
+        if source_id == target_id:
+            raise CommandError('The source and target languages are the same.')
+        chunk_size = int(options.get('chunk_size') or CHUNK_SIZE)
+        untranslated = options.get('untranslated')
+
+        models_and_units = [
+            (model, iter_units(model, source_id, target_id,
+                               untranslated=untranslated,
+                               chunk_size=chunk_size))
+            for model in get_multilingual_models(labels)]
+        if options.get('output'):
+            stream = open(options['output'], 'w')
+        else:
+            stream = sys.stdout
+        try:
+            if format == 'po':
+                write_po(stream, models_and_units, source_id, target_id)
+            else:
+                write_xliff(stream, models_and_units, source_id, target_id)
+        finally:
+            if stream is not sys.stdout:
+                stream.close()
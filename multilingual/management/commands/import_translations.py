@@ -0,0 +1,52 @@
+from optparse import make_option
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from multilingual.bulk import CHUNK_SIZE
+from multilingual.exchange import FORMATS, import_units, read_units
+
+
+class Command(BaseCommand):
+    option_list = BaseCommand.option_list + (
+        make_option('--format', dest='format', default=None,
+            help='The file format: %s (default: po for .po files, xliff '
+                 'for the other ones).' % ', '.join(FORMATS)),
+        make_option('--chunk-size', type='int', dest='chunk_size',
+            default=CHUNK_SIZE,
+            help='Save the translations of this many objects at once '
+                 '(default: %d).' % CHUNK_SIZE),
+    )
+    help = ('Imports translations of multilingual models from XLIFF or PO '
+            'files written by export_translations.')
+    args = 'filename [filename ...]'
+
+    def handle(self, *filenames, **options):
+        if not filenames:
+            raise CommandError('Enter at least one file name.')
+        chunk_size = int(options.get('chunk_size') or CHUNK_SIZE)
+        verbosity = int(options.get('verbosity', 1))
+        for filename in filenames:
+            format = options.get('format')
+            if format is None:
+                if filename.endswith('.po'):
+                    format = 'po'
+                else:
+                    format = 'xliff'
+            if format not in FORMATS:
+                raise CommandError('Unknown format: %s' % format)
+            stream = open(filename)
+            try:
+                try:
+                    updated, inserted, skipped = import_units(
+                        read_units(stream, format), chunk_size)
+                except (ValueError, SyntaxError), e:
+                    # ElementTree reports XML errors as SyntaxError
+                    # subclasses
+                    transaction.rollback_unless_managed()
+                    raise CommandError('%s: %s' % (filename, e))
+            finally:
+                stream.close()
+            if verbosity > 0:
+                print ('%s: %d translations updated, %d inserted, %d units '
+                       'skipped.' % (filename, updated, inserted, skipped))
@@ -0,0 +1,55 @@
+from optparse import make_option
+
+from django.core.management.base import BaseCommand
+
+from multilingual.languages import get_language_code, get_language_id_list
+from multilingual.management import get_multilingual_models
+
+
+class Command(BaseCommand):
+    option_list = BaseCommand.option_list + (
+        make_option('--group-by', dest='group_by',
+            help='Group the statistics by this field of the multilingual models.'),
+        make_option('--cached', action='store_true', dest='cached',
+            default=False,
+            help='Use the cached statistics if they are up to date.'),
+    )
+    help = ('Prints the number of translations of multilingual models and '
+            'of their non-empty fields in every language.')
+    args = '[appname ...] [appname.ModelName ...]'
+
+    def handle(self, *labels, **options):
+        group_by = options.get('group_by')
+        for model in get_multilingual_models(labels):
+            manager = model._meta.translation_model.objects
+            if options.get('cached'):
+                stats = manager.cached_coverage(group_by)
+            else:
+                stats = manager.coverage(group_by)
+            opts = model._meta
+            if group_by is None:
+                total = model._default_manager.count()
+                print '%s.%s (%d objects)' % (opts.app_label,
+                                              opts.object_name, total)
+                self.print_stats(stats, total, '  ')
+            else:
+                print '%s.%s' % (opts.app_label, opts.object_name)
+                groups = stats.keys()
+                groups.sort()
+                for group in groups:
+                    print '  %s = %s' % (group_by, group)
+                    self.print_stats(stats[group], None, '    ')
+
+    def print_stats(self, stats, total, indent):
+        for language_id in get_language_id_list():
+            language_stats = stats.get(language_id, {'count': 0,
+                                                     'fields': {}})
+            count = language_stats['count']
+            line = '%s%s: %d' % (indent, get_language_code(language_id), count)
+            if total:
+                line += ' (%d%%)' % (100 * count / total)
+            fields = language_stats['fields'].items()
+            fields.sort()
+            if fields:
+                line += '; ' + ', '.join(['%s: %d' % field for field in fields])
+            print line
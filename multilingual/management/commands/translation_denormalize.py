@@ -0,0 +1,42 @@
+from optparse import make_option
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from multilingual.bulk import CHUNK_SIZE, update_denormalized_fields
+from multilingual.languages import get_language_code
+from multilingual.management import get_multilingual_models
+
+
+class Command(BaseCommand):
+    option_list = BaseCommand.option_list + (
+        make_option('--chunk-size', type='int', dest='chunk_size',
+            default=CHUNK_SIZE,
+            help='Update this many objects with one statement (default: %d).'
+                 % CHUNK_SIZE),
+    )
+    help = ('Copies the translations in the primary language to the '
+            'denormalized fields listed in the denormalize option of '
+            'Translation.Meta.')
+    args = '[appname ...] [appname.ModelName ...]'
+
+    def handle(self, *labels, **options):
+        chunk_size = int(options.get('chunk_size') or CHUNK_SIZE)
+        verbosity = int(options.get('verbosity', 1))
+        qn = connection.ops.quote_name
+        cursor = connection.cursor()
+        for model in get_multilingual_models(labels):
+            opts = model._meta
+            if not opts.denormalized_fields:
+                continue
+            cursor.execute('SELECT %s FROM %s ORDER BY %s' % (
+                    qn(opts.pk.column), qn(opts.db_table), qn(opts.pk.column)))
+            master_ids = [row[0] for row in cursor.fetchall()]
+            updated = 0
+            for start in range(0, len(master_ids), chunk_size):
+                updated += update_denormalized_fields(
+                    model, master_ids[start:start + chunk_size])
+            if verbosity > 0:
+                print '%s.%s: %d objects updated (%s).' % (
+                    opts.app_label, opts.object_name, updated,
+                    get_language_code(opts.primary_language_id))
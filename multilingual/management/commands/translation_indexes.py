@@ -0,0 +1,127 @@
+from optparse import make_option
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.backends.util import truncate_name
+
+from multilingual.languages import get_language_code, get_language_id_list
+from multilingual.management import get_multilingual_models
+
+# the database engines supporting CREATE INDEX ... WHERE
+PARTIAL_INDEX_ENGINES = ('sqlite3', 'postgresql', 'postgresql_psycopg2')
+
+
+def get_index_names(cursor, table):
+    """
+    Return the names of the existing indexes of table.
+    """
+    engine = settings.DATABASE_ENGINE
+    if engine == 'sqlite3':
+        cursor.execute("SELECT name FROM sqlite_master "
+                       "WHERE type = 'index' AND tbl_name = %s", [table])
+        return set([row[0] for row in cursor.fetchall()])
+    if engine in ('postgresql', 'postgresql_psycopg2'):
+        cursor.execute("SELECT indexname FROM pg_indexes "
+                       "WHERE tablename = %s", [table])
+        return set([row[0] for row in cursor.fetchall()])
+    if engine == 'mysql':
+        cursor.execute('SHOW INDEX FROM %s' % connection.ops.quote_name(table))
+        return set([row[2] for row in cursor.fetchall()])
+    return set()
+
+
+def get_index_sql(model, partial):
+    """
+    Return a list of (index name, CREATE INDEX statement) pairs for the
+    indexed_fields of the translation model of model.
+
+    Every field gets a composite index on (language_id, field,
+    master_id), used by filters and ordering on the field; with
+    `partial` also a (field, master_id) index for every language.  If
+    the translation table is partitioned by language, every language
+    table gets a (field, master_id) index instead.
+    """
+    opts = model._meta.translation_model._meta
+    qn = connection.ops.quote_name
+    max_length = connection.ops.max_name_length()
+    table = opts.db_table
+    language_column = opts.get_field('language_id').column
+    master_column = opts.get_field('master').column
+
+    result = []
+    for name in opts.indexed_fields:
+        if name not in opts.translated_fields or \
+                opts.translated_fields[name][1] is not None:
+            raise CommandError('%s.%s: indexed_fields contains %r, which '
+                               'is not a translated field'
+                               % (model._meta.app_label,
+                                  model._meta.object_name, name))
+        column = opts.get_field(name).column
+        if opts.language_models:
+            for language_id, language_model in opts.language_models.items():
+                language_table = language_model._meta.db_table
+                index_name = truncate_name('%s_%s' % (language_table, column),
+                                           max_length)
+                result.append((index_name, 'CREATE INDEX %s ON %s (%s, %s);' % (
+                            qn(index_name), qn(language_table), qn(column),
+                            qn(master_column))))
+            continue
+        index_name = truncate_name('%s_%s_lang' % (table, column), max_length)
+        result.append((index_name, 'CREATE INDEX %s ON %s (%s, %s, %s);' % (
+            qn(index_name), qn(table), qn(language_column), qn(column),
+            qn(master_column))))
+        if not partial:
+            continue
+        for language_id in get_language_id_list():
+            code = get_language_code(language_id).replace('-', '_')
+            index_name = truncate_name('%s_%s_%s' % (table, column, code),
+                                       max_length)
+            result.append((index_name,
+                           'CREATE INDEX %s ON %s (%s, %s) WHERE %s = %d;' % (
+                        qn(index_name), qn(table), qn(column),
+                        qn(master_column), qn(language_column), language_id)))
+    return result
+
+
+class Command(BaseCommand):
+    option_list = BaseCommand.option_list + (
+        make_option('--dry-run', action='store_true', dest='dry_run',
+            default=False,
+            help='Print the SQL statements instead of executing them.'),
+        make_option('--no-partial', action='store_false', dest='partial',
+            default=True,
+            help='Do not create the per-language partial indexes.'),
+    )
+    help = ('Creates indexes on translated fields listed in the '
+            'indexed_fields option of Translation.Meta.')
+    args = '[appname ...] [appname.ModelName ...]'
+
+    def handle(self, *labels, **options):
+        partial = (options.get('partial', True)
+                   and settings.DATABASE_ENGINE in PARTIAL_INDEX_ENGINES)
+        dry_run = options.get('dry_run')
+        verbosity = int(options.get('verbosity', 1))
+        cursor = connection.cursor()
+        created = 0
+        for model in get_multilingual_models(labels):
+            trans_opts = model._meta.translation_model._meta
+            existing = set()
+            for trans_model in (trans_opts.language_models.values()
+                                or [model._meta.translation_model]):
+                existing.update(get_index_names(cursor,
+                                                trans_model._meta.db_table))
+            for index_name, sql in get_index_sql(model, partial):
+                if index_name in existing:
+                    continue
+                if dry_run:
+                    print sql
+                    continue
+                if verbosity > 1:
+                    print sql
+                cursor.execute(sql)
+                created += 1
+        if not dry_run:
+            transaction.commit_unless_managed()
+            if verbosity > 0:
+                print '%d indexes created.' % created
@@ -0,0 +1,198 @@
+from optparse import make_option
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, models, transaction
+
+from multilingual.languages import (get_language_id_list,
+                                    get_translation_column_name)
+
+
+def get_storage_info(model, table=None):
+    """
+    Return a tuple (translation table name, list of (translation table
+    column, field) pairs) describing the translations of model, which
+    may use either storage.
+
+    For models using the column storage the translation table name is
+    `table` or the default '<master table>_translation'.
+    """
+    opts = model._meta
+    if hasattr(opts, 'translation_model'):
+        trans_opts = opts.translation_model._meta
+        if trans_opts.language_models:
+            raise CommandError('%s.%s: translation tables partitioned by '
+                               'language are not supported'
+                               % (opts.app_label, opts.object_name))
+        fields = [(f.column, f) for f in trans_opts.fields
+                  if f.name in trans_opts.translated_fields]
+        return table or trans_opts.db_table, fields
+    if hasattr(opts, 'translation_columns'):
+        fields = [(field.db_column or name, field)
+                  for name, field in opts.translation_columns.items()]
+        fields.sort()
+        return table or opts.db_table + '_translation', fields
+    raise CommandError('%s.%s does not store translations in a table or '
+                       'in columns' % (opts.app_label, opts.object_name))
+
+
+def get_add_columns_sql(model, table=None):
+    """
+    Return a list of (sql, params) adding the missing translation
+    columns to the master table of model.
+    """
+    qn = connection.ops.quote_name
+    master_table = model._meta.db_table
+    cursor = connection.cursor()
+    existing = [row[0] for row in connection.introspection.get_table_description(
+            cursor, master_table)]
+    result = []
+    for trans_column, field in get_storage_info(model, table)[1]:
+        for language_id in get_language_id_list():
+            column = get_translation_column_name(trans_column, language_id)
+            if column in existing:
+                continue
+            result.append(('ALTER TABLE %s ADD COLUMN %s %s NULL' % (
+                        qn(master_table), qn(column), field.db_type()), []))
+    return result
+
+
+def get_to_columns_sql(model, table=None):
+    """
+    Return a list of (sql, params) copying the translations of model
+    from the translation table to the columns of the master table.
+    """
+    qn = connection.ops.quote_name
+    opts = model._meta
+    master_table = qn(opts.db_table)
+    trans_table, fields = get_storage_info(model, table)
+    trans_table = qn(trans_table)
+    result = []
+    for language_id in get_language_id_list():
+        assignments = []
+        for trans_column, field in fields:
+            assignments.append(
+                '%s = (SELECT %s.%s FROM %s WHERE %s.master_id = %s.%s '
+                'AND %s.language_id = %d)' % (
+                    qn(get_translation_column_name(trans_column, language_id)),
+                    trans_table, qn(trans_column), trans_table,
+                    trans_table, master_table, qn(opts.pk.column),
+                    trans_table, language_id))
+        result.append(('UPDATE %s SET %s' % (master_table,
+                                             ', '.join(assignments)), []))
+    return result
+
+
+def get_to_table_sql(model, table=None):
+    """
+    Return a list of (sql, params) copying the translations of model
+    from the columns of the master table to the translation table.
+
+    A translation exists if any of its columns is not NULL; NULL
+    columns of existing translations get the default value of their
+    field.
+    """
+    qn = connection.ops.quote_name
+    opts = model._meta
+    master_table = qn(opts.db_table)
+    master_pk = '%s.%s' % (master_table, qn(opts.pk.column))
+    trans_table, fields = get_storage_info(model, table)
+    trans_table = qn(trans_table)
+    defaults = [field.get_db_prep_save(field.get_default())
+                for trans_column, field in fields]
+    result = []
+    for language_id in get_language_id_list():
+        columns = ['%s.%s' % (master_table,
+                              qn(get_translation_column_name(trans_column,
+                                                             language_id)))
+                   for trans_column, field in fields]
+        all_null = ' AND '.join(['%s IS NULL' % column for column in columns])
+        translation_exists = ('EXISTS (SELECT 1 FROM %s WHERE %s.master_id = '
+                              '%s AND %s.language_id = %d)' % (
+                trans_table, trans_table, master_pk, trans_table, language_id))
+        # translations that no longer exist
+        result.append((
+            'DELETE FROM %s WHERE %s.language_id = %d AND %s.master_id IN '
+            '(SELECT %s FROM %s WHERE %s)' % (
+                trans_table, trans_table, language_id, trans_table,
+                master_pk, master_table, all_null), []))
+        # the existing translations
+        assignments = []
+        for (trans_column, field), column in zip(fields, columns):
+            assignments.append(
+                '%s = COALESCE((SELECT %s FROM %s WHERE %s = %s.master_id), %%s)'
+                % (qn(trans_column), column, master_table, master_pk,
+                   trans_table))
+        result.append(('UPDATE %s SET %s WHERE %s.language_id = %d' % (
+                    trans_table, ', '.join(assignments), trans_table,
+                    language_id), defaults))
+        # the new ones
+        result.append((
+            'INSERT INTO %s (master_id, language_id, %s) '
+            'SELECT %s, %d, %s FROM %s WHERE NOT (%s) AND NOT %s' % (
+                trans_table,
+                ', '.join([qn(trans_column) for trans_column, field in fields]),
+                master_pk, language_id,
+                ', '.join(['COALESCE(%s, %%s)' % column for column in columns]),
+                master_table, all_null, translation_exists), defaults))
+    return result
+
+
+class Command(BaseCommand):
+    option_list = BaseCommand.option_list + (
+        make_option('--to', dest='to', type='choice',
+            choices=('columns', 'table'),
+            help=('Copy the translations to the columns of the master '
+                  'table or to the translation table.')),
+        make_option('--add-columns', action='store_true', dest='add_columns',
+            default=False,
+            help='Add the missing translation columns to the master table.'),
+        make_option('--table', dest='table',
+            help=('The name of the translation table of models using the '
+                  'column storage (default: <master table>_translation).')),
+        make_option('--dry-run', action='store_true', dest='dry_run',
+            default=False,
+            help='Print the SQL statements instead of executing them.'),
+    )
+    help = ('Moves translations of multilingual models between the '
+            'translation table and columns of the master table.  Both '
+            'must exist in the database.')
+    args = 'appname.ModelName [appname.ModelName ...]'
+
+    def handle(self, *labels, **options):
+        if not labels:
+            raise CommandError('Enter at least one model.')
+        to = options.get('to')
+        if not (to or options.get('add_columns')):
+            raise CommandError('Use --to, --add-columns or both.')
+        table = options.get('table')
+
+        statements = []
+        for label in labels:
+            try:
+                app_label, model_name = label.split('.')
+            except ValueError:
+                raise CommandError('Use appname.ModelName, not %r.' % label)
+            model = models.get_model(app_label, model_name)
+            if model is None:
+                raise CommandError('Unknown model: %s' % label)
+            if options.get('add_columns'):
+                statements.extend(get_add_columns_sql(model, table))
+            if to == 'columns':
+                statements.extend(get_to_columns_sql(model, table))
+            elif to == 'table':
+                statements.extend(get_to_table_sql(model, table))
+
+        if options.get('dry_run'):
+            for sql, params in statements:
+                if params:
+                    print '%s; -- %r' % (sql, params)
+                else:
+                    print '%s;' % sql
+            return
+        self.execute_statements(statements)
+
+    def execute_statements(self, statements):
+        cursor = connection.cursor()
+        for sql, params in statements:
+            cursor.execute(sql, params)
+    execute_statements = transaction.commit_on_success(execute_statements)
@@ -1,5 +1,8 @@
-from django.db import models
+from django.core.cache import cache
+from django.db import connection, models
+from django.utils.hashcompat import md5_constructor
 
+from multilingual.cache import get_translation_version
 from multilingual.query import MultilingualModelQuerySet
 from multilingual.languages import *
 
@@ -15,3 +18,103 @@ class Manager(models.Manager):
 
     def get_query_set(self):
         return MultilingualModelQuerySet(self.model)
+
+
+class TranslationManager(models.Manager):
+    """
+    The default manager of translation models.
+
+    Adds methods computing translation statistics.
+    """
+
+    def coverage(self, group_by=None, fields=None):
+        """
+        Return translation statistics: a dictionary mapping language
+        IDs to dictionaries with the number of translated objects
+        ('count') and the numbers of their non-empty translated
+        fields ('fields', a dictionary mapping field names to counts).
+
+        `fields` limits the reported fields to the given names.  If
+        `group_by` names a field of the multilingual model, the result
+        maps values of that field to such dictionaries instead.
+
+        Everything is computed with one aggregate query.
+        """
+        opts = self.model._meta
+        master_field = opts.get_field('master')
+        master_opts = master_field.rel.to._meta
+        qn = connection.ops.quote_name
+        trans_table = qn(opts.db_table)
+        trans_source = trans_table
+        if opts.language_models:
+            # count the rows of all the language tables
+            columns = ', '.join([qn(f.column) for f in opts.fields])
+            trans_source = '(%s) %s' % (' UNION ALL '.join([
+                        'SELECT %s FROM %s' % (columns, qn(model._meta.db_table))
+                        for model in opts.language_models.values()]),
+                                        trans_table)
+        if fields is None:
+            fields = [f.name for f in opts.fields
+                      if f.name in opts.translated_fields]
+
+        language_column = '%s.%s' % (trans_table,
+                                     qn(opts.get_field('language_id').column))
+        select = [language_column]
+        group = [language_column]
+        from_ = trans_source
+        if group_by is not None:
+            master_table = qn(master_opts.db_table)
+            group_column = '%s.%s' % (
+                master_table, qn(master_opts.get_field(group_by).column))
+            select.append(group_column)
+            group.append(group_column)
+            from_ = '%s INNER JOIN %s ON %s.%s = %s.%s' % (
+                trans_source, master_table, trans_table,
+                qn(master_field.column), master_table,
+                qn(master_opts.pk.column))
+        select.append('COUNT(*)')
+        for name in fields:
+            field = opts.get_field(name)
+            column = '%s.%s' % (trans_table, qn(field.column))
+            if field.empty_strings_allowed:
+                condition = "%s IS NOT NULL AND %s <> ''" % (column, column)
+            else:
+                condition = '%s IS NOT NULL' % column
+            select.append('SUM(CASE WHEN %s THEN 1 ELSE 0 END)' % condition)
+
+        cursor = connection.cursor()
+        cursor.execute('SELECT %s FROM %s GROUP BY %s' % (
+            ', '.join(select), from_, ', '.join(group)))
+
+        result = {}
+        for row in cursor.fetchall():
+            row = list(row)
+            language_id = row.pop(0)
+            if group_by is None:
+                stats = result
+            else:
+                stats = result.setdefault(row.pop(0), {})
+            count = row.pop(0)
+            stats[language_id] = {
+                'count': count,
+                # SUM returns NULL or a Decimal on some databases
+                'fields': dict([(name, int(value or 0))
+                                for name, value in zip(fields, row)]),
+                }
+        return result
+
+    def cached_coverage(self, group_by=None, fields=None, timeout=None):
+        """
+        Like coverage, but the results are stored in the cache until a
+        translation of the model is saved or deleted.
+        """
+        opts = self.model._meta
+        key = 'multilingual.coverage.%s.%s.%s.%s' % (
+            opts.app_label, opts.object_name.lower(),
+            get_translation_version(self.model),
+            md5_constructor(repr((group_by, fields))).hexdigest())
+        result = cache.get(key)
+        if result is None:
+            result = self.coverage(group_by, fields)
+            cache.set(key, result, timeout)
+        return result
@@ -1,7 +1,21 @@
+import logging
+import re
+try:
+    from threading import Lock, local
+except ImportError:
+    from dummy_threading import Lock, local
+
+from django.conf import settings
+from django.utils import translation
+from django.utils.cache import patch_vary_headers
 from django.utils.translation import get_language
+from django.utils.translation.trans_real import parse_accept_lang_header
 
+from multilingual import signals
 from multilingual.exceptions import LanguageDoesNotExist
-from multilingual.languages import set_default_language
+from multilingual.languages import (set_default_language, get_language_code,
+                                    get_language_id_from_id_or_code,
+                                    LANGUAGE_IDS)
 
 
 class DefaultLanguageMiddleware(object):
@@ -22,3 +36,213 @@ class DefaultLanguageMiddleware(object):
         except LanguageDoesNotExist:
             # Try without the territory suffix
             set_default_language(get_language()[:2])
+
+
+class _LRUCache(object):
+    """
+    A small thread-safe dictionary that forgets the least recently used
+    keys.
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self.data = {}
+        self.keys = []
+        self.lock = Lock()
+
+    def get(self, key, default=None):
+        self.lock.acquire()
+        try:
+            if key not in self.data:
+                return default
+            self.keys.remove(key)
+            self.keys.append(key)
+            return self.data[key]
+        finally:
+            self.lock.release()
+
+    def set(self, key, value):
+        self.lock.acquire()
+        try:
+            if key in self.data:
+                self.keys.remove(key)
+            elif len(self.keys) >= self.size:
+                del self.data[self.keys.pop(0)]
+            self.keys.append(key)
+            self.data[key] = value
+        finally:
+            self.lock.release()
+
+
+class LanguageRoutingMiddleware(object):
+    """
+    Selects the language of a request without using sessions.
+
+    The language is taken from the first of these sources that names
+    a known language:
+
+     * a URL prefix, e.g. /pl/about/; the prefix is removed from
+       request.path_info, so URLconfs do not have to know about it
+     * the subdomain, e.g. pl.example.com
+     * the Accept-Language header
+
+    The sources can be limited with the MULTILINGUAL_LANGUAGE_SOURCES
+    setting, e.g. ('prefix', 'header').  If none of them gives a
+    language, DEFAULT_LANGUAGE is used.
+
+    The selected language is set both as the multilingual default
+    language and as Django's active language, so this middleware
+    replaces both LocaleMiddleware and DefaultLanguageMiddleware.
+    """
+
+    # the number of parsed Accept-Language headers to remember
+    accept_language_cache_size = 256
+
+    def __init__(self):
+        self.sources = getattr(settings, 'MULTILINGUAL_LANGUAGE_SOURCES',
+                               ('prefix', 'subdomain', 'header'))
+        # try longer codes first, so that /zh-cn/ does not match 'zh'
+        codes = LANGUAGE_IDS.keys()
+        codes.sort(lambda a, b: cmp(len(b), len(a)))
+        self.prefix_re = re.compile(r'^/(%s)(/|$)' %
+                                    '|'.join([re.escape(code) for code in codes]))
+        self.accept_language_cache = _LRUCache(self.accept_language_cache_size)
+
+    def get_prefix_language(self, request):
+        match = self.prefix_re.match(request.path_info)
+        if match is None:
+            return None
+        request.path_info = request.path_info[len(match.group(1)) + 1:] or '/'
+        return LANGUAGE_IDS[match.group(1)]
+
+    def get_subdomain_language(self, request):
+        host = request.get_host().split(':')[0]
+        if host.count('.') < 2:
+            return None
+        return LANGUAGE_IDS.get(host.split('.', 1)[0].lower())
+
+    def get_header_language(self, request):
+        header = request.META.get('HTTP_ACCEPT_LANGUAGE')
+        if not header:
+            return None
+        # 0 means "no language in the header"
+        language_id = self.accept_language_cache.get(header)
+        if language_id is None:
+            language_id = 0
+            for code, priority in parse_accept_lang_header(header):
+                if code == '*':
+                    continue
+                try:
+                    language_id = get_language_id_from_id_or_code(code.lower())
+                    break
+                except LanguageDoesNotExist:
+                    pass
+            self.accept_language_cache.set(header, language_id)
+        return language_id or None
+
+    def process_request(self, request):
+        language_id = None
+        if 'prefix' in self.sources:
+            language_id = self.get_prefix_language(request)
+        if language_id is None and 'subdomain' in self.sources:
+            language_id = self.get_subdomain_language(request)
+        if language_id is None and 'header' in self.sources:
+            language_id = self.get_header_language(request)
+        if language_id is None:
+            language_id = settings.DEFAULT_LANGUAGE
+
+        set_default_language(language_id)
+        language_code = get_language_code(language_id)
+        translation.activate(language_code)
+        request.LANGUAGE_CODE = language_code
+
+    def process_response(self, request, response):
+        if 'header' in self.sources:
+            patch_vary_headers(response, ('Accept-Language',))
+        if not response.has_header('Content-Language'):
+            response['Content-Language'] = translation.get_language()
+        translation.deactivate()
+        return response
+
+
+class TranslationStatsMiddleware(object):
+    """
+    Collects per-request statistics of the work done by the library:
+
+     * queries: compiled queries of multilingual models
+     * data-joins: joins fetching translation data
+     * lookup-joins: joins used by filters and ordering on translated
+       fields
+     * cache-fallbacks: translations loaded with a separate query by
+       fill_translation_cache
+     * missing: TranslationDoesNotExist raised
+     * fallbacks-used: translations taken from a fallback language
+     * saves: translations saved with their objects
+
+    With DEBUG the statistics are added to the response as
+    X-Multilingual-* headers (e.g. X-Multilingual-Data-Joins),
+    otherwise they are logged at the DEBUG level to the
+    'multilingual' logger.  They are also available to views as
+    request.multilingual_stats.
+    """
+
+    def __init__(self):
+        self.state = local()
+        self.logger = logging.getLogger('multilingual')
+        signals.translation_joins.connect(self.count_joins)
+        signals.translation_cache_fallback.connect(self.count_cache_fallback)
+        signals.translation_missing.connect(self.count_missing)
+        signals.translation_fallback_used.connect(self.count_fallback_used)
+        signals.translation_saved.connect(self.count_save)
+
+    def increment(self, name, value=1):
+        # signals sent outside of requests processed by this
+        # middleware instance are ignored
+        stats = getattr(self.state, 'stats', None)
+        if stats is not None:
+            stats[name] += value
+
+    def count_joins(self, sender, data_joins, lookup_joins, **kwargs):
+        self.increment('queries')
+        self.increment('data-joins', data_joins)
+        self.increment('lookup-joins', lookup_joins)
+
+    def count_cache_fallback(self, sender, **kwargs):
+        self.increment('cache-fallbacks')
+
+    def count_missing(self, sender, **kwargs):
+        self.increment('missing')
+
+    def count_fallback_used(self, sender, **kwargs):
+        self.increment('fallbacks-used')
+
+    def count_save(self, sender, **kwargs):
+        self.increment('saves')
+
+    def process_request(self, request):
+        self.state.stats = request.multilingual_stats = {
+            'queries': 0,
+            'data-joins': 0,
+            'lookup-joins': 0,
+            'cache-fallbacks': 0,
+            'missing': 0,
+            'fallbacks-used': 0,
+            'saves': 0,
+            }
+
+    def process_response(self, request, response):
+        stats = getattr(self.state, 'stats', None)
+        if stats is None:
+            return response
+        self.state.stats = None
+        names = stats.keys()
+        names.sort()
+        if settings.DEBUG:
+            for name in names:
+                header = 'X-Multilingual-' + '-'.join(
+                    [word.capitalize() for word in name.split('-')])
+                response[header] = str(stats[name])
+        else:
+            self.logger.debug('%s %s' % (request.path, ' '.join(
+                ['%s=%s' % (name, stats[name]) for name in names])))
+        return response
@@ -0,0 +1,140 @@
+"""
+Django-multilingual: keyset pagination of multilingual objects ordered
+by a translated field.
+
+Offset pagination makes the database sort and skip all the rows before
+the requested page, so deep pages get slower and slower.  A keyset
+paginator remembers the sort key of the last object of a page instead
+and seeks directly to the objects after it; with an index on
+(language_id, field, master_id) of the translation table every page
+costs the same.
+"""
+
+from multilingual.languages import (get_default_language,
+                                    get_language_id_from_id_or_code)
+
+# the name of the extra select holding the sort key of every object
+KEY_ALIAS = '_keyset_key'
+
+
+class KeysetPage(object):
+    """
+    A page of objects returned by KeysetPaginator.page.
+    """
+
+    def __init__(self, object_list, paginator, has_next, has_previous):
+        self.object_list = object_list
+        self.paginator = paginator
+        self._has_next = has_next
+        self._has_previous = has_previous
+
+    def __repr__(self):
+        return '<Keyset page of %d objects>' % len(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self):
+        return self._has_next
+
+    def has_previous(self):
+        return self._has_previous
+
+    def has_other_pages(self):
+        return self.has_previous() or self.has_next()
+
+    def next_key(self):
+        """
+        Return the key to pass as `after` to KeysetPaginator.page to get
+        the next page, or None if this is the last page.
+        """
+        if not self._has_next or not self.object_list:
+            return None
+        return self.paginator.get_key(self.object_list[-1])
+
+    def previous_key(self):
+        """
+        Return the key to pass as `before` to KeysetPaginator.page to get
+        the previous page, or None if this is the first page.
+        """
+        if not self._has_previous or not self.object_list:
+            return None
+        return self.paginator.get_key(self.object_list[0])
+
+
+class KeysetPaginator(object):
+    """
+    Paginates a MultilingualModelQuerySet ordered by a translated field
+    in one language and then by the primary key.
+
+    Pages are requested by the key of the object just before (or after)
+    them, a tuple (field value, primary key) returned by
+    KeysetPage.next_key and previous_key.  Objects without a
+    translation in the language are not included.
+    """
+
+    def __init__(self, queryset, field_name, per_page, language=None,
+                 descending=False):
+        self.queryset = queryset
+        self.per_page = per_page
+        self.descending = descending
+        opts = queryset.model._meta
+        trans_opts = opts.translation_model._meta
+        field, language_id = trans_opts.translated_fields[field_name]
+        if language is not None:
+            language_id = get_language_id_from_id_or_code(language)
+        elif language_id is None:
+            language_id = getattr(queryset, '_default_language', None) or \
+                get_default_language()
+        self.field = field
+        self.language_id = language_id
+
+    def get_key(self, obj):
+        """
+        Return the key of obj, an object returned by this paginator.
+        """
+        return (getattr(obj, KEY_ALIAS), obj._get_pk_val())
+
+    def _get_queryset(self, after=None, before=None):
+        queryset = self.queryset._clone()
+        query = queryset.query
+        opts = queryset.model._meta
+        qn = query.connection.ops.quote_name
+        # join the translations like a filter on the translated field
+        # in the paginated language does, so the index on
+        # (language_id, field, master_id) can be used
+        table_alias = query.setup_translation_join(opts, self.field.name,
+                                                   self.language_id)[1]
+        key_column = '%s.%s' % (qn(table_alias), qn(self.field.column))
+        pk_column = '%s.%s' % (qn(opts.db_table), qn(opts.pk.column))
+
+        # seeking backwards is done by reversing the order and the
+        # result
+        backwards = before is not None
+        descending = self.descending != backwards
+        where = ['%s IS NOT NULL' % key_column]
+        params = []
+        key = after or before
+        if key is not None:
+            operator = descending and '<' or '>'
+            where.append('(%s %s %%s OR (%s = %%s AND %s %s %%s))' % (
+                key_column, operator, key_column, pk_column, operator))
+            params.extend([key[0], key[0], key[1]])
+        direction = descending and '-' or ''
+        return queryset.extra(
+            select={KEY_ALIAS: key_column}, where=where, params=params,
+            order_by=[direction + key_column, direction + pk_column])
+
+    def page(self, after=None, before=None):
+        """
+        Return the first page, the page following the key `after` or the
+        page preceding the key `before`.
+        """
+        queryset = self._get_queryset(after, before)
+        object_list = list(queryset[:self.per_page + 1])
+        more = len(object_list) > self.per_page
+        object_list = object_list[:self.per_page]
+        if before is not None:
+            object_list.reverse()
+            return KeysetPage(object_list, self, True, more)
+        return KeysetPage(object_list, self, more, after is not None)
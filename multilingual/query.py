@@ -6,7 +6,9 @@ This file contains the implementation for QSRF Django.
 """
 
 import datetime
+import operator
 
+from django.conf import settings
 from django.core.exceptions import FieldError
 from django.db import connection
 from django.db.models.fields import FieldDoesNotExist
@@ -17,7 +19,8 @@ from django.db.models.sql.datastructures import (
     Empty,
     MultiJoin)
 from django.db.models.sql.constants import *
-from django.db.models.sql.where import WhereNode, EverythingNode, AND, OR
+from django.db.models.sql.where import (WhereNode, EverythingNode,
+                                       ExtraWhere, AND, OR)
 
 try:
     # handle internal API changes in Django rev. 9700
@@ -35,44 +38,255 @@ from multilingual.languages import (
     get_language_id_list,
     get_default_language,
     get_translated_field_alias,
+    get_translation_column_name,
+    get_language_code,
     get_language_id_from_id_or_code)
+from multilingual import signals
+from multilingual.utils import get_translation_model
 
 __ALL__ = ['MultilingualModelQuerySet']
 
 
+class TranslationExistsNode(object):
+    """
+    A WHERE clause node that checks whether a translation in the given
+    language exists, using an (NOT) EXISTS subquery on the translation
+    table.
+    """
+
+    def __init__(self, alias, opts, language_id, exists=True):
+        self.alias = alias
+        self.opts = opts
+        self.language_id = language_id
+        self.exists = exists
+
+    def as_sql(self, qn=None, **kwargs):
+        qn2 = connection.ops.quote_name
+        if qn is None:
+            qn = qn2
+        trans_opts = get_translation_model(self.opts, self.language_id)._meta
+        trans_table = qn2(trans_opts.db_table)
+        sql = ('%sEXISTS (SELECT 1 FROM %s WHERE %s.%s = %s.%s'
+               % (not self.exists and 'NOT ' or '',
+                  trans_table,
+                  trans_table, qn2(trans_opts.get_field('master').column),
+                  qn(self.alias), qn2(self.opts.pk.column)))
+        if self.opts.translation_model._meta.language_models:
+            # the table holds only translations in one language
+            return sql + ')', []
+        sql += ' AND %s.%s = %%s)' % (
+            trans_table, qn2(trans_opts.get_field('language_id').column))
+        return sql, [self.language_id]
+
+    def relabel_aliases(self, change_map):
+        self.alias = change_map.get(self.alias, self.alias)
+
+    def __deepcopy__(self, memo):
+        # WHERE clauses are deep-copied with their queries; opts must
+        # not be
+        return TranslationExistsNode(self.alias, self.opts, self.language_id,
+                                     self.exists)
+
+
+def has_extra_where(node):
+    """
+    Return True if the WHERE clause node contains custom SQL added with
+    extra(where=...).
+    """
+    for child in node.children:
+        if isinstance(child, ExtraWhere):
+            return True
+        if isinstance(child, WhereNode) and has_extra_where(child):
+            return True
+    return False
+
+
+def get_json_extract_sql(column_sql, language_code, field_name=None):
+    """
+    Return an SQL expression extracting the translation in
+    language_code from a TranslationsJSONField column or, if field_name
+    is given, the value of one of its fields.  Both are NULL if the
+    translation does not exist.
+
+    Supported on SQLite (with the JSON1 extension), PostgreSQL 9.4 and
+    later and MySQL 5.7 and later.
+    """
+    engine = settings.DATABASE_ENGINE
+    path = '$."%s"' % language_code
+    if field_name is not None:
+        path += '."%s"' % field_name
+    if engine == 'sqlite3':
+        return "json_extract(%s, '%s')" % (column_sql, path)
+    if engine in ('postgresql', 'postgresql_psycopg2'):
+        if field_name is not None:
+            return "(CAST(%s AS jsonb) -> '%s' ->> '%s')" % (
+                column_sql, language_code, field_name)
+        return "(CAST(%s AS jsonb) -> '%s')" % (column_sql, language_code)
+    if engine == 'mysql':
+        if field_name is not None:
+            return "JSON_UNQUOTE(JSON_EXTRACT(%s, '%s'))" % (column_sql, path)
+        return "JSON_EXTRACT(%s, '%s')" % (column_sql, path)
+    raise NotImplementedError("The JSON storage of translations is not "
+                              "supported by the %s database backend" % engine)
+
+
+class TranslationDocumentNode(object):
+    """
+    A WHERE clause node applying a lookup to a translated field stored
+    in the translation document of a model, see get_json_extract_sql.
+
+    With field_name=None it only accepts the isnull lookup, which
+    checks whether the translation exists.
+    """
+
+    def __init__(self, alias, opts, language_id, field, lookup_type, value,
+                 negate=False):
+        self.alias = alias
+        self.opts = opts
+        self.language_id = language_id
+        self.field = field
+        self.lookup_type = lookup_type
+        self.value = value
+        self.negate = negate
+
+    def as_sql(self, qn=None, **kwargs):
+        if qn is None:
+            qn = connection.ops.quote_name
+        column = self.opts.translation_document_field.column
+        field_name = self.field is not None and self.field.name or None
+        lhs = get_json_extract_sql('%s.%s' % (qn(self.alias), qn(column)),
+                                   get_language_code(self.language_id),
+                                   field_name)
+        lookup_type = self.lookup_type
+        if lookup_type == 'isnull':
+            return '%s IS %sNULL' % (lhs, not self.value and 'NOT ' or ''), []
+
+        params = self.field.get_db_prep_lookup(lookup_type, self.value)
+        if lookup_type in connection.operators:
+            sql = '%s %s' % (connection.ops.lookup_cast(lookup_type) % lhs,
+                             connection.operators[lookup_type] % '%s')
+        elif lookup_type == 'in':
+            if not params:
+                raise EmptyResultSet
+            sql = '%s IN (%s)' % (lhs, ', '.join(['%s'] * len(params)))
+        elif lookup_type == 'range':
+            sql = '%s BETWEEN %%s AND %%s' % lhs
+        else:
+            raise FieldError("Lookup type %r is not supported for translated "
+                             "fields stored in JSON" % lookup_type)
+        if self.negate:
+            # exclude() should return the objects without the
+            # translation too
+            sql = '(%s AND %s IS NOT NULL)' % (sql, lhs)
+        return sql, list(params)
+
+    def relabel_aliases(self, change_map):
+        self.alias = change_map.get(self.alias, self.alias)
+
+    def __deepcopy__(self, memo):
+        return TranslationDocumentNode(self.alias, self.opts, self.language_id,
+                                       self.field, self.lookup_type,
+                                       self.value, self.negate)
+
+
 class MultilingualQuery(Query):
 
     def __init__(self, model, connection, where=WhereNode):
         self.extra_join = {}
         self.include_translation_data = True
+        self.translation_language_ids = None
+        self.any_language_lookups = False
         extra_select = {}
         super(MultilingualQuery, self).__init__(model, connection, where=where)
         opts = self.model._meta
         qn = self.quote_name_unless_alias
         qn2 = self.connection.ops.quote_name
         master_table_name = opts.db_table
-        translation_opts = opts.translation_model._meta
-        trans_table_name = translation_opts.db_table
         if hasattr(opts, 'translation_model'):
             master_table_name = opts.db_table
             for language_id in get_language_id_list():
-                for fname in [f.attname for f in translation_opts.fields]:
-                    table_alias = get_translation_table_alias(trans_table_name,
-                        language_id)
-                    field_alias = get_translated_field_alias(fname,
-                        language_id)
-                    extra_select[field_alias] = qn2(table_alias) + '.' + qn2(fname)
+                extra_select.update(self._translation_extra_select(language_id))
             self.add_extra(extra_select, None, None, None, None, None)
             self._trans_extra_select_count = len(self.extra_select)
 
     def clone(self, klass=None, **kwargs):
         defaults = {
-            'extra_join': self.extra_join,
+            'extra_join': self.extra_join.copy(),
             'include_translation_data': self.include_translation_data,
+            'translation_language_ids': self.translation_language_ids,
+            'any_language_lookups': self.any_language_lookups,
             }
         defaults.update(kwargs)
         return super(MultilingualQuery, self).clone(klass=klass, **defaults)
 
+    def _translation_extra_select(self, language_id):
+        """
+        Return a list of (alias, column) pairs of extra selects that
+        fetch the translation data for language_id.
+        """
+        qn2 = self.connection.ops.quote_name
+        translation_opts = self.model._meta.translation_model._meta
+        table_alias = get_translation_table_alias(translation_opts.db_table,
+                                                  language_id)
+        return [(get_translated_field_alias(fname, language_id),
+                 qn2(table_alias) + '.' + qn2(fname))
+                for fname in [f.attname for f in translation_opts.fields]]
+
+    def get_translation_join(self, opts, table_alias, language_id):
+        """
+        Return the LEFT JOIN clause adding the translations in
+        language_id of the model described by opts as table_alias.
+        """
+        qn = self.quote_name_unless_alias
+        qn2 = self.connection.ops.quote_name
+        trans_table_name = get_translation_model(opts, language_id)._meta.db_table
+        condition = '(%s.master_id = %s.%s)' % (qn2(table_alias),
+                                                qn(opts.db_table),
+                                                qn2(opts.pk.column))
+        if not opts.translation_model._meta.language_models:
+            condition += ' AND (%s.language_id = %s)' % (qn2(table_alias),
+                                                        language_id)
+        return 'LEFT JOIN %s AS %s ON (%s)' % (qn2(trans_table_name),
+                                               qn2(table_alias), condition)
+
+    def get_translation_language_ids(self):
+        """
+        Return the IDs of languages whose translation data is fetched
+        by this query.
+        """
+        if self.translation_language_ids is None:
+            return get_language_id_list()
+        return self.translation_language_ids
+
+    def set_translation_languages(self, language_ids):
+        """
+        Limit the translation data fetched by this query to the
+        languages in `language_ids`.
+
+        The joins and extra selects for all the other languages are
+        removed from the query.  Filtering and ordering on translated
+        fields is not affected, as it uses joins of its own.
+        """
+        self.translation_language_ids = list(language_ids)
+        if not hasattr(self.model._meta, 'translation_model'):
+            # translations stored in columns do not need any joins
+            return
+        translation_opts = self.model._meta.translation_model._meta
+        trans_table_name = translation_opts.db_table
+        for language_id in get_language_id_list():
+            extra_select = self._translation_extra_select(language_id)
+            if language_id in self.translation_language_ids:
+                for field_alias, column in extra_select:
+                    if field_alias not in self.extra_select:
+                        self.extra_select[field_alias] = column
+                continue
+            table_alias = get_translation_table_alias(trans_table_name,
+                                                      language_id)
+            self.extra_join.pop(table_alias, None)
+            for field_alias, column in extra_select:
+                if field_alias in self.extra_select:
+                    del self.extra_select[field_alias]
+
     def pre_sql_setup(self):
         """Adds the JOINS and SELECTS for fetching multilingual data.
         """
@@ -82,24 +296,19 @@ class MultilingualQuery(Query):
             return
 
         opts = self.model._meta
-        qn = self.quote_name_unless_alias
-        qn2 = self.connection.ops.quote_name
         if hasattr(opts, 'translation_model'):
-            master_table_name = opts.db_table
-            translation_opts = opts.translation_model._meta
-            trans_table_name = translation_opts.db_table
-            for language_id in get_language_id_list():
+            trans_table_name = opts.translation_model._meta.db_table
+            for language_id in self.get_translation_language_ids():
                 table_alias = get_translation_table_alias(trans_table_name,
                                                           language_id)
-                trans_join = ('LEFT JOIN %s AS %s ON ((%s.master_id = %s.%s) AND (%s.language_id = %s))'
-                           % (qn2(translation_opts.db_table),
-                           qn2(table_alias),
-                           qn2(table_alias),
-                           qn(master_table_name),
-                           qn2(self.model._meta.pk.column),
-                           qn2(table_alias),
-                           language_id))
-                self.extra_join[table_alias] = trans_join
+                self.extra_join[table_alias] = self.get_translation_join(
+                    opts, table_alias, language_id)
+
+            if signals.translation_joins.receivers:
+                data_joins = len(self.get_translation_language_ids())
+                signals.send(signals.translation_joins, self.model,
+                             query=self, data_joins=data_joins,
+                             lookup_joins=len(self.extra_join) - data_joins)
 
     def get_from_clause(self):
         """Add the JOINS for related multilingual fields filtering.
@@ -144,6 +353,37 @@ class MultilingualQuery(Query):
             value = value()
 
         opts = self.get_meta()
+        if (len(parts) == 1 and getattr(opts, 'denormalized_fields', None)
+            and parts[0] in opts.translation_model._meta.translated_fields):
+            # lookups in the primary language can use the denormalized
+            # copies instead of a translation join
+            field, language_id = \
+                opts.translation_model._meta.translated_fields[parts[0]]
+            if language_id is None and not self.any_language_lookups:
+                language_id = get_default_language()
+            if (language_id == opts.primary_language_id
+                and field.name in opts.denormalized_fields):
+                parts = [opts.denormalized_fields[field.name].name]
+
+        if (self.any_language_lookups and len(parts) == 1
+            and parts[0] in getattr(opts, 'translation_columns', ())):
+            # translations stored in columns: match the objects with
+            # any of the language columns satisfying the condition
+            lookups = [Q(**{get_translation_column_name(parts[0], language_id)
+                            + LOOKUP_SEP + lookup_type: value})
+                       for language_id in get_language_id_list()]
+            masters = self.model._default_manager.filter(
+                reduce(operator.or_, lookups))
+            self.add_filter(('pk__in', masters.values('pk')), connector,
+                            negate, trim, can_reuse, process_extras)
+            return
+
+        if (len(parts) == 1
+            and parts[0] in getattr(opts, 'translation_document', ())):
+            self.add_translation_document_filter(parts[0], lookup_type,
+                                                 value, connector, negate)
+            return
+
         alias = self.get_initial_alias()
         allow_many = trim or not negate
 
@@ -166,6 +406,30 @@ class MultilingualQuery(Query):
                 field, model, direct, m2m = opts.get_field_by_name(field_name)
                 if model == opts.translation_model:
                     language_id = translation_opts.translated_fields[field_name][1]
+                    if language_id is None and self.any_language_lookups:
+                        # match the masters of all translations that
+                        # satisfy the condition
+                        pk_lookup = LOOKUP_SEP.join(parts[:-1] +
+                                                    [opts.pk.name, 'in'])
+                        language_models = translation_opts.language_models
+                        if not language_models:
+                            translations = model._default_manager.filter(
+                                **{field.name + LOOKUP_SEP + lookup_type: value})
+                            self.add_filter((pk_lookup, translations.values('master')),
+                                            connector, negate, trim, can_reuse,
+                                            process_extras)
+                            return
+                        # partitioned translations: one subquery per
+                        # language table
+                        self.where.start_subtree(connector)
+                        for language_model in language_models.values():
+                            translations = language_model._default_manager.filter(
+                                **{field.name + LOOKUP_SEP + lookup_type: value})
+                            self.add_filter((pk_lookup, translations.values('master')),
+                                            OR, negate, trim, can_reuse,
+                                            process_extras)
+                        self.where.end_subtree()
+                        return
                     if language_id is None:
                         language_id = get_default_language()
                     master_table_name = opts.db_table
@@ -318,9 +582,17 @@ class MultilingualQuery(Query):
                         field, model, direct, m2m = opts.get_field_by_name(f.name)
                         break
                 else:
-                    names = opts.get_all_field_names()
-                    raise FieldError("Cannot resolve keyword %r into field. "
-                            "Choices are: %s" % (name, ", ".join(names)))
+                    #NOTE: Django Multilingual: translated fields stored
+                    # in columns of the master table refer to the
+                    # column of the default language
+                    if name in getattr(opts, 'translation_columns', ()):
+                        name = get_translation_column_name(
+                            name, get_default_language())
+                        field, model, direct, m2m = opts.get_field_by_name(name)
+                    else:
+                        names = opts.get_all_field_names()
+                        raise FieldError("Cannot resolve keyword %r into field. "
+                                "Choices are: %s" % (name, ", ".join(names)))
 
             if not allow_many and (m2m or not direct):
                 for alias in joins:
@@ -331,25 +603,7 @@ class MultilingualQuery(Query):
             if hasattr(opts, 'translation_model'):
                 translation_opts = opts.translation_model._meta
                 if model == opts.translation_model:
-                    language_id = translation_opts.translated_fields[name][1]
-                    if language_id is None:
-                        language_id = get_default_language()
-                    #TODO: check alias
-                    master_table_name = opts.db_table
-                    trans_table_alias = get_translation_table_alias(
-                        model._meta.db_table, language_id)
-                    new_table = (master_table_name + "__" + trans_table_alias)
-                    qn = self.quote_name_unless_alias
-                    qn2 = self.connection.ops.quote_name
-                    trans_join = ('LEFT JOIN %s AS %s ON ((%s.master_id = %s.%s) AND (%s.language_id = %s))'
-                                 % (qn2(model._meta.db_table),
-                                 qn2(new_table),
-                                 qn2(new_table),
-                                 qn(master_table_name),
-                                 qn2(model._meta.pk.column),
-                                 qn2(new_table),
-                                 language_id))
-                    self.extra_join[new_table] = trans_join
+                    field, new_table = self.setup_translation_join(opts, name)
                     target = field
                     continue
                     #NOTE: End Django Multilingual specific code
@@ -491,6 +745,69 @@ class MultilingualQuery(Query):
 
         return field, target, opts, joins, last, extra_filters
 
+    def setup_translation_join(self, opts, name, language_id=None):
+        """
+        Add the join used by lookups on the translated field `name` of
+        the model described by opts.  `language_id` overrides the
+        language of the field name.
+
+        Returns a tuple (the translation model field, alias of the
+        joined translation table).
+        """
+        translation_opts = opts.translation_model._meta
+        field, name_language_id = translation_opts.translated_fields[name]
+        if language_id is None:
+            language_id = name_language_id
+        if language_id is None:
+            language_id = get_default_language()
+        #TODO: check alias
+        master_table_name = opts.db_table
+        trans_table_alias = get_translation_table_alias(
+            translation_opts.db_table, language_id)
+        new_table = (master_table_name + "__" + trans_table_alias)
+        self.extra_join[new_table] = self.get_translation_join(
+            opts, new_table, language_id)
+        return field, new_table
+
+    def add_translation_document_filter(self, name, lookup_type, value,
+                                        connector=AND, negate=False):
+        """
+        Add a filter on the translated field `name` stored in the
+        translation document of the model.
+        """
+        opts = self.get_meta()
+        field, language_id = opts.translation_document[name]
+        if language_id is not None:
+            language_ids = [language_id]
+        elif self.any_language_lookups:
+            language_ids = get_language_id_list()
+        else:
+            language_ids = [get_default_language()]
+        alias = self.get_initial_alias()
+        self.where.start_subtree(connector)
+        for language_id in language_ids:
+            self.where.add(TranslationDocumentNode(alias, opts, language_id,
+                                                   field, lookup_type, value,
+                                                   negate), OR)
+        self.where.end_subtree()
+
+    def add_aggregate(self, aggregate, model, alias, is_summary):
+        """
+        Make aggregates over translated fields (Django 1.1 and later)
+        use the translation tables.
+        """
+        opts = model._meta
+        if (self.include_translation_data
+            and hasattr(opts, 'translation_model')
+            and aggregate.lookup in opts.translation_model._meta.translated_fields):
+            field, table_alias = self.setup_translation_join(opts,
+                                                              aggregate.lookup)
+            aggregate.add_to_query(self, alias, col=(table_alias, field.column),
+                                   source=field, is_summary=is_summary)
+            return
+        super(MultilingualQuery, self).add_aggregate(aggregate, model, alias,
+                                                     is_summary)
+
     def setup_joins(self, names, opts, alias, dupe_multis, allow_many=True,
             allow_explicit_fk=False, can_reuse=None, negate=False,
             process_extras=True):
@@ -506,16 +823,24 @@ class MultilingualQuery(Query):
                                                       can_reuse, negate, process_extras)
 
     def get_count(self):
+        if not self.include_translation_data:
+            return super(MultilingualQuery, self).get_count()
         # optimize for the common special case: count without any
         # filters
-        if ((not (self.select or self.where or self.extra_where))
-            and self.include_translation_data):
+        if not (self.select or self.where):
             obj = self.clone(extra_select = {},
                              extra_join = {},
                              include_translation_data = False)
             return obj.get_count()
-        else:
-            return super(MultilingualQuery, self).get_count()
+        # the translation data is not needed for counting, only the
+        # joins used by filters on translated fields are, unless
+        # custom SQL might refer to the data joins
+        if not (self.select or has_extra_where(self.where)
+                or self.extra_tables or self.distinct):
+            obj = self.clone()
+            obj.set_translation_languages([])
+            return super(MultilingualQuery, obj).get_count()
+        return super(MultilingualQuery, self).get_count()
 
 
 class MultilingualModelQuerySet(QuerySet):
@@ -537,6 +862,96 @@ class MultilingualModelQuerySet(QuerySet):
         clone._default_language = get_language_id_from_id_or_code(language_id_or_code)
         return clone
 
+    def with_languages(self, *language_ids_or_codes):
+        """
+        Fetch translation data only for the given languages.
+
+        Objects returned by this query know nothing about the other
+        translations, so they should be used for reading only: saving
+        a translation in a language that was not fetched would try to
+        create it again.
+        """
+        clone = self._clone()
+        clone.query.set_translation_languages(
+            [get_language_id_from_id_or_code(language)
+             for language in language_ids_or_codes])
+        return clone
+
+    def any_language(self):
+        """
+        Make filters on translated fields without a language suffix
+        match the translations in any language instead of the default
+        one.
+        """
+        clone = self._clone()
+        clone.query.any_language_lookups = True
+        return clone
+
+    def has_translation(self, language_id_or_code):
+        """
+        Return only the objects that have a translation in the given
+        language.
+        """
+        return self._filter_translation_exists(language_id_or_code, True)
+
+    def missing_translation(self, language_id_or_code):
+        """
+        Return only the objects that do not have a translation in the
+        given language.
+        """
+        return self._filter_translation_exists(language_id_or_code, False)
+
+    def _filter_translation_exists(self, language_id_or_code, exists):
+        language_id = get_language_id_from_id_or_code(language_id_or_code)
+        opts = self.model._meta
+        translation_columns = getattr(opts, 'translation_columns', None)
+        if translation_columns is not None:
+            # a translation exists if any of its columns is not NULL
+            lookups = [Q(**{get_translation_column_name(fname, language_id)
+                            + '__isnull': not exists})
+                       for fname in translation_columns]
+            if exists:
+                return self.filter(reduce(operator.or_, lookups))
+            return self.filter(*lookups)
+        clone = self._clone()
+        query = clone.query
+        if hasattr(opts, 'translation_document'):
+            node = TranslationDocumentNode(query.get_initial_alias(), opts,
+                                           language_id, None, 'isnull',
+                                           not exists)
+        else:
+            node = TranslationExistsNode(query.get_initial_alias(), opts,
+                                         language_id, exists)
+        query.where.add(node, AND)
+        return clone
+
+    def _get_translation_document_select(self, field_names, aliases=False):
+        """
+        Return the extra select dictionary extracting the translated
+        fields among field_names from the translation document, keyed
+        by the field names or, with aliases=True, by their aliases.
+        """
+        opts = self.model._meta
+        qn2 = self.query.connection.ops.quote_name
+        column_sql = '%s.%s' % (qn2(opts.db_table),
+                                qn2(opts.translation_document_field.column))
+        extra_select = {}
+        for field_name in field_names:
+            field_and_lang = opts.translation_document.get(field_name)
+            if field_and_lang:
+                field, language_id = field_and_lang
+                if language_id is None:
+                    language_id = getattr(self, '_default_language', None)
+                if language_id is None:
+                    language_id = get_default_language()
+                if aliases:
+                    key = get_translated_field_alias(field.name, language_id)
+                else:
+                    key = field_name
+                extra_select[key] = get_json_extract_sql(
+                    column_sql, get_language_code(language_id), field.name)
+        return extra_select
+
     def iterator(self):
         """
         Add the default language information to all returned objects.
@@ -545,6 +960,9 @@ class MultilingualModelQuerySet(QuerySet):
 
         for obj in super(MultilingualModelQuerySet, self).iterator():
             obj._default_language = default_language
+            # the translation data is already in obj, so
+            # fill_translation_cache should not look for it elsewhere
+            obj._translation_data_loaded = True
             yield obj
 
     def _clone(self, klass=None, **kwargs):
@@ -558,7 +976,8 @@ class MultilingualModelQuerySet(QuerySet):
 
     def order_by(self, *field_names):
         if hasattr(self.model._meta, 'translation_model'):
-            trans_opts = self.model._meta.translation_model._meta
+            opts = self.model._meta
+            trans_opts = opts.translation_model._meta
             new_field_names = []
             for field_name in field_names:
                 prefix = ''
@@ -570,12 +989,56 @@ class MultilingualModelQuerySet(QuerySet):
                     field, language_id = field_and_lang
                     if language_id is None:
                         language_id = getattr(self, '_default_language', None)
-                    real_name = get_translated_field_alias(field.attname,
-                                                           language_id)
+                    if (field.name in opts.denormalized_fields
+                        and (language_id or get_default_language())
+                            == opts.primary_language_id):
+                        # no translation data is needed
+                        real_name = opts.denormalized_fields[field.name].name
+                    else:
+                        real_name = get_translated_field_alias(field.attname,
+                                                               language_id)
                     new_field_names.append(prefix + real_name)
                 else:
                     new_field_names.append(prefix + field_name)
             return super(MultilingualModelQuerySet, self).extra(order_by=new_field_names)
+        elif hasattr(self.model._meta, 'translation_columns'):
+            translation_columns = self.model._meta.translation_columns
+            language_id = getattr(self, '_default_language', None)
+            if language_id is None:
+                language_id = get_default_language()
+            new_field_names = []
+            for field_name in field_names:
+                prefix = ''
+                if field_name[0] == '-':
+                    prefix = '-'
+                    field_name = field_name[1:]
+                if field_name in translation_columns:
+                    field_name = get_translation_column_name(field_name,
+                                                             language_id)
+                new_field_names.append(prefix + field_name)
+            return super(MultilingualModelQuerySet, self).order_by(*new_field_names)
+        elif hasattr(self.model._meta, 'translation_document'):
+            translation_document = self.model._meta.translation_document
+            names = [field_name.lstrip('-') for field_name in field_names]
+            extra_select = self._get_translation_document_select(names,
+                                                                 aliases=True)
+            language_id = getattr(self, '_default_language', None)
+            if language_id is None:
+                language_id = get_default_language()
+            new_field_names = []
+            for field_name in field_names:
+                prefix = ''
+                if field_name[0] == '-':
+                    prefix = '-'
+                    field_name = field_name[1:]
+                field_and_lang = translation_document.get(field_name)
+                if field_and_lang:
+                    field, field_language_id = field_and_lang
+                    field_name = get_translated_field_alias(
+                        field.name, field_language_id or language_id)
+                new_field_names.append(prefix + field_name)
+            return super(MultilingualModelQuerySet, self).extra(
+                select=extra_select, order_by=new_field_names)
         else:
             return super(MultilingualModelQuerySet, self).order_by(*field_names)
 
@@ -600,6 +1063,10 @@ class MultilingualModelQuerySet(QuerySet):
             result = self.extra(select = extra_select)
             # and it returns MultilingualModelQuerySet instance, so we have to super it
             return super(MultilingualModelQuerySet, result).values(*fields)
+        elif hasattr(self.model._meta, 'translation_document'):
+            result = self.extra(
+                select=self._get_translation_document_select(fields))
+            return super(MultilingualModelQuerySet, result).values(*fields)
         else:
             return super(MultilingualModelQuerySet, self).values(*fields) 
 
@@ -624,6 +1091,10 @@ class MultilingualModelQuerySet(QuerySet):
             result = self.extra(select = extra_select)
             # and it return MultilingualModelQuerySet instance, so we have to super it
             return super(MultilingualModelQuerySet, result).values_list(*fields, **kwargs)
+        elif hasattr(self.model._meta, 'translation_document'):
+            result = self.extra(
+                select=self._get_translation_document_select(fields))
+            return super(MultilingualModelQuerySet, result).values_list(*fields, **kwargs)
         else:
             return super(MultilingualModelQuerySet, self).values_list(*fields, **kwargs) 
 
@@ -0,0 +1,270 @@
+"""
+Django-multilingual: a serialization format for multilingual models.
+
+Every object is written as one line of JSON, with its translations
+nested by language code:
+
+    {"model": "articles.article", "pk": 1, "fields": {...},
+     "translations": {"en": {"title": "..."}, "pl": {"title": "..."}}}
+
+Translation model objects are not written separately.  Objects are
+read and written in chunks: translations missing from the serialized
+objects are loaded with one query per chunk, and the deserialized
+objects are saved with bulk inserts when their chunk is complete.
+
+Register the format in settings.py to use it with dumpdata and
+loaddata:
+
+    SERIALIZATION_MODULES = {'mljson': 'multilingual.serializers'}
+"""
+
+from itertools import islice
+from StringIO import StringIO
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.core.serializers.python import Serializer as PythonSerializer
+from django.core.serializers.python import Deserializer as PythonDeserializer
+from django.core.serializers.base import DeserializedObject
+from django.db import connection, models
+from django.db.models.query import QuerySet
+from django.utils import simplejson
+from django.utils.encoding import smart_unicode
+
+from multilingual.bulk import CHUNK_SIZE, save_translations
+from multilingual.languages import get_language_code, get_language_id_from_id_or_code
+from multilingual.translation import prefetch_translations
+
+
+def is_translation_model(model):
+    """
+    Return True if model stores translations of a multilingual model.
+    """
+    opts = model._meta
+    return hasattr(opts, 'translated_fields') or hasattr(opts, 'partition_of')
+
+
+def iter_chunks(objects, chunk_size):
+    """
+    Yield lists of at most chunk_size objects.
+    """
+    if isinstance(objects, QuerySet):
+        # do not fill the result cache of the queryset
+        objects = objects.iterator()
+    objects = iter(objects)
+    while True:
+        chunk = list(islice(objects, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+class Serializer(PythonSerializer):
+    """
+    Write objects as lines of JSON, with their translations.
+    """
+    internal_use_only = False
+
+    def serialize(self, queryset, **options):
+        self.chunk_size = options.pop('chunk_size', CHUNK_SIZE)
+        return super(Serializer, self).serialize(self.iter_objects(queryset),
+                                                 **options)
+
+    def iter_objects(self, queryset):
+        for chunk in iter_chunks(queryset, self.chunk_size):
+            prefetch_translations(chunk)
+            for obj in chunk:
+                if not is_translation_model(obj.__class__):
+                    yield obj
+
+    def start_serialization(self):
+        self._current = None
+
+    def handle_field(self, obj, field):
+        if field is getattr(obj._meta, 'translation_document_field', None):
+            # written as the translations of obj
+            return
+        super(Serializer, self).handle_field(obj, field)
+
+    def end_object(self, obj):
+        data = {
+            'model': smart_unicode(obj._meta),
+            'pk': smart_unicode(obj._get_pk_val(), strings_only=True),
+            'fields': self._current,
+            }
+        translations = self.get_translations(obj)
+        if translations:
+            data['translations'] = translations
+        simplejson.dump(data, self.stream, cls=DjangoJSONEncoder)
+        self.stream.write('\n')
+        self._current = None
+
+    def get_translations(self, obj):
+        """
+        Return a dictionary mapping language codes to dictionaries of
+        translated field values of obj.
+        """
+        opts = obj._meta
+        if hasattr(opts, 'translation_document_field'):
+            return getattr(obj, opts.translation_document_field.attname)
+        if not hasattr(opts, 'translation_model'):
+            return None
+        trans_opts = opts.translation_model._meta
+        fields = [f for f in trans_opts.fields
+                  if f.name in trans_opts.translated_fields]
+        obj.fill_translation_cache()
+        result = {}
+        for language_id, translation in obj._translation_cache.items():
+            if translation is None:
+                continue
+            result[get_language_code(language_id)] = dict([
+                    (f.name, smart_unicode(getattr(translation, f.attname),
+                                           strings_only=True))
+                    for f in fields])
+        return result
+
+    def getvalue(self):
+        if callable(getattr(self.stream, 'getvalue', None)):
+            return self.stream.getvalue()
+
+
+class BulkDeserializedObject(DeserializedObject):
+    """
+    A deserialized object saved by its BulkLoader when its chunk is
+    complete.
+    """
+
+    def __init__(self, obj, m2m_data, translations, loader):
+        super(BulkDeserializedObject, self).__init__(obj, m2m_data)
+        self.translations = translations
+        self.loader = loader
+
+    def save(self, save_m2m=True):
+        self.loader.add(self, save_m2m)
+
+
+class BulkLoader(object):
+    """
+    Saves deserialized objects in chunks: new objects of every model
+    are inserted with one executemany call, existing ones are saved
+    one by one and the translations are saved with
+    multilingual.bulk.save_translations.
+
+    No model signals are sent for the bulk inserted objects.
+    """
+
+    def __init__(self, chunk_size=CHUNK_SIZE):
+        self.chunk_size = chunk_size
+        self.pending = []
+
+    def add(self, deserialized, save_m2m=True):
+        self.pending.append((deserialized, save_m2m))
+
+    def is_full(self):
+        return len(self.pending) >= self.chunk_size
+
+    def flush(self):
+        by_model = {}
+        model_order = []
+        for deserialized, save_m2m in self.pending:
+            model = deserialized.object.__class__
+            if model not in by_model:
+                by_model[model] = []
+                model_order.append(model)
+            by_model[model].append((deserialized, save_m2m))
+        self.pending = []
+
+        for model in model_order:
+            objects = by_model[model]
+            self.save_objects(model, [deserialized.object
+                                      for deserialized, save_m2m in objects])
+            for deserialized, save_m2m in objects:
+                if save_m2m:
+                    for accessor_name, object_list in deserialized.m2m_data.items():
+                        setattr(deserialized.object, accessor_name, object_list)
+            if hasattr(model._meta, 'translation_model'):
+                self.save_translations(model, [deserialized for deserialized,
+                                               save_m2m in objects])
+
+    def save_objects(self, model, objects):
+        opts = model._meta
+        if opts.parents or [obj for obj in objects if obj._get_pk_val() is None]:
+            # inherited models and objects without primary keys are
+            # saved by the ORM
+            for obj in objects:
+                models.Model.save_base(obj, raw=True)
+            return
+
+        qn = connection.ops.quote_name
+        cursor = connection.cursor()
+        pks = [obj._get_pk_val() for obj in objects]
+        cursor.execute('SELECT %s FROM %s WHERE %s IN (%s)' % (
+                qn(opts.pk.column), qn(opts.db_table), qn(opts.pk.column),
+                ', '.join(['%s'] * len(pks))),
+                       [opts.pk.get_db_prep_value(pk) for pk in pks])
+        existing = set([row[0] for row in cursor.fetchall()])
+
+        rows = []
+        for obj in objects:
+            if opts.pk.get_db_prep_value(obj._get_pk_val()) in existing:
+                models.Model.save_base(obj, raw=True)
+            else:
+                rows.append([f.get_db_prep_save(getattr(obj, f.attname))
+                             for f in opts.local_fields])
+        if rows:
+            cursor.executemany('INSERT INTO %s (%s) VALUES (%s)' % (
+                    qn(opts.db_table),
+                    ', '.join([qn(f.column) for f in opts.local_fields]),
+                    ', '.join(['%s'] * len(opts.local_fields))), rows)
+
+    def save_translations(self, model, objects):
+        trans_opts = model._meta.translation_model._meta
+        by_language = {}
+        for deserialized in objects:
+            pk = deserialized.object._get_pk_val()
+            for code, values in deserialized.translations.items():
+                language_id = get_language_id_from_id_or_code(code)
+                by_language.setdefault(language_id, {})[pk] = dict([
+                        (str(name), trans_opts.get_field(name).to_python(value))
+                        for name, value in values.items()])
+        for language_id, values in by_language.items():
+            save_translations(model, language_id, values)
+
+
+def Deserializer(stream_or_string, **options):
+    """
+    Deserialize a stream or string of lines of JSON written by
+    Serializer.
+
+    The objects are saved in chunks of options['chunk_size'] objects,
+    when the iteration reaches the end of their chunk; the last chunk
+    is saved when the iteration ends.
+    """
+    chunk_size = options.pop('chunk_size', CHUNK_SIZE)
+    if isinstance(stream_or_string, basestring):
+        stream = StringIO(stream_or_string)
+    else:
+        stream = stream_or_string
+
+    # the data of the object being deserialized
+    current = {}
+    def read_objects():
+        for line in stream:
+            line = line.strip()
+            if line:
+                current['data'] = simplejson.loads(line)
+                yield current['data']
+
+    loader = BulkLoader(chunk_size)
+    for deserialized in PythonDeserializer(read_objects(), **options):
+        obj = deserialized.object
+        translations = current['data'].get('translations') or {}
+        document_field = getattr(obj._meta, 'translation_document_field', None)
+        if document_field is not None:
+            setattr(obj, document_field.attname, translations)
+            translations = {}
+        yield BulkDeserializedObject(obj, deserialized.m2m_data, translations,
+                                     loader)
+        # the objects yielded so far were saved (added to the loader)
+        if loader.is_full():
+            loader.flush()
+    loader.flush()
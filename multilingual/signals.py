@@ -0,0 +1,42 @@
+"""
+Django-multilingual: signals reporting what the library does behind the
+scenes.
+
+They exist for instrumentation, e.g. TranslationStatsMiddleware.  The
+sender of all the signals is the multilingual model class.
+
+Sending them is skipped when nothing is connected, so they cost next
+to nothing when unused.
+"""
+
+from django.dispatch import Signal
+
+# a query with translation joins was compiled; data_joins is the
+# number of joins fetching translation data, lookup_joins the number
+# of joins used by filters and ordering on translated fields
+translation_joins = Signal(providing_args=['query', 'data_joins',
+                                           'lookup_joins'])
+
+# fill_translation_cache had to load the translations of instance with
+# a separate query
+translation_cache_fallback = Signal(providing_args=['instance'])
+
+# TranslationDoesNotExist is about to be raised for instance
+translation_missing = Signal(providing_args=['instance', 'language_id'])
+
+# a fallback (e.g. 'title_any') translation was used instead of the one
+# in language_id
+translation_fallback_used = Signal(providing_args=['instance', 'language_id',
+                                                   'fallback_language_id'])
+
+# a translation of instance was saved together with it
+translation_saved = Signal(providing_args=['instance', 'translation',
+                                           'language_id'])
+
+
+def send(signal, sender, **kwargs):
+    """
+    Send signal, unless there are no receivers connected to it.
+    """
+    if signal.receivers:
+        signal.send(sender=sender, **kwargs)
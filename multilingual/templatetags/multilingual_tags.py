@@ -7,14 +7,24 @@ from django import forms
 from django.template import Node, NodeList, Template, Context, resolve_variable
 from django.template.loader import get_template, render_to_string
 from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Model
+from django.db.models.base import ModelBase
+from django.db.models.query import QuerySet
+from django.utils.hashcompat import md5_constructor
 from django.utils.html import escape
+from django.utils.http import urlquote
+from multilingual.cache import get_translation_version
 from multilingual.languages import (
     get_language_idx,
     get_default_language,
+    get_default_language_code,
     get_language_id_list,
     get_language_code,
     get_language_name,
-    get_language_bidi)
+    get_language_bidi,
+    get_fallback_language_ids)
+from multilingual.translation import prefetch_translations
 
 register = template.Library()
 
@@ -40,25 +50,52 @@ def language_bidi(language_id):
     return get_language_bidi(language_id)
 
 
+def _resolve_lookup(obj, bit):
+    """
+    Resolve a single part of a dotted template variable name the way
+    django.template.Variable does it.
+    """
+    try:
+        value = obj[bit]
+    except (TypeError, AttributeError, KeyError, IndexError):
+        try:
+            value = getattr(obj, bit)
+        except AttributeError:
+            raise template.VariableDoesNotExist(
+                "Failed lookup for key [%s] in %r", (bit, obj))
+    if callable(value):
+        value = value()
+    return value
+
+
 class EditTranslationNode(template.Node):
-    def __init__(self, form_name, field_name, language=None):
-        self.form_name = form_name
+    def __init__(self, form, field_name, language=None):
+        self.form = form
         self.field_name = field_name
         self.language = language
+        # cache the names of translation models
+        self.trans_model_names = {}
 
     def render(self, context):
-        form = resolve_variable(self.form_name, context)
+        form = self.form.resolve(context, True)
+        if form is None:
+            raise template.VariableDoesNotExist(
+                "Failed lookup for key [%s] in %r", (self.form.token, context))
         model = form._meta.model
-        trans_model = model._meta.translation_model
+        trans_model_name = self.trans_model_names.get(model)
+        if trans_model_name is None:
+            trans_model = model._meta.translation_model
+            trans_model_name = trans_model._meta.object_name.lower()
+            self.trans_model_names[model] = trans_model_name
         if self.language:
             language_id = self.language.resolve(context)
         else:
             language_id = get_default_language()
-        real_name = "%s.%s.%s.%s" % (self.form_name,
-                                     trans_model._meta.object_name.lower(),
-                                     get_language_idx(language_id),
-                                     self.field_name)
-        return str(resolve_variable(real_name, context))
+
+        value = _resolve_lookup(form, trans_model_name)
+        value = _resolve_lookup(value, get_language_idx(language_id))
+        value = _resolve_lookup(value, self.field_name)
+        return str(value)
 
 
 def do_edit_translation(parser, token):
@@ -70,7 +107,149 @@ def do_edit_translation(parser, token):
         language = parser.compile_filter(bits[3])
     else:
         language = None
-    return EditTranslationNode(bits[1], bits[2], language)
+    return EditTranslationNode(parser.compile_filter(bits[1]), bits[2],
+                               language)
+
+
+class PrefetchTranslationsNode(template.Node):
+    def __init__(self, objects, language=None, var_name=None):
+        self.objects = objects
+        self.language = language
+        self.var_name = var_name
+
+    def render(self, context):
+        objects = list(self.objects.resolve(context))
+        if self.language:
+            language_ids = get_fallback_language_ids(
+                self.language.resolve(context))
+        else:
+            language_ids = None
+        prefetch_translations(objects, language_ids)
+        if self.var_name:
+            context[self.var_name] = objects
+        return ''
+
+
+def do_prefetch_translations(parser, token):
+    """
+    Load the translations of a list of multilingual objects with one
+    query, e.g.::
+
+        {% prefetch_translations article.categories.all as categories %}
+        {% for category in categories %}
+            {{ category.name }}
+        {% endfor %}
+
+    An optional language argument limits the loaded translations to
+    that language and its fallbacks.  Without "as", the resolved list
+    is not stored, so the objects argument should be a variable that
+    is iterated later, like a queryset in the context.
+    """
+    bits = token.split_contents()
+    var_name = None
+    if len(bits) > 2 and bits[-2] == 'as':
+        var_name = bits[-1]
+        bits = bits[:-2]
+    if len(bits) not in [2, 3]:
+        raise template.TemplateSyntaxError, \
+              "%r tag requires 1 or 2 arguments and an optional 'as name'" % bits[0]
+    if len(bits) == 3:
+        language = parser.compile_filter(bits[2])
+    else:
+        language = None
+    return PrefetchTranslationsNode(parser.compile_filter(bits[1]), language,
+                                    var_name)
+
+
+def _get_models(value):
+    """
+    Return the list of models of value, which may be a model, a model
+    instance, a queryset or a list of model instances.
+    """
+    if isinstance(value, ModelBase):
+        return [value]
+    if isinstance(value, Model):
+        return [value.__class__]
+    if isinstance(value, QuerySet):
+        return [value.model]
+    models = []
+    for obj in value:
+        if obj.__class__ not in models:
+            models.append(obj.__class__)
+    return models
+
+
+class MultilingualCacheNode(template.Node):
+    def __init__(self, nodelist, expire_time, fragment_name, vary_on,
+                 versioned_by):
+        self.nodelist = nodelist
+        self.expire_time = expire_time
+        self.fragment_name = fragment_name
+        self.vary_on = vary_on
+        self.versioned_by = versioned_by
+
+    def render(self, context):
+        expire_time = self.expire_time.resolve(context)
+        try:
+            expire_time = int(expire_time)
+        except (ValueError, TypeError):
+            raise template.TemplateSyntaxError(
+                '"multilingual_cache" tag got a non-integer timeout value: %r'
+                % expire_time)
+        key_bits = [get_default_language_code()]
+        key_bits.extend([var.resolve(context) for var in self.vary_on])
+        for var in self.versioned_by:
+            for model in _get_models(var.resolve(context)):
+                key_bits.append(get_translation_version(model))
+        args = md5_constructor(u':'.join([urlquote(bit) for bit in key_bits]))
+        cache_key = 'multilingual.cache.%s.%s' % (self.fragment_name,
+                                                  args.hexdigest())
+        value = cache.get(cache_key)
+        if value is None:
+            value = self.nodelist.render(context)
+            cache.set(cache_key, value, expire_time)
+        return value
+
+
+def do_multilingual_cache(parser, token):
+    """
+    Cache the contents of a template fragment separately for every
+    language, e.g.::
+
+        {% multilingual_cache 500 sidebar request.user.username %}
+            .. sidebar ..
+        {% endmultilingual_cache %}
+
+    The arguments are the same as for Django's {% cache %} tag.  The
+    code of the current default language is always added to the cache
+    key.
+
+    Arguments that follow the "for" keyword can be multilingual models,
+    objects, querysets or lists of objects; the cached fragment is
+    invalidated whenever any translation of these models is saved::
+
+        {% multilingual_cache 500 article_list page for articles %}
+    """
+    nodelist = parser.parse(('endmultilingual_cache',))
+    parser.delete_first_token()
+    bits = token.split_contents()
+    if len(bits) < 3:
+        raise template.TemplateSyntaxError(
+            "%r tag requires at least 2 arguments." % bits[0])
+    vary_on = bits[3:]
+    versioned_by = []
+    if 'for' in vary_on:
+        idx = vary_on.index('for')
+        versioned_by = vary_on[idx + 1:]
+        vary_on = vary_on[:idx]
+        if not versioned_by:
+            raise template.TemplateSyntaxError(
+                "%r tag requires at least 1 argument after 'for'." % bits[0])
+    return MultilingualCacheNode(nodelist,
+                                 parser.compile_filter(bits[1]),
+                                 bits[2],
+                                 [parser.compile_filter(v) for v in vary_on],
+                                 [parser.compile_filter(v) for v in versioned_by])
 
 
 def reorder_translation_formset_by_language_id(inline_admin_form):
@@ -87,4 +266,6 @@ register.filter(language_code)
 register.filter(language_name)
 register.filter(language_bidi)
 register.tag('edit_translation', do_edit_translation)
+register.tag('prefetch_translations', do_prefetch_translations)
+register.tag('multilingual_cache', do_multilingual_cache)
 register.filter(reorder_translation_formset_by_language_id)
@@ -0,0 +1,152 @@
+"""
+Django-multilingual: a TestCase with assertions about the queries made
+for multilingual models.
+
+They make it possible to lock down the query budget of a view or a
+piece of code, so that changes adding N+1 translation loads or extra
+translation joins make the tests fail.
+"""
+
+import re
+
+from django.conf import settings
+from django.db import connection, models
+from django.test import TestCase
+
+from multilingual.languages import (get_language_id_from_id_or_code,
+                                    get_language_id_list,
+                                    get_translation_table_alias)
+
+
+def capture_queries(func, *args, **kwargs):
+    """
+    Call func and return a tuple (its return value, list of SQL
+    statements it executed).
+
+    DEBUG is turned on for the duration of the call, as Django only
+    records the queries with DEBUG.
+    """
+    old_debug, old_queries = settings.DEBUG, connection.queries
+    settings.DEBUG = True
+    connection.queries = []
+    try:
+        result = func(*args, **kwargs)
+        queries = [query['sql'] for query in connection.queries]
+    finally:
+        settings.DEBUG, connection.queries = old_debug, old_queries
+    return result, queries
+
+
+def get_translation_tables():
+    """
+    Return the names of all the translation tables.
+    """
+    tables = []
+    for model in models.get_models():
+        if hasattr(model._meta, 'translation_model'):
+            trans_opts = model._meta.translation_model._meta
+            tables.append(trans_opts.db_table)
+            tables.extend([language_model._meta.db_table for language_model
+                           in trans_opts.language_models.values()])
+    return tables
+
+
+def is_translation_query(sql):
+    """
+    Return True if sql reads directly from a translation table, i.e. it
+    loads translations separately from their objects.
+    """
+    qn = connection.ops.quote_name
+    for table in get_translation_tables():
+        if re.search(r'\bFROM (%s|%s)( |$)' % (re.escape(qn(table)),
+                                               re.escape(table)), sql):
+            return True
+    return False
+
+
+def get_translation_joins(queryset):
+    """
+    Return a tuple of two sorted lists of language IDs: the languages
+    whose translation data is fetched by queryset and the languages of
+    joins used by filters and ordering on translated fields.
+    """
+    query = queryset.query.clone()
+    query.as_sql()
+    if not query.include_translation_data:
+        return [], []
+    trans_table = query.model._meta.translation_model._meta.db_table
+    # the aliases of translation joins end with the language code; try
+    # the longest codes first, e.g. '_zh_cn' before '_cn'
+    suffixes = [(get_translation_table_alias('', language_id), language_id)
+                for language_id in get_language_id_list()]
+    suffixes.sort(lambda a, b: cmp(len(b[0]), len(a[0])))
+    data_languages, lookup_languages = [], []
+    for alias in query.extra_join:
+        for suffix, language_id in suffixes:
+            if alias.endswith(suffix):
+                break
+        else:
+            continue
+        if alias == get_translation_table_alias(trans_table, language_id):
+            data_languages.append(language_id)
+        else:
+            lookup_languages.append(language_id)
+    data_languages.sort()
+    lookup_languages.sort()
+    return data_languages, lookup_languages
+
+
+def _format_queries(queries):
+    return '\n'.join(['  %s' % sql for sql in queries])
+
+
+class MultilingualTestCase(TestCase):
+    """
+    A TestCase with assertions about queries of multilingual models.
+    """
+
+    def assertMaxQueries(self, num, func, *args, **kwargs):
+        """
+        Assert that func(*args, **kwargs) executes at most num
+        queries.  Returns the value returned by func.
+        """
+        result, queries = capture_queries(func, *args, **kwargs)
+        if len(queries) > num:
+            self.fail('%d queries executed, at most %d expected:\n%s'
+                      % (len(queries), num, _format_queries(queries)))
+        return result
+
+    def assertMaxTranslationQueries(self, num, func, *args, **kwargs):
+        """
+        Assert that func(*args, **kwargs) loads translations with
+        separate queries at most num times.  Translations fetched
+        together with their objects are not counted.  Returns the
+        value returned by func.
+        """
+        result, queries = capture_queries(func, *args, **kwargs)
+        queries = [sql for sql in queries if is_translation_query(sql)]
+        if len(queries) > num:
+            self.fail('%d translation queries executed, at most %d '
+                      'expected:\n%s' % (len(queries), num,
+                                         _format_queries(queries)))
+        return result
+
+    def assertTranslationJoins(self, queryset, languages, lookup_languages=()):
+        """
+        Assert that queryset fetches translation data in exactly the
+        given languages and joins translations for lookups in exactly
+        lookup_languages.  Languages can be given as IDs or codes.
+        """
+        expected = []
+        for language_list in (languages, lookup_languages):
+            language_ids = [get_language_id_from_id_or_code(language)
+                            for language in language_list]
+            language_ids.sort()
+            expected.append(language_ids)
+        data_languages, lookup_ids = get_translation_joins(queryset)
+        self.assertEqual(data_languages, expected[0],
+                         'translation data fetched for languages %s, '
+                         'expected %s' % (data_languages, expected[0]))
+        self.assertEqual(lookup_ids, expected[1],
+                         'translation lookup joins for languages %s, '
+                         'expected %s' % (lookup_ids, expected[1]))
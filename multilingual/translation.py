@@ -4,14 +4,21 @@ Support for models' internal Translation class.
 
 ##TODO: this is messy and needs to be cleaned up
 
+import copy
+
+from django.conf import settings
 from django.core.exceptions import ObjectDoesNotExist
 from django.db import models
 from django.db.models import signals
-from django.db.models.base import ModelBase
+from django.db.models.base import ModelBase, model_unpickle
+from django.db.models.options import Options, DEFAULT_NAMES
 from multilingual.languages import *
+from multilingual.cache import translation_changed
 from multilingual.exceptions import TranslationDoesNotExist
-from multilingual.fields import TranslationForeignKey
+from multilingual.fields import TranslationForeignKey, TranslationsJSONField
 from multilingual import manager
+from multilingual import signals as multilingual_signals
+from multilingual.utils import get_translation_model
 from multilingual.admin import install_multilingual_modeladmin_new
 
 # TODO: remove this import.  It is here only because earlier versions
@@ -19,7 +26,10 @@ from multilingual.admin import install_multilingual_modeladmin_new
 # instead of taking it directly from multilingual
 from multilingual.admin import TranslationModelAdmin
 
-from new import instancemethod
+try:
+    from threading import RLock
+except ImportError:
+    from dummy_threading import RLock
 
 def translation_save_translated_fields(instance, **kwargs):
     """
@@ -35,7 +45,48 @@ def translation_save_translated_fields(instance, **kwargs):
         # private, since that's the most reliable way to get the value
         # on older Django (pk property did not exist yet)
         translation.master_id = instance._get_pk_val()
-        translation.save()
+        if instance._meta.denormalized_fields:
+            # the copies were saved with instance, see
+            # translation_denormalize_fields
+            translation._saved_with_master = True
+            try:
+                translation.save()
+            finally:
+                del translation._saved_with_master
+        else:
+            translation.save()
+        multilingual_signals.send(multilingual_signals.translation_saved,
+                                  instance.__class__, instance=instance,
+                                  translation=translation, language_id=l_id)
+
+def translation_denormalize_fields(instance, **kwargs):
+    """
+    Copy the translated field values in the primary language to their
+    denormalized fields before instance is saved (a pre_save signal
+    handler), see Translation.Meta.denormalize.
+    """
+    translation_cache = getattr(instance, '_translation_cache', None)
+    if not translation_cache:
+        return
+    opts = instance._meta
+    if opts.primary_language_id not in translation_cache:
+        return
+    translation = translation_cache[opts.primary_language_id]
+    for fname, field in opts.denormalized_fields.items():
+        setattr(instance, field.attname, getattr(translation, fname))
+
+def translation_update_denormalized_fields(instance, **kwargs):
+    """
+    Update the denormalized fields of the master of instance, a
+    translation saved or deleted on its own (a post_save and
+    post_delete signal handler).
+    """
+    from multilingual.bulk import update_denormalized_fields
+
+    master_model = instance._meta.get_field('master').rel.to
+    if (instance.language_id == master_model._meta.primary_language_id
+        and not getattr(instance, '_saved_with_master', False)):
+        update_denormalized_fields(master_model, [instance.master_id])
 
 def fill_translation_cache(instance):
     """
@@ -63,7 +114,8 @@ def fill_translation_cache(instance):
                 field_data[fname] = getattr(instance,
                                             get_translated_field_alias(fname, language_id))
 
-            translation = instance._meta.translation_model(**field_data)
+            translation = get_translation_model(instance._meta,
+                                                language_id)(**field_data)
             instance._translation_cache[language_id] = translation
 
     # In some situations an (existing in the DB) object is loaded
@@ -73,10 +125,69 @@ def fill_translation_cache(instance):
     # Unfortunately, this is indistinguishable from the situation when
     # an object does not have any translations.  Oh well, we'll have
     # to live with this for the time being.
-    if len(instance._translation_cache.keys()) == 0:
-        for translation in instance.translations.all():
+    #
+    # Objects returned by MultilingualModelQuerySet are marked with
+    # _translation_data_loaded, so the query is not repeated for them.
+    if (len(instance._translation_cache.keys()) == 0
+        and not getattr(instance, '_translation_data_loaded', False)):
+        multilingual_signals.send(
+            multilingual_signals.translation_cache_fallback,
+            instance.__class__, instance=instance)
+        language_models = instance._meta.translation_model._meta.language_models
+        if language_models:
+            translations = []
+            for model in language_models.values():
+                translations.extend(model._default_manager.filter(
+                        master=instance))
+        else:
+            translations = instance.translations.all()
+        for translation in translations:
             instance._translation_cache[translation.language_id] = translation
 
+def prefetch_translations(instances, language_ids=None):
+    """
+    Fill the translation caches of many multilingual objects at once.
+
+    The translations of all the objects of a model are loaded with a
+    single query (or one query per bulk.CHUNK_SIZE objects).  If
+    language_ids is given, only translations in these languages are
+    loaded.
+
+    Objects that already have their translation cache or were loaded
+    with translation data are skipped.
+    """
+    from multilingual.bulk import CHUNK_SIZE
+
+    by_model = {}
+    for instance in instances:
+        if (not hasattr(instance._meta, 'translation_model')
+            or hasattr(instance, '_translation_cache')
+            or getattr(instance, '_translation_data_loaded', False)):
+            continue
+        instance._translation_cache = {}
+        by_model.setdefault(instance._meta.translation_model, {})[
+            instance._get_pk_val()] = instance
+
+    for trans_model, instances_by_pk in by_model.items():
+        master_ids = instances_by_pk.keys()
+        language_models = trans_model._meta.language_models
+        if language_models:
+            # one query per language table
+            querysets = [model._default_manager.all()
+                         for language_id, model in language_models.items()
+                         if language_ids is None or language_id in language_ids]
+        else:
+            querysets = [trans_model._default_manager.all()]
+            if language_ids is not None:
+                querysets[0] = querysets[0].filter(language_id__in=language_ids)
+        for queryset in querysets:
+            for start in range(0, len(master_ids), CHUNK_SIZE):
+                translations = queryset.filter(
+                    master__in=master_ids[start:start + CHUNK_SIZE])
+                for translation in translations:
+                    instance = instances_by_pk[translation.master_id]
+                    instance._translation_cache[translation.language_id] = translation
+
 class TranslatedFieldProxy(property):
     def __init__(self, field_name, alias, field, language_id=None,
                  fallback=False):
@@ -124,6 +235,96 @@ def setter_generator(field_name):
     set_translation_field.short_description = "set " + field_name
     return set_translation_field
 
+def _get_column_language_id(instance, language_id_or_code):
+    language_id = get_language_id_from_id_or_code(language_id_or_code, False)
+    if language_id is None:
+        language_id = getattr(instance, '_default_language', None)
+    if language_id is None:
+        language_id = get_default_language()
+    return language_id
+
+def denormalized_getter_generator(field_name, short_description,
+                                  denormalized_attname, primary_language_id):
+    """
+    Generate get_'field name' method for field field_name with a
+    denormalized copy of the value in the primary language, which is
+    read unless the translation was loaded (and possibly changed).
+    """
+    get_translated_value = getter_generator(field_name, short_description)
+    def get_translation_field(self, language_id_or_code=None, fallback=False):
+        language_id = _get_column_language_id(self, language_id_or_code)
+        if (language_id == primary_language_id
+            and language_id not in getattr(self, '_translation_cache', ())):
+            value = getattr(self, denormalized_attname)
+            if value is not None:
+                return value
+        return get_translated_value(self, language_id, fallback)
+    get_translation_field.short_description = short_description
+    return get_translation_field
+
+def column_getter_generator(field_name, short_description):
+    """
+    Generate get_'field name' method for field field_name stored in
+    columns of the master table.
+    """
+    def get_translation_field(self, language_id_or_code=None, fallback=False):
+        language_id = _get_column_language_id(self, language_id_or_code)
+        value = getattr(self, get_translation_column_name(field_name,
+                                                          language_id))
+        if value is None and fallback:
+            for fb_lang_id in FALLBACK_LANGUAGE_IDS:
+                value = getattr(self, get_translation_column_name(field_name,
+                                                                  fb_lang_id))
+                if value is not None:
+                    break
+        return value
+    get_translation_field.short_description = short_description
+    return get_translation_field
+
+def column_setter_generator(field_name):
+    """
+    Generate set_'field name' method for field field_name stored in
+    columns of the master table.
+    """
+    def set_translation_field(self, value, language_id_or_code=None):
+        language_id = _get_column_language_id(self, language_id_or_code)
+        setattr(self, get_translation_column_name(field_name, language_id),
+                value)
+    set_translation_field.short_description = "set " + field_name
+    return set_translation_field
+
+def document_getter_generator(field_name, short_description):
+    """
+    Generate get_'field name' method for field field_name stored in the
+    translation document of the master model.
+    """
+    def get_translation_field(self, language_id_or_code=None, fallback=False):
+        document = getattr(self, self._meta.translation_document_field.attname)
+        language_id = _get_column_language_id(self, language_id_or_code)
+        translation = document.get(get_language_code(language_id))
+        if translation is None and fallback:
+            for fb_lang_id in FALLBACK_LANGUAGE_IDS:
+                translation = document.get(get_language_code(fb_lang_id))
+                if translation is not None:
+                    break
+        if translation is None:
+            return None
+        return translation.get(field_name)
+    get_translation_field.short_description = short_description
+    return get_translation_field
+
+def document_setter_generator(field_name):
+    """
+    Generate set_'field name' method for field field_name stored in the
+    translation document of the master model.
+    """
+    def set_translation_field(self, value, language_id_or_code=None):
+        document = getattr(self, self._meta.translation_document_field.attname)
+        language_id = _get_column_language_id(self, language_id_or_code)
+        document.setdefault(get_language_code(language_id), {})[field_name] = value
+    set_translation_field.short_description = "set " + field_name
+    return set_translation_field
+
 def get_translation(self, language_id_or_code,
                     create_if_necessary=False,
                     fallback=False):
@@ -153,8 +354,8 @@ def get_translation(self, language_id_or_code,
 
     if create_if_necessary:
         # case 1
-        new_translation = self._meta.translation_model(master=self,
-                                                       language_id=language_id)
+        new_translation = get_translation_model(self._meta, language_id)(
+            master=self, language_id=language_id)
         self._translation_cache[language_id] = new_translation
         return new_translation
     elif fallback:
@@ -162,11 +363,112 @@ def get_translation(self, language_id_or_code,
         for fb_lang_id in FALLBACK_LANGUAGE_IDS:
             trans = self._translation_cache.get(fb_lang_id, None)
             if trans:
+                multilingual_signals.send(
+                    multilingual_signals.translation_fallback_used,
+                    self.__class__, instance=self, language_id=language_id,
+                    fallback_language_id=fb_lang_id)
                 return trans
-        raise TranslationDoesNotExist(language_id)
-    else:
-        # case 3
-        raise TranslationDoesNotExist(language_id)
+
+    # case 3
+    multilingual_signals.send(multilingual_signals.translation_missing,
+                              self.__class__, instance=self,
+                              language_id=language_id)
+    raise TranslationDoesNotExist(language_id)
+
+_language_attrs_lock = RLock()
+
+def defer_language_attrs(main_cls, fields, language_proxies=True):
+    """
+    Arrange for the 'field name'_'language code' and 'field
+    name'_'language code'_any properties of main_cls to be created on
+    first use of the class.  With language_proxies=False only the _any
+    properties are created, as with the column storage the 'field
+    name'_'language code' attributes are model fields.
+
+    With many languages creating them is a large part of the startup
+    time and memory used by multilingual models, while most processes
+    use only some of the models.  They are created by
+    create_language_attrs, called when:
+
+     * main_cls (or its subclass) is instantiated, directly or by
+       unpickling, since instance attribute lookups cannot be
+       intercepted without slowing them all down,
+     * a missing attribute is looked up on main_cls itself (e.g. by the
+       admin).
+
+    See MultilingualModelBase and multilingual_model_reduce.
+    """
+    main_cls._deferred_language_attrs = (fields, language_proxies)
+    main_cls.__reduce__ = multilingual_model_reduce
+
+def create_language_attrs(model):
+    """
+    Create the language attributes of model and its base classes, if
+    they were deferred.  Returns True if anything was created.
+    """
+    deferred_classes = [
+        klass for klass in model.__mro__
+        if klass.__dict__.get('_deferred_language_attrs') is not None]
+    if not deferred_classes:
+        return False
+    _language_attrs_lock.acquire()
+    try:
+        for klass in deferred_classes:
+            deferred = klass.__dict__.get('_deferred_language_attrs')
+            if deferred is None:
+                # created by another thread in the meantime
+                continue
+            fields, language_proxies = deferred
+            for fname, field in fields:
+                for language_id in get_language_id_list():
+                    fname_lng = get_translation_column_name(fname, language_id)
+                    if language_proxies:
+                        setattr(klass, fname_lng,
+                                TranslatedFieldProxy(fname, fname_lng, field,
+                                                     language_id))
+                    # add the 'fname'_'language_code'_any fallback proxy
+                    setattr(klass, fname_lng + FALLBACK_FIELD_SUFFIX,
+                            TranslatedFieldProxy(fname, fname_lng, field,
+                                                 language_id, fallback=True))
+            klass._deferred_language_attrs = None
+    finally:
+        _language_attrs_lock.release()
+    return True
+
+class MultilingualModelBase(ModelBase):
+    """
+    The metaclass of models with translations.  Creates the deferred
+    language attributes of a model when it is instantiated or when a
+    missing attribute is looked up on it.
+    """
+
+    def __call__(cls, *args, **kwargs):
+        if cls._deferred_language_attrs is not None:
+            create_language_attrs(cls)
+        return super(MultilingualModelBase, cls).__call__(*args, **kwargs)
+
+    def __getattr__(cls, name):
+        if not name.startswith('_') and create_language_attrs(cls):
+            return getattr(cls, name)
+        raise AttributeError("type object %r has no attribute %r"
+                             % (cls.__name__, name))
+
+def multilingual_model_unpickle(model, attrs, factory):
+    """
+    Used to unpickle multilingual models, see multilingual_model_reduce.
+    """
+    create_language_attrs(model)
+    return model_unpickle(model, attrs, factory)
+multilingual_model_unpickle.__safe_for_unpickle__ = True
+
+def multilingual_model_reduce(self):
+    """
+    Model.__reduce__ for multilingual models.  Unpickling does not call
+    the model class, so the deferred language attributes are created by
+    multilingual_model_unpickle instead.
+    """
+    reduced = models.Model.__reduce__(self)
+    return (multilingual_model_unpickle,) + reduced[1:]
 
 class Translation:
     """
@@ -178,6 +480,16 @@ class Translation:
         Handle the inner 'Translation' class.
         """
 
+        storage = cls.get_storage()
+        if storage == 'columns':
+            cls.create_translation_columns(main_cls)
+            return
+        if storage == 'json':
+            cls.create_translation_document(main_cls)
+            return
+
+        cls.create_denormalized_fields(main_cls)
+
         # delay the creation of the *Translation until the master model is
         # fully created
         signals.class_prepared.connect(cls.finish_multilingual_class,
@@ -190,24 +502,191 @@ class Translation:
 
     contribute_to_class = classmethod(contribute_to_class)
 
+    def create_denormalized_fields(cls, main_cls):
+        """
+        Add a nullable, non-editable 'field name'_primary field to
+        main_cls for every field listed in Meta.denormalize, holding a
+        copy of its value in Meta.primary_language (by default
+        settings.DEFAULT_LANGUAGE).
+
+        They are recorded in main_cls._meta.denormalized_fields, which
+        maps the translated field names to the new fields, and
+        main_cls._meta.primary_language_id.
+        """
+        meta = cls.__dict__.get('Meta')
+        names = getattr(meta, 'denormalize', ())
+        primary_language = getattr(meta, 'primary_language', None)
+        if primary_language is None:
+            primary_language = settings.DEFAULT_LANGUAGE
+        main_cls._meta.primary_language_id = get_language_id_from_id_or_code(
+            primary_language)
+        main_cls._meta.denormalized_fields = {}
+        for fname in names:
+            field = cls.__dict__.get(fname)
+            if not isinstance(field, models.fields.Field):
+                raise ValueError("%s.Translation.Meta.denormalize: %r is not "
+                                 "a translated field"
+                                 % (main_cls.__name__, fname))
+            copy_field = copy.deepcopy(field)
+            copy_field.null = True
+            copy_field.blank = True
+            copy_field.editable = False
+            try:
+                copy_field.unique = False
+            except AttributeError:
+                # see get_unique_fields
+                copy_field._unique = False
+            if field.db_column:
+                copy_field.db_column = field.db_column + '_primary'
+            main_cls.add_to_class(fname + '_primary', copy_field)
+            main_cls._meta.denormalized_fields[fname] = copy_field
+
+        if names:
+            signals.pre_save.connect(translation_denormalize_fields,
+                                     sender=main_cls)
+    create_denormalized_fields = classmethod(create_denormalized_fields)
+
+    def get_storage(cls):
+        """
+        Return the storage of translations set in Meta.storage: 'table'
+        (the default) for a separate translation model, 'columns' for
+        columns of the master table or 'json' for a JSON document in
+        one column of the master table.
+        """
+        storage = getattr(cls.__dict__.get('Meta'), 'storage', 'table')
+        if storage not in ('table', 'columns', 'json'):
+            raise ValueError("Unknown translation storage %r, use 'table', "
+                             "'columns' or 'json'." % (storage,))
+        return storage
+    get_storage = classmethod(get_storage)
+
+    def create_translation_columns(cls, main_cls):
+        """
+        Add a nullable 'field name'_'language code' field to main_cls
+        for every translated field and language, with the same
+        get_'field name', set_'field name', 'field name' and 'field
+        name'_any attributes as with the translation table.
+
+        The translated fields are recorded in
+        main_cls._meta.translation_columns, which maps their names to
+        the fields defined in the Translation class.
+        """
+        translation_columns = {}
+        deferred_fields = []
+
+        for fname, field in cls.__dict__.items():
+            if isinstance(field, models.fields.Field):
+                translation_columns[fname] = field
+                deferred_fields.append((fname, field))
+
+                for language_id in get_language_id_list():
+                    column = copy.deepcopy(field)
+                    # NULL means that there is no translation
+                    column.null = True
+                    column.blank = True
+                    if field.db_column:
+                        column.db_column = get_translation_column_name(
+                            field.db_column, language_id)
+                    main_cls.add_to_class(
+                        get_translation_column_name(fname, language_id), column)
+
+                getter = column_getter_generator(fname, getattr(field, 'verbose_name', fname))
+                setattr(main_cls, 'get_' + fname, getter)
+
+                setter = column_setter_generator(fname)
+                setattr(main_cls, 'set_' + fname, setter)
+
+                setattr(main_cls, fname,
+                        TranslatedFieldProxy(fname, fname, field))
+                setattr(main_cls, fname + FALLBACK_FIELD_SUFFIX,
+                        TranslatedFieldProxy(fname, fname, field, fallback=True))
+
+        main_cls._meta.translation_columns = translation_columns
+        defer_language_attrs(main_cls, deferred_fields, language_proxies=False)
+
+        # the translations change with the master objects
+        signals.post_save.connect(translation_changed, sender=main_cls)
+        signals.post_delete.connect(translation_changed, sender=main_cls)
+    create_translation_columns = classmethod(create_translation_columns)
+
+    def create_translation_document(cls, main_cls):
+        """
+        Add a 'translations' TranslationsJSONField to main_cls holding
+        all the translations of an object, with the same get_'field
+        name', set_'field name' and proxy attributes as with the
+        translation table.
+
+        main_cls._meta.translation_document maps the translated field
+        names, with and without language suffixes, to (field,
+        language_id) tuples like translated_fields of translation
+        models; main_cls._meta.translation_document_field is the JSON
+        field.
+        """
+        translation_document = {}
+        deferred_fields = []
+
+        document_field = TranslationsJSONField()
+        main_cls.add_to_class('translations', document_field)
+
+        for fname, field in cls.__dict__.items():
+            if isinstance(field, models.fields.Field):
+                field.set_attributes_from_name(fname)
+                translation_document[fname] = (field, None)
+                deferred_fields.append((fname, field))
+
+                getter = document_getter_generator(fname, field.verbose_name)
+                setattr(main_cls, 'get_' + fname, getter)
+
+                setter = document_setter_generator(fname)
+                setattr(main_cls, 'set_' + fname, setter)
+
+                setattr(main_cls, fname,
+                        TranslatedFieldProxy(fname, fname, field))
+                setattr(main_cls, fname + FALLBACK_FIELD_SUFFIX,
+                        TranslatedFieldProxy(fname, fname, field, fallback=True))
+
+                for language_id in get_language_id_list():
+                    fname_lng = get_translation_column_name(fname, language_id)
+                    translation_document[fname_lng] = (field, language_id)
+
+        main_cls._meta.translation_document = translation_document
+        main_cls._meta.translation_document_field = document_field
+        defer_language_attrs(main_cls, deferred_fields)
+
+        # the translations change with the master objects
+        signals.post_save.connect(translation_changed, sender=main_cls)
+        signals.post_delete.connect(translation_changed, sender=main_cls)
+    create_translation_document = classmethod(create_translation_document)
+
     def create_translation_attrs(cls, main_cls):
         """
         Creates get_'field name'(language_id) and set_'field
         name'(language_id) methods for all the translation fields.
-        Adds the 'field name' properties too.
+        Adds the 'field name' and 'field name'_any properties too.
+
+        The properties for specific languages are only created when
+        main_cls is first used, see defer_language_attrs.
 
         Returns the translated_fields hash used in field lookups, see
         multilingual.query.  It maps field names to (field,
         language_id) tuples.
         """
         translated_fields = {}
+        deferred_fields = []
 
         for fname, field in cls.__dict__.items():
             if isinstance(field, models.fields.Field):
                 translated_fields[fname] = (field, None)
+                deferred_fields.append((fname, field))
 
                 # add get_'fname' and set_'fname' methods to main_cls
-                getter = getter_generator(fname, getattr(field, 'verbose_name', fname))
+                if fname in main_cls._meta.denormalized_fields:
+                    getter = denormalized_getter_generator(
+                        fname, getattr(field, 'verbose_name', fname),
+                        main_cls._meta.denormalized_fields[fname].attname,
+                        main_cls._meta.primary_language_id)
+                else:
+                    getter = getter_generator(fname, getattr(field, 'verbose_name', fname))
                 setattr(main_cls, 'get_' + fname, getter)
 
                 setter = setter_generator(fname)
@@ -222,19 +701,12 @@ class Translation:
                 setattr(main_cls, fname + FALLBACK_FIELD_SUFFIX,
                         TranslatedFieldProxy(fname, fname, field, fallback=True))
 
-                # create the 'fname'_'language_code' proxy properties
+                # register the 'fname'_'language_code' names for lookups
                 for language_id in get_language_id_list():
-                    language_code = get_language_code(language_id)
-                    fname_lng = fname + '_' + language_code.replace('-', '_')
+                    fname_lng = get_translation_column_name(fname, language_id)
                     translated_fields[fname_lng] = (field, language_id)
-                    setattr(main_cls, fname_lng,
-                            TranslatedFieldProxy(fname, fname_lng, field,
-                                                 language_id))
-                    # add the 'fname'_'language_code'_any fallback proxy
-                    setattr(main_cls, fname_lng + FALLBACK_FIELD_SUFFIX,
-                            TranslatedFieldProxy(fname, fname_lng, field,
-                                                 language_id, fallback=True))
 
+        defer_language_attrs(main_cls, deferred_fields)
         return translated_fields
     create_translation_attrs = classmethod(create_translation_attrs)
 
@@ -282,6 +754,25 @@ class Translation:
         except AttributeError:
             meta = TransMeta
 
+        # Django does not know this option, so it is kept on the
+        # translation model's _meta instead, see the
+        # translation_indexes command
+        indexed_fields = tuple(meta.__dict__.get('indexed_fields', ()))
+        if 'indexed_fields' in meta.__dict__:
+            del meta.indexed_fields
+        for name in ('storage', 'denormalize', 'primary_language'):
+            if name in meta.__dict__:
+                delattr(meta, name)
+        partition_by_language = meta.__dict__.get('partition_by_language',
+                                                  False)
+        if 'partition_by_language' in meta.__dict__:
+            del meta.partition_by_language
+            if partition_by_language and 'managed' in DEFAULT_NAMES:
+                # the translation model only describes the per-language
+                # tables, so its own table is not needed (Django 1.1 and
+                # later)
+                meta.managed = False
+
         meta.ordering = ('language_id',)
         meta.unique_together = tuple(unique)
         meta.app_label = main_cls._meta.app_label
@@ -298,25 +789,32 @@ class Translation:
 
         trans_attrs['master'] = TranslationForeignKey(main_cls, blank=False, null=False,
                                                       related_name='translations',)
+        if 'objects' not in trans_attrs:
+            trans_attrs['objects'] = manager.TranslationManager()
         trans_attrs['__str__'] = lambda self: ("%s object, language_code=%s"
                                                % (translation_model_name,
                                                   get_language_code(self.language_id)))
 
         trans_model = ModelBase(translation_model_name, (models.Model,), trans_attrs)
         trans_model._meta.translated_fields = cls.create_translation_attrs(main_cls)
+        trans_model._meta.indexed_fields = indexed_fields
+        trans_model._meta.language_models = {}
+        if partition_by_language:
+            cls.create_language_models(main_cls, trans_model, unique)
+        main_cls._meta.translation_model = trans_model
 
-        _old_init_name_map = main_cls._meta.__class__.init_name_map
-        def init_name_map(self):
-            cache = _old_init_name_map(self)
-            for name, field_and_lang_id in trans_model._meta.translated_fields.items():
-                #import sys; sys.stderr.write('TM %r\n' % trans_model)
-                cache[name] = (field_and_lang_id[0], trans_model, True, False)
-            return cache
-        main_cls._meta.init_name_map = instancemethod(init_name_map,
-                                                      main_cls._meta,
-                                                      main_cls._meta.__class__)
+        # keep the version stamp used in cache keys up to date
+        signals.post_save.connect(translation_changed, sender=trans_model)
+        signals.post_delete.connect(translation_changed, sender=trans_model)
+
+        if main_cls._meta.denormalized_fields:
+            for model in (trans_model._meta.language_models.values()
+                          or [trans_model]):
+                signals.post_save.connect(
+                    translation_update_denormalized_fields, sender=model)
+                signals.post_delete.connect(
+                    translation_update_denormalized_fields, sender=model)
 
-        main_cls._meta.translation_model = trans_model
         main_cls.Translation = trans_model
         main_cls.get_translation = get_translation
         main_cls.fill_translation_cache = fill_translation_cache
@@ -329,6 +827,51 @@ class Translation:
 
     finish_multilingual_class = classmethod(finish_multilingual_class)
 
+    def create_language_models(cls, main_cls, trans_model, unique):
+        """
+        Create a model for every language, with the fields of
+        trans_model and its own table, e.g. 'article_translation_pl'.
+        They are stored in trans_model._meta.language_models, a
+        dictionary mapping language IDs to models; see
+        multilingual.utils.get_translation_model.
+
+        The language_id column is kept, so that the translations look
+        the same with or without partitioning, but queries do not need
+        to use it.
+        """
+        opts = trans_model._meta
+        for language_id in get_language_id_list():
+            attrs = {'__module__': trans_model.__module__}
+            for fname, field in cls.__dict__.items():
+                if isinstance(field, models.fields.Field):
+                    attrs[fname] = copy.deepcopy(field)
+
+            class Meta:
+                app_label = opts.app_label
+                db_table = get_translation_column_name(opts.db_table,
+                                                       language_id)
+                unique_together = tuple(unique)
+            attrs['Meta'] = Meta
+            attrs['language_id'] = models.IntegerField(
+                blank=False, null=False, choices=get_language_choices(),
+                default=language_id, editable=False)
+            attrs['master'] = TranslationForeignKey(
+                main_cls, blank=False, null=False,
+                related_name=get_translation_column_name('translations',
+                                                         language_id))
+            attrs['__str__'] = trans_model.__dict__['__str__']
+
+            language_model = ModelBase(
+                get_translation_column_name(opts.object_name, language_id),
+                (models.Model,), attrs)
+            language_model._meta.partition_of = trans_model
+            opts.language_models[language_id] = language_model
+
+            signals.post_save.connect(translation_changed, sender=language_model)
+            signals.post_delete.connect(translation_changed,
+                                        sender=language_model)
+    create_language_models = classmethod(create_language_models)
+
 def install_translation_library():
     # modify ModelBase.__new__ so that it understands how to handle the
     # 'Translation' inner class
@@ -361,10 +904,39 @@ def install_translation_library():
             if not 'objects' in attrs:
                 attrs['objects'] = manager.Manager()
 
+            # create the language attributes on first use of the model
+            if not issubclass(cls, MultilingualModelBase):
+                cls = MultilingualModelBase
+
         return _old_new(cls, name, bases, attrs)
     ModelBase.__new__ = staticmethod(multilingual_modelbase_new)
     ModelBase._multilingual_installed = True
 
+    # add the translated fields to the field name map used in lookups
+    _old_init_name_map = Options.init_name_map
+
+    def multilingual_init_name_map(self):
+        cache = _old_init_name_map(self)
+        translation_model = getattr(self, 'translation_model', None)
+        if translation_model is not None:
+            for name, field_and_lang_id in translation_model._meta.translated_fields.items():
+                cache[name] = (field_and_lang_id[0], translation_model, True, False)
+        return cache
+    Options.init_name_map = multilingual_init_name_map
+
+    # translations partitioned by language are related to their master
+    # objects through the per-language models; the translation model
+    # has no table, so Django must not follow its relation, e.g. when
+    # deleting the related objects
+    _old_fill_related_objects_cache = Options._fill_related_objects_cache
+
+    def multilingual_fill_related_objects_cache(self):
+        _old_fill_related_objects_cache(self)
+        for related in self._related_objects_cache.keys():
+            if getattr(related.model._meta, 'language_models', None):
+                del self._related_objects_cache[related]
+    Options._fill_related_objects_cache = multilingual_fill_related_objects_cache
+
     install_multilingual_modeladmin_new()
 
 # install the library
@@ -1,5 +1,22 @@
+from multilingual.languages import get_language_id_from_id_or_code
+
+
 def is_multilingual_model(model):
     """
     Return True if `model` is a multilingual model.
     """
     return hasattr(model._meta, 'translation_model')
+
+
+def get_translation_model(opts, language_id_or_code=None):
+    """
+    Return the model storing the translations in the given language of
+    the multilingual model described by opts: its translation model or,
+    if the translation table is partitioned by language, the model of
+    the language's table.
+    """
+    trans_model = opts.translation_model
+    language_models = trans_model._meta.language_models
+    if not language_models:
+        return trans_model
+    return language_models[get_language_id_from_id_or_code(language_id_or_code)]
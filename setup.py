@@ -6,7 +6,8 @@ setup(
     description = 'Multilingual extension for Django',
     author = 'Marcin Kaszynski',
     url = 'http://code.google.com/p/django-multilingual/',
-    packages = find_packages(exclude=["testproject", "testproject.*"]),
+    packages = find_packages(exclude=["testproject", "testproject.*",
+                                       "benchmarks", "benchmarks.*"]),
     zip_safe=False,
     package_data = {
         '': ['templates/*/*.html'],
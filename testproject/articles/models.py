@@ -337,3 +337,6 @@ class Article(models.Model):
                                 blank=True, null=False, max_length=250)
         contents = models.TextField(verbose_name=_("The contents"),
                                     blank=True, null=False)
+
+        class Meta:
+            indexed_fields = ('title',)
@@ -0,0 +1,21 @@
+from django.core.management import call_command
+from django.test import TestCase
+from multilingual.bulk import copy_translations
+
+from testproject.articles.models import Category
+
+
+class BackfillLanguageTestCase(TestCase):
+    def test_backfill(self):
+        first = Category.objects.create(name_en='cat', name_pl='kat')
+        second = Category.objects.create(name_en='dog',
+                                         description_en='A dog')
+        call_command('backfill_language', 'articles.Category', source='en',
+                     target='pl', chunk_size=1, verbosity=0)
+        first = Category.objects.get(id=first.id)
+        second = Category.objects.get(id=second.id)
+        self.assertEqual(first.name_pl, 'kat')
+        self.assertEqual((second.name_pl, second.description_pl),
+                         ('dog', 'A dog'))
+        # only the missing translations are copied
+        self.assertEqual(copy_translations(Category, 'en', 'pl'), 0)
@@ -0,0 +1,21 @@
+"""
+Test models for translations stored in columns of the master table.
+"""
+
+from django.db import models
+import multilingual
+
+class Product(models.Model):
+    code = models.CharField(max_length=20)
+
+    class Translation(multilingual.Translation):
+        name = models.CharField(max_length=100)
+        description = models.TextField(blank=True)
+
+        class Meta:
+            storage = 'columns'
+
+    objects = multilingual.Manager()
+
+    class Meta:
+        ordering = ('code',)
@@ -0,0 +1,101 @@
+from django.core.management import call_command
+from django.test import TestCase
+import multilingual
+
+from multilingual.management.commands.translation_storage import (
+    get_to_columns_sql, get_to_table_sql)
+from multilingual.testcases import MultilingualTestCase
+
+from testproject.column_storage.models import Product
+from testproject.fallback.models import Article
+
+
+class ColumnStorageTestCase(MultilingualTestCase):
+    def setUp(self):
+        multilingual.set_default_language('en')
+        Product.objects.create(code='a', name_en='Apple', name_pl='Jablko')
+        Product.objects.create(code='b', name_pl='Banan',
+                               name_zh_cn='Xiangjiao')
+        Product.objects.create(code='c')
+
+    def test_fields(self):
+        names = [f.name for f in Product._meta.fields]
+        for name in ('name_en', 'name_pl', 'name_zh_cn', 'description_en'):
+            self.assert_(name in names)
+        self.assert_(Product._meta.get_field('name_en').null)
+        self.failIf(hasattr(Product._meta, 'translation_model'))
+
+    def test_get_and_set(self):
+        p = Product.objects.get(code='a')
+        self.assertEqual(p.name, 'Apple')
+        self.assertEqual(p.get_name('pl'), 'Jablko')
+        self.assertEqual(p.name_zh_cn, None)
+        p.name = 'Green apple'
+        p.set_name('Jabluszko', 'pl')
+        p.save()
+        p = Product.objects.get(code='a')
+        self.assertEqual(p.name_en, 'Green apple')
+        self.assertEqual(p.name_pl, 'Jabluszko')
+
+        multilingual.set_default_language('pl')
+        self.assertEqual(p.name, 'Jabluszko')
+        p = Product.objects.all().for_language('en').get(code='a')
+        self.assertEqual(p.name, 'Green apple')
+
+    def test_fallback(self):
+        p = Product.objects.get(code='b')
+        self.assertEqual(p.name, None)
+        self.assertEqual(p.name_any, 'Xiangjiao')
+        self.assertEqual(p.name_en_any, 'Xiangjiao')
+        self.assertEqual(Product.objects.get(code='c').name_any, None)
+
+    def test_no_extra_queries(self):
+        self.assertMaxQueries(1, lambda: [p.name_any
+                                          for p in Product.objects.all()])
+
+    def test_filter_and_order(self):
+        codes = lambda qs: [p.code for p in qs]
+        self.assertEqual(codes(Product.objects.filter(name='Apple')), ['a'])
+        self.assertEqual(codes(Product.objects.filter(name_pl='Banan')), ['b'])
+        self.assertEqual(
+            codes(Product.objects.filter(name_pl__isnull=False)
+                  .order_by('-name_pl')),
+            ['a', 'b'])
+        self.assertEqual(
+            codes(Product.objects.filter(name_pl__isnull=False)
+                  .for_language('pl').order_by('name')),
+            ['b', 'a'])
+        self.assertEqual(
+            codes(Product.objects.filter(name__startswith='X')), [])
+        self.assertEqual(
+            codes(Product.objects.all().any_language()
+                  .filter(name__startswith='X')),
+            ['b'])
+
+    def test_translation_exists(self):
+        codes = lambda qs: [p.code for p in qs]
+        self.assertEqual(codes(Product.objects.all().has_translation('en')),
+                         ['a'])
+        self.assertEqual(codes(Product.objects.all().has_translation('pl')),
+                         ['a', 'b'])
+        self.assertEqual(
+            codes(Product.objects.all().missing_translation('zh-cn')),
+            ['a', 'c'])
+
+
+class TranslationStorageCommandTestCase(TestCase):
+    def test_statements(self):
+        sql = ' '.join([s for s, params in get_to_columns_sql(Product)])
+        self.assert_('column_storage_product_translation' in sql)
+        self.assert_('name_zh_cn' in sql)
+
+        sql = ' '.join([s for s, params in get_to_table_sql(Article)])
+        self.assert_('INSERT INTO' in sql)
+        self.assert_('title_pl' in sql)
+
+    def test_dry_run(self):
+        # nothing is changed
+        Article.objects.create(title_en='title', content_en='content')
+        call_command('translation_storage', 'fallback.Article',
+                     to='columns', dry_run=True)
+        self.assertEqual(Article.objects.get().title_en, 'title')
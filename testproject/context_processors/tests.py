@@ -0,0 +1,19 @@
+from django.http import HttpRequest
+from django.template import Context, Template
+from django.test import TestCase
+import multilingual
+from multilingual.context_processors import multilingual as processor
+
+
+class ContextProcessorTestCase(TestCase):
+    def test_multilingual(self):
+        context = processor(HttpRequest())
+        self.assertEqual(context['LANGUAGE_CODES'], ['en', 'pl', 'zh-cn'])
+
+        # the default language code is evaluated on first use
+        multilingual.set_default_language('en')
+        context = processor(HttpRequest())
+        multilingual.set_default_language('pl')
+        t = Template('{{ DEFAULT_LANGUAGE_CODE }}'
+                     '{% ifequal DEFAULT_LANGUAGE_CODE "pl" %} ok{% endifequal %}')
+        self.assertEqual(t.render(Context(context)), 'pl ok')
@@ -0,0 +1,20 @@
+"""
+Test models for denormalized translated fields.
+"""
+
+from django.db import models
+import multilingual
+
+class Tag(models.Model):
+    code = models.CharField(max_length=20)
+
+    class Translation(multilingual.Translation):
+        name = models.CharField(max_length=100)
+        description = models.TextField(blank=True)
+
+        class Meta:
+            denormalize = ('name',)
+            primary_language = 'en'
+
+    class Meta:
+        ordering = ('code',)
@@ -0,0 +1,73 @@
+from django.core.management import call_command
+from django.db import connection
+from django.db.models.fields import FieldDoesNotExist
+import multilingual
+
+from multilingual.bulk import save_translations
+from multilingual.testcases import MultilingualTestCase, get_translation_joins
+
+from testproject.denormalized.models import Tag
+
+
+class DenormalizedFieldsTestCase(MultilingualTestCase):
+    def setUp(self):
+        multilingual.set_default_language('en')
+        Tag.objects.create(code='a', name_en='python', name_pl='pyton')
+        Tag.objects.create(code='b', name_pl='wieloryb')
+
+    def names(self):
+        return list(Tag.objects.values_list('name_primary', flat=True))
+
+    def test_fields(self):
+        field = Tag._meta.get_field('name_primary')
+        self.assert_(field.null)
+        self.failIf(field.editable)
+        self.assertEqual(Tag._meta.primary_language_id, 1)
+        self.assertRaises(FieldDoesNotExist, Tag._meta.get_field,
+                          'description_primary')
+
+    def test_save(self):
+        self.assertEqual(self.names(), ['python', None])
+        tag = Tag.objects.get(code='b')
+        tag.name_en = 'whale'
+        tag.name_pl = 'wieloryb!'
+        tag.save()
+        self.assertEqual(self.names(), ['python', 'whale'])
+
+    def test_reads(self):
+        tags = list(Tag.objects.all().with_languages())
+        self.assertMaxQueries(0, lambda: tags[0].name)
+        self.assertEqual(tags[0].name, 'python')
+        tag = Tag.objects.get(code='a')
+        tag.name = 'python 3'
+        self.assertEqual(tag.name, 'python 3')
+
+    def test_queries(self):
+        qs = Tag.objects.filter(name='python').order_by('name')
+        self.assertEqual(get_translation_joins(qs), ([1, 2, 3], []))
+        self.assertEqual([t.code for t in qs], ['a'])
+        qs = Tag.objects.filter(name_en__startswith='py')
+        self.assertEqual(get_translation_joins(qs), ([1, 2, 3], []))
+
+        multilingual.set_default_language('pl')
+        qs = Tag.objects.filter(name='pyton')
+        self.assertEqual(get_translation_joins(qs), ([1, 2, 3], [2]))
+        self.assertEqual([t.code for t in qs], ['a'])
+
+    def test_translation_changes(self):
+        translation = Tag.Translation.objects.get(language_id=1)
+        translation.name = 'snake'
+        translation.save()
+        self.assertEqual(self.names(), ['snake', None])
+        translation.delete()
+        self.assertEqual(self.names(), [None, None])
+
+        tag = Tag.objects.get(code='b')
+        save_translations(Tag, 'en', {tag.id: {'name': 'whale'}})
+        self.assertEqual(self.names(), [None, 'whale'])
+
+    def test_command(self):
+        connection.cursor().execute(
+            'UPDATE denormalized_tag SET name_primary = NULL')
+        call_command('translation_denormalize', 'denormalized', verbosity=0)
+        self.assertEqual(self.names(), ['python', None])
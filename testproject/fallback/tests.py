@@ -1,5 +1,13 @@
+from django.db import connection
 from django.test import TestCase
 import multilingual
+from multilingual.languages import get_translation_table_alias
+
+try:
+    from django.db.models import Count, Max
+except ImportError:
+    # aggregation is available in Django 1.1 and later
+    Count = Max = None
 
 from testproject.fallback.models import Article
 from testproject.fallback.models import Comment
@@ -53,3 +61,123 @@ class FallbackTestCase(TestCase):
         self.assertEqual(a.title_pl_any, 'pl title 2')
         self.assertEqual(a.content_pl_any, '')
 
+
+    def test_with_languages(self):
+        Article.objects.all().delete()
+        Article.objects.create(title_en = 'en title',
+                               title_pl = 'pl title',
+                               title_zh_cn = 'zh-cn title')
+        multilingual.languages.set_default_language('en')
+
+        a = Article.objects.all().with_languages('pl', 'zh-cn').get()
+        self.assertEqual(a.title_pl, 'pl title')
+        self.assertEqual(a.title_zh_cn, 'zh-cn title')
+        # english was not fetched, so it falls back to the first
+        # fetched fallback language
+        self.assertEqual(a.title_en, None)
+        self.assertEqual(a.title_en_any, 'zh-cn title')
+
+    def test_any_language(self):
+        Article.objects.all().delete()
+        Article.objects.create(title_en = 'en title',
+                               title_pl = 'pl title')
+        multilingual.languages.set_default_language('en')
+
+        self.assertEqual(Article.objects.filter(title='pl title').count(), 0)
+        qs = Article.objects.all().any_language()
+        self.assertEqual(qs.filter(title='pl title').count(), 1)
+        self.assertEqual(qs.filter(title__contains='title').count(), 1)
+        self.assertEqual(qs.exclude(title='pl title').count(), 0)
+        # language-suffixed fields are not affected
+        self.assertEqual(qs.filter(title_en='pl title').count(), 0)
+
+    def test_has_translation(self):
+        Article.objects.all().delete()
+        Article.objects.create(title_en = 'en title 1',
+                               title_pl = 'pl title 1')
+        Article.objects.create(title_en = 'en title 2')
+        Article.objects.create(title_zh_cn = 'zh-cn title 3')
+        multilingual.languages.set_default_language('en')
+
+        self.assertEqual(Article.objects.all().has_translation('pl').count(), 1)
+        self.assertEqual(Article.objects.all().missing_translation('pl').count(), 2)
+        self.assertEqual(Article.objects.all().missing_translation(1).count(), 1)
+        # composes with filters on translated fields and other
+        # translation filters
+        missing = Article.objects.filter(title__startswith='en').missing_translation('pl')
+        self.assertEqual([a.title for a in missing], ['en title 2'])
+        self.assertEqual(missing.count(), 1)
+        self.assertEqual(Article.objects.all().missing_translation('pl')
+                         .missing_translation('en').get().title_zh_cn,
+                         'zh-cn title 3')
+
+    def test_count(self):
+        Article.objects.all().delete()
+        Article.objects.create(title_en = 'en title 1',
+                               title_pl = 'pl title 1')
+        Article.objects.create(title_en = 'en title 2')
+        multilingual.languages.set_default_language('en')
+
+        self.assertEqual(Article.objects.count(), 2)
+        self.assertEqual(Article.objects.filter(title_pl='pl title 1').count(), 1)
+        self.assertEqual(Article.objects.filter(title__endswith='2')[:5].count(), 1)
+        # custom SQL may refer to the translation data
+        alias = get_translation_table_alias(
+            Article._meta.translation_model._meta.db_table, 2)
+        qs = Article.objects.extra(where=['%s.title IS NOT NULL'
+                                          % connection.ops.quote_name(alias)])
+        self.assertEqual(qs.count(), 1)
+
+
+class PrefetchTranslationsTestCase(TestCase):
+    def test_prefetch(self):
+        from django.db.models.query import QuerySet
+        from django.template import Template, Context
+
+        Article.objects.all().delete()
+        Article.objects.create(title_en = 'en title 1',
+                               title_pl = 'pl title 1')
+        Article.objects.create(title_en = 'en title 2')
+        multilingual.languages.set_default_language('en')
+
+        # a plain QuerySet does not fetch the translations
+        articles = list(QuerySet(Article).order_by('id'))
+        multilingual.translation.prefetch_translations(articles, [1])
+        self.assertEqual([a._translation_cache.keys() for a in articles],
+                         [[1], [1]])
+        self.assertEqual([a.title for a in articles],
+                         ['en title 1', 'en title 2'])
+
+        t = Template('{% load multilingual_tags %}'
+                     '{% prefetch_translations articles "pl" as prefetched %}'
+                     '{% for a in prefetched %}{{ a.title_pl }};{% endfor %}')
+        self.assertEqual(t.render(Context({
+            'articles': QuerySet(Article).order_by('id')})),
+            'pl title 1;None;')
+
+
+if Count is not None:
+    class AggregationTestCase(TestCase):
+        def setUp(self):
+            Article.objects.all().delete()
+            Article.objects.create(title_en = 'a', title_pl = 'x')
+            Article.objects.create(title_en = 'b', title_pl = 'x')
+            Article.objects.create(title_en = 'c')
+
+        def test_aggregate(self):
+            multilingual.languages.set_default_language('en')
+            self.assertEqual(Article.objects.aggregate(Max('title_pl')),
+                             {'title_pl__max': 'x'})
+            self.assertEqual(Article.objects.aggregate(Max('title')),
+                             {'title__max': 'c'})
+            self.assertEqual(Article.objects.aggregate(Count('title'))['title__count'], 3)
+
+            multilingual.languages.set_default_language('pl')
+            self.assertEqual(Article.objects.aggregate(Count('title'))['title__count'], 2)
+
+        def test_values_grouping(self):
+            multilingual.languages.set_default_language('en')
+            rows = [(row['title_pl'], row['n']) for row in
+                    Article.objects.values('title_pl').annotate(n=Count('id'))]
+            rows.sort()
+            self.assertEqual(rows, [(None, 1), ('x', 2)])
@@ -1,7 +1,8 @@
 from django.contrib import admin
 from testproject.inline_registrations.models import (ArticleWithSimpleRegistration,
                                                      ArticleWithExternalInline,
-                                                     ArticleWithInternalInline)
+                                                     ArticleWithInternalInline,
+                                                     ArticleWithLazyInline)
 import multilingual
 
 ##########################################
@@ -29,3 +30,12 @@ class ArticleWithInternalInlineAdmin(multilingual.ModelAdmin):
         prepopulated_fields = {'slug_local': ('title',)}
 
 admin.site.register(ArticleWithInternalInline, ArticleWithInternalInlineAdmin)
+
+########################################
+# for ArticleWithLazyInline
+
+class ArticleWithLazyInlineAdmin(multilingual.ModelAdmin):
+    class Translation(multilingual.TranslationModelAdmin):
+        lazy_languages = True
+
+admin.site.register(ArticleWithLazyInline, ArticleWithLazyInlineAdmin)
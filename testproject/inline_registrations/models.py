@@ -36,3 +36,14 @@ class ArticleWithInternalInline(models.Model):
         title = models.CharField(blank=True, null=False, max_length=250)
         contents = models.TextField(blank=True, null=False)
 
+class ArticleWithLazyInline(models.Model):
+    """
+    This model will be registered with a ModelAdmin that loads the
+    translations on demand.
+    """
+    slug_global = models.SlugField(blank=True, null=False)
+
+    class Translation(multilingual.Translation):
+        slug_local = models.SlugField(blank=True, null=False)
+        title = models.CharField(blank=True, null=False, max_length=250)
+        contents = models.TextField(blank=True, null=False)
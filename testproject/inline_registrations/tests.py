@@ -1,7 +1,13 @@
+from django.contrib.admin.sites import AdminSite
+from django.http import HttpRequest
+import multilingual
+from multilingual.testcases import MultilingualTestCase
 from testproject.utils import AdminTestCase
+from testproject.inline_registrations.admin import ArticleWithExternalInlineAdmin
 from testproject.inline_registrations.models import (ArticleWithSimpleRegistration,
                                                      ArticleWithExternalInline,
-                                                     ArticleWithInternalInline)
+                                                     ArticleWithInternalInline,
+                                                     ArticleWithLazyInline)
 
 class SimpleRegistrationTestCase(AdminTestCase):
     def test_add(self):
@@ -145,4 +151,115 @@ class InternalInlineTestCase(AdminTestCase):
         self.assertEqual(art.slug_local_pl, 'slug-pl')
         self.assertEqual(art.slug_local_zh_cn, 'slug-cn')
 
-        
+
+class LazyInlineTestCase(AdminTestCase):
+    def test_change(self):
+        ArticleWithLazyInline.objects.all().delete()
+        multilingual.set_default_language('en')
+        art = ArticleWithLazyInline.objects.create(slug_global='article',
+                                                   title_en='title en',
+                                                   title_pl='title pl')
+        art = ArticleWithLazyInline.objects.get(pk=art.pk)
+
+        path = '/admin/inline_registrations/articlewithlazyinline/%s/' % art.pk
+
+        # only the translation in the default language is in the form
+        resp = self.client.get(path)
+        self.assertEqual(resp.status_code, 200)
+        self.assertContains(resp, 'title en')
+        self.assertNotContains(resp, 'title pl')
+        self.assertContains(resp, 'href="translations/pl/"')
+
+        # the other ones can be loaded separately
+        resp = self.client.get(path + 'translations/pl/')
+        self.assertEqual(resp.status_code, 200)
+        self.assertContains(resp, 'title pl')
+        resp = self.client.get(path + 'translations/xx/')
+        self.assertEqual(resp.status_code, 404)
+
+        # submit only the english translation
+        resp = self.client.post(path,
+                                {'slug_global': 'article',
+                                 'translations-TOTAL_FORMS': '3',
+                                 'translations-INITIAL_FORMS': '2',
+                                 'translations-0-id': str(art.get_translation('en').id),
+                                 'translations-0-title': 'new title en',
+                                 'translations-0-language_id': '1',
+                                 })
+        self.assertEqual(resp.status_code, 302)
+        art = ArticleWithLazyInline.objects.get(pk=art.pk)
+        self.assertEqual(art.title_en, 'new title en')
+        self.assertEqual(art.title_pl, 'title pl')
+        self.assertEqual(art.translations.count(), 2)
+
+
+class ChangeListQueryTestCase(MultilingualTestCase):
+    def setUp(self):
+        ArticleWithExternalInline.objects.all().delete()
+        self.model_admin = ArticleWithExternalInlineAdmin(
+            ArticleWithExternalInline, AdminSite())
+
+    def get_titles(self):
+        """
+        Return the titles of articles in the change list.
+        """
+        qs = self.model_admin.changelist_queryset(HttpRequest())
+        return [(a.title, a.title_any) for a in qs]
+
+    def test_query_count(self):
+        multilingual.set_default_language('en')
+        ArticleWithExternalInline.objects.create(title_en='title en 1')
+        self.assertMaxQueries(1, self.get_titles)
+        for i in range(5):
+            ArticleWithExternalInline.objects.create(
+                title_en='title en', title_pl='title pl',
+                title_zh_cn='title zh-cn')
+        titles = self.assertMaxQueries(1, self.get_titles)
+        self.assertEqual(len(titles), 6)
+
+    def test_other_views(self):
+        article = ArticleWithExternalInline.objects.create(
+            title_en='title en', title_pl='title pl')
+        # english is neither the default language nor its fallback
+        multilingual.set_default_language('pl')
+        request = HttpRequest()
+        self.failIf(1 in self.model_admin.get_list_language_ids(request))
+        # not the change list: all the languages are available
+        article = self.model_admin.queryset(request).get(pk=article.pk)
+        self.assertEqual(article.title_en, 'title en')
+
+
+class TranslationGridTestCase(AdminTestCase):
+    def test_translate(self):
+        ArticleWithSimpleRegistration.objects.all().delete()
+        multilingual.set_default_language('en')
+        art_1 = ArticleWithSimpleRegistration.objects.create(
+            slug_global='article-1', title_en='title en 1', title_pl='title pl 1')
+        art_2 = ArticleWithSimpleRegistration.objects.create(
+            slug_global='article-2', title_en='title en 2')
+
+        path = '/admin/inline_registrations/articlewithsimpleregistration/translate/'
+        resp = self.client.get(path + '?source=en&target=pl')
+        self.assertEqual(resp.status_code, 200)
+        self.assertContains(resp, 'title en 2')
+        self.assertContains(resp, 'value="title pl 1"')
+
+        resp = self.client.post(path + '?source=en&target=pl',
+                                {'t-%s-title' % art_1.pk: 'new title pl 1',
+                                 't-%s-title' % art_2.pk: 'title pl 2',
+                                 't-%s-contents' % art_2.pk: '',
+                                 # ignored: malformed or unknown objects
+                                 't-x-title': 'bad',
+                                 't-title': 'bad',
+                                 't-%s-title' % (art_2.pk + 100): 'missing'})
+        self.assertEqual(resp.status_code, 302)
+
+        art_1 = ArticleWithSimpleRegistration.objects.get(pk=art_1.pk)
+        art_2 = ArticleWithSimpleRegistration.objects.get(pk=art_2.pk)
+        self.assertEqual(art_1.title_pl, 'new title pl 1')
+        self.assertEqual(art_1.title_en, 'title en 1')
+        self.assertEqual(art_2.title_pl, 'title pl 2')
+        self.assertEqual(art_2.contents_pl, '')
+        self.assertEqual(art_2.translations.count(), 2)
+        self.assertEqual(ArticleWithSimpleRegistration._meta.translation_model
+                         .objects.filter(master=art_2.pk + 100).count(), 0)
@@ -0,0 +1,19 @@
+"""
+Test models for translations stored in a JSON document.
+"""
+
+from django.db import models
+import multilingual
+
+class Place(models.Model):
+    code = models.CharField(max_length=20)
+
+    class Translation(multilingual.Translation):
+        name = models.CharField(max_length=100)
+        description = models.TextField(blank=True)
+
+        class Meta:
+            storage = 'json'
+
+    class Meta:
+        ordering = ('code',)
@@ -0,0 +1,69 @@
+import multilingual
+
+from multilingual.testcases import MultilingualTestCase
+
+from testproject.json_storage.models import Place
+
+
+class JSONStorageTestCase(MultilingualTestCase):
+    def setUp(self):
+        multilingual.set_default_language('en')
+        Place.objects.create(code='a', name_en='Warsaw', name_pl='Warszawa')
+        Place.objects.create(code='b', name_pl='Krakow', name_zh_cn='Kelakefu')
+        Place.objects.create(code='c')
+
+    def test_document(self):
+        p = Place.objects.get(code='a')
+        self.assertEqual(p.translations, {'en': {'name': 'Warsaw'},
+                                          'pl': {'name': 'Warszawa'}})
+        self.failIf(hasattr(Place._meta, 'translation_model'))
+
+    def test_get_and_set(self):
+        p = Place.objects.get(code='a')
+        self.assertEqual(p.name, 'Warsaw')
+        self.assertEqual(p.get_name('pl'), 'Warszawa')
+        self.assertEqual(p.name_zh_cn, None)
+        p.name = 'Warszawa (en)'
+        p.set_description('Stolica', 'pl')
+        # the existence check of Model.save_base and one UPDATE, whatever
+        # the number of changed languages
+        self.assertMaxQueries(2, p.save)
+        p = Place.objects.get(code='a')
+        self.assertEqual(p.name_en, 'Warszawa (en)')
+        self.assertEqual(p.description_pl, 'Stolica')
+
+        p = Place.objects.all().for_language('pl').get(code='a')
+        self.assertEqual(p.name, 'Warszawa')
+
+    def test_fallback(self):
+        p = Place.objects.get(code='b')
+        self.assertEqual(p.name, None)
+        self.assertEqual(p.name_any, 'Kelakefu')
+        self.assertEqual(Place.objects.get(code='c').name_any, None)
+
+    def test_filter_and_order(self):
+        codes = lambda qs: [p.code for p in qs]
+        self.assertEqual(codes(Place.objects.filter(name='Warsaw')), ['a'])
+        self.assertEqual(codes(Place.objects.filter(name_pl__startswith='K')),
+                         ['b'])
+        self.assertEqual(codes(Place.objects.exclude(name_pl='Krakow')),
+                         ['a', 'c'])
+        self.assertEqual(codes(Place.objects.all().any_language()
+                               .filter(name__startswith='Ke')),
+                         ['b'])
+        self.assertEqual(codes(Place.objects.filter(name_pl__isnull=False)
+                               .order_by('-name_pl')),
+                         ['a', 'b'])
+        self.assertEqual(codes(Place.objects.filter(name_pl__isnull=False)
+                               .for_language('pl').order_by('name')),
+                         ['b', 'a'])
+        self.assertEqual(
+            list(Place.objects.filter(code='a').values_list('name', 'name_pl')),
+            [('Warsaw', 'Warszawa')])
+
+    def test_translation_exists(self):
+        codes = lambda qs: [p.code for p in qs]
+        self.assertEqual(codes(Place.objects.all().has_translation('pl')),
+                         ['a', 'b'])
+        self.assertEqual(codes(Place.objects.all().missing_translation('en')),
+                         ['b', 'c'])
@@ -0,0 +1,59 @@
+import cPickle
+
+from django.db import models
+from django.test import TestCase
+import multilingual
+
+from testproject.language_attrs import models as models_module
+
+
+class LanguageAttrsTestCase(TestCase):
+    def define_model(self, name):
+        class Translation(multilingual.Translation):
+            title = models.CharField(max_length=100)
+        return models.base.ModelBase(name, (models.Model,), {
+            '__module__': models_module.__name__,
+            'Translation': Translation,
+            })
+
+    def test_instantiation(self):
+        model = self.define_model('LazyAttrsItem')
+        self.assert_('title' in model.__dict__)
+        self.assert_('title_pl' not in model.__dict__)
+
+        model()
+        self.assert_('title_pl' in model.__dict__)
+        self.assertEqual(model.__dict__['title_zh_cn_any'].language_id, 3)
+        self.assert_(model.__dict__['title_zh_cn_any'].fallback)
+
+    def test_class_attribute(self):
+        model = self.define_model('LazyAttrsOtherItem')
+        self.assertEqual(model.title_zh_cn.admin_order_field, 'title_zh_cn')
+        self.assertRaises(AttributeError, getattr, model, 'title_de')
+
+    def test_other_models(self):
+        # only multilingual models get the lookup hook
+        self.failIf(hasattr(models.base.ModelBase, '__getattr__'))
+        model = models.base.ModelBase('NotMultilingualItem', (models.Model,), {
+            '__module__': models_module.__name__,
+            })
+        self.assertEqual(type(model), models.base.ModelBase)
+
+    def test_unpickling(self):
+        model = self.define_model('LazyAttrsPickledItem')
+        # pickle needs to find the model in its module
+        models_module.LazyAttrsPickledItem = model
+        try:
+            # an instance pickled by another process: the class is not
+            # used in this one before unpickling
+            item = model.__new__(model)
+            item.id = None
+            data = cPickle.dumps(item, 2)
+            self.assert_('title_pl' not in model.__dict__)
+
+            item = cPickle.loads(data)
+            self.assert_(isinstance(item, model))
+            self.assertEqual(item.id, None)
+            self.assertEqual(model.__dict__['title_pl'].language_id, 2)
+        finally:
+            del models_module.LazyAttrsPickledItem
@@ -0,0 +1,84 @@
+from django.conf import settings
+from django.http import HttpRequest, HttpResponse
+from django.test import TestCase
+from multilingual.languages import get_default_language
+from multilingual.middleware import (LanguageRoutingMiddleware,
+                                     TranslationStatsMiddleware)
+
+from testproject.articles.models import Category
+
+
+class LanguageRoutingMiddlewareTestCase(TestCase):
+    def process(self, path='/', host='example.com', accept_language=None):
+        request = HttpRequest()
+        request.path = request.path_info = path
+        request.META['HTTP_HOST'] = host
+        if accept_language:
+            request.META['HTTP_ACCEPT_LANGUAGE'] = accept_language
+        middleware = LanguageRoutingMiddleware()
+        middleware.process_request(request)
+        response = middleware.process_response(request, HttpResponse())
+        return request, response
+
+    def test_prefix(self):
+        request, response = self.process('/zh-cn/about/')
+        self.assertEqual(request.path_info, '/about/')
+        self.assertEqual(get_default_language(), 3)
+        self.assertEqual(response['Content-Language'], 'zh-cn')
+
+        request, response = self.process('/pl')
+        self.assertEqual(request.path_info, '/')
+        self.assertEqual(get_default_language(), 2)
+
+        request, response = self.process('/plan/')
+        self.assertEqual(request.path_info, '/plan/')
+        self.assertEqual(get_default_language(), 1)
+
+    def test_subdomain(self):
+        request, response = self.process(host='pl.example.com')
+        self.assertEqual(get_default_language(), 2)
+
+    def test_header(self):
+        request, response = self.process(accept_language='de, pl-PL;q=0.8, en;q=0.5')
+        self.assertEqual(get_default_language(), 2)
+        self.assert_('Accept-Language' in response['Vary'])
+
+        request, response = self.process(accept_language='de')
+        self.assertEqual(get_default_language(), 1)
+
+
+class TranslationStatsMiddlewareTestCase(TestCase):
+    def test_stats(self):
+        category = Category.objects.create(name_en='cat', name_pl='kat')
+        request = HttpRequest()
+        middleware = TranslationStatsMiddleware()
+        middleware.process_request(request)
+        stats = request.multilingual_stats
+
+        categories = list(Category.objects.filter(name_en='cat'))
+        self.assertEqual(stats['queries'], 1)
+        self.assertEqual(stats['data-joins'], 3)
+        self.assertEqual(stats['lookup-joins'], 1)
+
+        self.assertEqual(categories[0].name_zh_cn, None)
+        self.assertEqual(stats['missing'], 1)
+        self.assertEqual(categories[0].name_zh_cn_any, 'kat')
+        self.assertEqual(stats['fallbacks-used'], 1)
+
+        # an object created without the query set loads its
+        # translations separately
+        self.assertEqual(Category(id=category.id).name_en, 'cat')
+        self.assertEqual(stats['cache-fallbacks'], 1)
+
+        categories[0].name_en = 'cat 2'
+        categories[0].save()
+        self.assertEqual(stats['saves'], 2)
+
+        old_debug = settings.DEBUG
+        settings.DEBUG = True
+        try:
+            response = middleware.process_response(request, HttpResponse())
+        finally:
+            settings.DEBUG = old_debug
+        self.assertEqual(response['X-Multilingual-Saves'], '2')
+        self.assertEqual(response['X-Multilingual-Fallbacks-Used'], '1')
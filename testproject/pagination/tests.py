@@ -0,0 +1,36 @@
+from django.test import TestCase
+from multilingual.pagination import KeysetPaginator
+
+from testproject.articles.models import Category
+
+
+class KeysetPaginatorTestCase(TestCase):
+    def test_pages(self):
+        categories = [Category.objects.create(name_en=name, name_pl='kat')
+                      for name in ['a', 'b', 'b', 'c', 'd']]
+        # not included: no english translation
+        untranslated = Category.objects.create(name_pl='kat')
+        # leave out the category of the initial_data fixture
+        queryset = Category.objects.filter(
+            id__in=[c.id for c in categories] + [untranslated.id])
+        paginator = KeysetPaginator(queryset, 'name', 2, language='en')
+        ids = lambda page: [c.id for c in page.object_list]
+
+        page = paginator.page()
+        self.assertEqual(ids(page), [c.id for c in categories[:2]])
+        self.failIf(page.has_previous())
+        self.assertEqual(page.next_key(), ('b', categories[1].id))
+
+        page = paginator.page(after=page.next_key())
+        self.assertEqual(ids(page), [c.id for c in categories[2:4]])
+        page = paginator.page(after=page.next_key())
+        self.assertEqual(ids(page), [categories[4].id])
+        self.failIf(page.has_next())
+
+        page = paginator.page(before=page.previous_key())
+        self.assertEqual(ids(page), [c.id for c in categories[2:4]])
+        self.assert_(page.has_previous())
+
+        paginator = KeysetPaginator(queryset, 'name_en', 3, descending=True)
+        self.assertEqual(ids(paginator.page()),
+                         [categories[4].id, categories[3].id, categories[2].id])
@@ -0,0 +1,20 @@
+"""
+Test models for translation tables partitioned by language.
+"""
+
+from django.db import models
+import multilingual
+
+class Book(models.Model):
+    isbn = models.CharField(max_length=20)
+
+    class Translation(multilingual.Translation):
+        title = models.CharField(max_length=200)
+        summary = models.TextField(blank=True)
+
+        class Meta:
+            partition_by_language = True
+            indexed_fields = ('title',)
+
+    class Meta:
+        ordering = ('isbn',)
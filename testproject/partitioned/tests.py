@@ -0,0 +1,94 @@
+import multilingual
+
+from multilingual.management.commands.translation_indexes import get_index_sql
+from multilingual.testcases import MultilingualTestCase, get_translation_joins
+from multilingual.translation import prefetch_translations
+from multilingual.utils import get_translation_model
+
+from testproject.partitioned.models import Book
+
+
+class PartitionedTranslationsTestCase(MultilingualTestCase):
+    def setUp(self):
+        multilingual.set_default_language('en')
+        Book.objects.create(isbn='1', title_en='Solaris', title_pl='Solaris (pl)')
+        Book.objects.create(isbn='2', title_pl='Cyberiada',
+                            title_zh_cn='Cyberiad (zh)')
+        Book.objects.create(isbn='3')
+
+    def test_models(self):
+        trans_opts = Book._meta.translation_model._meta
+        self.assertEqual(sorted(trans_opts.language_models.keys()), [1, 2, 3])
+        model = get_translation_model(Book._meta, 'pl')
+        self.assertEqual(model._meta.db_table, 'partitioned_book_translation_pl')
+        self.assertEqual(
+            [t.title for t in model.objects.order_by('title')],
+            ['Cyberiada', 'Solaris (pl)'])
+        self.assertEqual(get_translation_model(Book._meta, 'en').objects.count(),
+                         1)
+
+    def test_read_and_write(self):
+        book = Book.objects.get(isbn='1')
+        self.assertEqual(book.title, 'Solaris')
+        self.assertEqual(book.title_pl, 'Solaris (pl)')
+        self.assertEqual(book.title_zh_cn, None)
+        book.title_zh_cn = 'Solaris (zh)'
+        book.title_en = 'Solaris (en)'
+        book.save()
+        book = Book.objects.get(isbn='1')
+        self.assertEqual(book.title_en, 'Solaris (en)')
+        self.assertEqual(book.title_zh_cn, 'Solaris (zh)')
+        self.assertEqual(Book.objects.get(isbn='2').title_any, 'Cyberiad (zh)')
+
+    def test_joins(self):
+        qs = Book.objects.filter(title_pl__startswith='Cyber')
+        sql = qs.query.as_sql()[0]
+        self.failIf('language_id =' in sql)
+        self.assert_('partitioned_book_translation_pl' in sql)
+        self.assertEqual(get_translation_joins(qs), ([1, 2, 3], [2]))
+        self.assertEqual([b.isbn for b in qs], ['2'])
+
+    def test_queries(self):
+        isbns = lambda qs: [b.isbn for b in qs]
+        self.assertEqual(isbns(Book.objects.order_by('-title_pl')),
+                         ['1', '2', '3'])
+        self.assertEqual(isbns(Book.objects.all().any_language()
+                               .filter(title__startswith='Cyber')),
+                         ['2'])
+        self.assertEqual(isbns(Book.objects.all().has_translation('pl')),
+                         ['1', '2'])
+        self.assertEqual(isbns(Book.objects.all().missing_translation('en')),
+                         ['2', '3'])
+        self.assertEqual(
+            Book.objects.filter(title_pl__isnull=False).count(), 2)
+
+    def test_delete(self):
+        book = Book.objects.get(isbn='1')
+        book.delete()
+        self.assertEqual(Book.objects.count(), 2)
+        self.assertEqual(get_translation_model(Book._meta, 'pl').objects
+                         .filter(master=book.id).count(), 0)
+        self.assertEqual(get_translation_model(Book._meta, 'pl').objects
+                         .count(), 1)
+
+    def test_prefetch(self):
+        books = list(Book.objects.all().with_languages())
+        for book in books:
+            del book._translation_data_loaded
+        self.assertMaxQueries(3, prefetch_translations, books)
+        self.assertMaxQueries(0, lambda: [book.title_any for book in books])
+        self.assertEqual([book.title_any for book in books],
+                         ['Solaris', 'Cyberiad (zh)', None])
+
+    def test_coverage(self):
+        coverage = Book.Translation.objects.coverage()
+        self.assertEqual(coverage[1]['count'], 1)
+        self.assertEqual(coverage[2]['count'], 2)
+        self.assertEqual(coverage[2]['fields']['title'], 2)
+
+    def test_indexes(self):
+        names = [name for name, sql in get_index_sql(Book, True)]
+        self.assertEqual(sorted(names),
+                         ['partitioned_book_translation_en_title',
+                          'partitioned_book_translation_pl_title',
+                          'partitioned_book_translation_zh_cn_title'])
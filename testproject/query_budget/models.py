@@ -0,0 +1,2 @@
+# This application has no models of its own; it only contains tests
+# locking down the number of queries made by the other applications.
@@ -0,0 +1,49 @@
+from django.contrib.sites.models import Site
+import multilingual
+from multilingual.flatpages.models import MultilingualFlatPage
+from multilingual.languages import get_fallback_language_ids
+from multilingual.testcases import MultilingualTestCase
+
+from testproject.articles.models import Category
+
+
+class ArticlesQueryBudgetTestCase(MultilingualTestCase):
+    def setUp(self):
+        multilingual.set_default_language('en')
+        for i in range(5):
+            Category.objects.create(name_en='cat %d' % i,
+                                    name_pl='kat %d' % i)
+
+    def test_category_list(self):
+        # the names are fetched together with the categories
+        resp = self.assertMaxTranslationQueries(0, self.client.get, '/')
+        self.assertContains(resp, 'kat 4')
+        self.assertMaxQueries(1, lambda: [c.name_any
+                                          for c in Category.objects.all()])
+
+    def test_joins(self):
+        self.assertTranslationJoins(Category.objects.all(),
+                                    ['en', 'pl', 'zh-cn'])
+        self.assertTranslationJoins(
+            Category.objects.filter(name__startswith='cat'),
+            ['en', 'pl', 'zh-cn'], ['en'])
+        self.assertTranslationJoins(
+            Category.objects.filter(name_pl='kat 1').with_languages('pl'),
+            ['pl'], ['pl'])
+
+
+class FlatpagesQueryBudgetTestCase(MultilingualTestCase):
+    def setUp(self):
+        page = MultilingualFlatPage.objects.create(url='/about/',
+                                                   title_en='About',
+                                                   title_pl='O nas')
+        page.sites.add(Site.objects.get_current())
+
+    def test_view(self):
+        resp = self.assertMaxTranslationQueries(0, self.client.get, '/about/')
+        self.assertContains(resp, 'About')
+
+    def test_joins(self):
+        pages = MultilingualFlatPage.objects.all().for_language(2).with_languages(
+            *get_fallback_language_ids(2))
+        self.assertTranslationJoins(pages, ['pl', 'zh-cn'])
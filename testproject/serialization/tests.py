@@ -0,0 +1,40 @@
+from django.core import serializers
+from django.test import TestCase
+from django.utils import simplejson
+from multilingual.serializers import Deserializer
+
+from testproject.articles.models import Category
+
+
+class SerializerTestCase(TestCase):
+    def test_round_trip(self):
+        parent = Category.objects.create(name_en='cat', name_pl='kat',
+                                         description_en='A category')
+        child = Category.objects.create(name_en='cat 2', parent=parent)
+        ids = [parent.id, child.id]
+        data = serializers.serialize(
+            'mljson', Category.objects.filter(id__in=ids).order_by('id'),
+            chunk_size=1)
+        lines = data.splitlines()
+        self.assertEqual(len(lines), 2)
+        self.assertEqual(simplejson.loads(lines[0])['translations'], {
+                'en': {'name': 'cat', 'description': 'A category'},
+                'pl': {'name': 'kat', 'description': ''}})
+        # translations are serialized with their objects only
+        self.assertEqual(serializers.serialize(
+                'mljson', Category._meta.translation_model.objects.all()), '')
+
+        Category.objects.filter(id__in=ids).delete()
+        for obj in serializers.deserialize('mljson', data):
+            obj.save()
+        category = Category.objects.get(id=parent.id)
+        self.assertEqual((category.name_en, category.name_pl,
+                          category.description_en),
+                         ('cat', 'kat', 'A category'))
+        self.assertEqual(Category.objects.get(parent=parent).name, 'cat 2')
+
+        # existing objects are updated; serializers.deserialize() takes
+        # no options, so chunk_size is passed to the Deserializer itself
+        for obj in Deserializer(data.replace('kat', 'kot'), chunk_size=1):
+            obj.save()
+        self.assertEqual(Category.objects.get(id=parent.id).name_pl, 'kot')
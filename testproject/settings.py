@@ -37,6 +37,9 @@ LANGUAGES = [['en', 'English'], # id=1
 
 DEFAULT_LANGUAGE = 1
 
+# the serialization format with nested translations
+SERIALIZATION_MODULES = {'mljson': 'multilingual.serializers'}
+
 ##############################################
 
 SITE_ID = 1
@@ -95,6 +98,10 @@ INSTALLED_APPS = (
     'multilingual',
     'multilingual.flatpages',
     'testproject.articles',
+    'testproject.backfill',
+    'testproject.column_storage',
+    'testproject.context_processors',
+    'testproject.denormalized',
     'testproject.fallback',
     'testproject.inline_registrations',
     'testproject.issue_15',
@@ -103,6 +110,17 @@ INSTALLED_APPS = (
     'testproject.issue_29',
     'testproject.issue_37',
     'testproject.issue_61',
+    'testproject.json_storage',
+    'testproject.language_attrs',
+    'testproject.middleware',
+    'testproject.pagination',
+    'testproject.partitioned',
+    'testproject.query_budget',
+    'testproject.serialization',
+    'testproject.template_tags',
+    'testproject.translation_coverage',
+    'testproject.translation_exchange',
+    'testproject.translation_indexes',
 )
 
 TEMPLATE_CONTEXT_PROCESSORS = (
@@ -0,0 +1,76 @@
+from django.template import Context, Template, VariableDoesNotExist
+from django.test import TestCase
+import multilingual
+
+from testproject.articles.models import Category
+
+
+class TranslationForm(object):
+    """
+    A form exposing translation forms the way edit_translation expects
+    them: <form>.<translation model name>.<language index>.<field>.
+    """
+
+    class _meta:
+        model = Category
+
+    def __init__(self, names):
+        self.categorytranslation = [{'name': name} for name in names]
+
+
+class EditTranslationTestCase(TestCase):
+    def render(self, source, **context):
+        return Template('{% load multilingual_tags %}' + source).render(
+            Context(context))
+
+    def test_edit_translation(self):
+        form = TranslationForm(['name en', 'name pl', 'name zh-cn'])
+        self.assertEqual(self.render('{% edit_translation form name "pl" %}',
+                                     form=form, code='zh-cn'), 'name pl')
+        self.assertEqual(self.render('{% edit_translation form name code %}',
+                                     form=form, code='zh-cn'), 'name zh-cn')
+
+    def test_failed_lookup(self):
+        # rendered without the template, which would wrap the exception
+        # in a TemplateSyntaxError with TEMPLATE_DEBUG
+        node = lambda source: Template(
+            '{% load multilingual_tags %}' + source).nodelist[-1]
+        context = Context({'form': TranslationForm(['name en', 'name pl'])})
+        self.assertRaises(VariableDoesNotExist,
+                          node('{% edit_translation form title "pl" %}').render,
+                          context)
+        self.assertRaises(VariableDoesNotExist,
+                          node('{% edit_translation missing name "pl" %}').render,
+                          context)
+
+
+class MultilingualCacheTestCase(TestCase):
+    template = ('{% load multilingual_tags %}'
+                '{% multilingual_cache 500 names for categories %}'
+                '{% for c in categories %}{{ c.name }};{% endfor %}'
+                '{% endmultilingual_cache %}')
+
+    def render(self):
+        categories = Category.objects.filter(pk=self.category.pk)
+        return Template(self.template).render(Context({'categories': categories}))
+
+    def test_cache(self):
+        self.category = Category.objects.create(name_en='cat', name_pl='kat')
+
+        multilingual.set_default_language('en')
+        self.assertEqual(self.render(), 'cat;')
+        multilingual.set_default_language('pl')
+        self.assertEqual(self.render(), 'kat;')
+
+        # the fragment is taken from the cache (update() does not
+        # send any signals)...
+        Category._meta.translation_model.objects.filter(
+            master=self.category, language_id=2).update(name='changed')
+        self.assertEqual(self.render(), 'kat;')
+
+        # ...until a translation changes
+        self.category.name_pl = 'nowa kat'
+        self.category.save()
+        self.assertEqual(self.render(), 'nowa kat;')
+        multilingual.set_default_language('en')
+        self.assertEqual(self.render(), 'cat;')
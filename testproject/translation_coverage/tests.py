@@ -0,0 +1,36 @@
+from django.test import TestCase
+
+from testproject.articles.models import Category
+
+
+class TranslationCoverageTestCase(TestCase):
+    def setUp(self):
+        # do not count the categories of the initial_data fixture
+        Category.objects.all().delete()
+
+    def test_coverage(self):
+        parent = Category.objects.create(name_en='cat', name_pl='kat',
+                                         description_en='A category')
+        Category.objects.create(name_en='cat 2', parent=parent)
+        manager = Category._meta.translation_model.objects
+
+        coverage = manager.coverage()
+        self.assertEqual(coverage[1], {'count': 2,
+                                       'fields': {'name': 2, 'description': 1}})
+        self.assertEqual(coverage[2], {'count': 1,
+                                       'fields': {'name': 1, 'description': 0}})
+        self.assert_(3 not in coverage)
+
+        coverage = manager.coverage(group_by='parent', fields=['description'])
+        self.assertEqual(coverage, {
+                None: {1: {'count': 1, 'fields': {'description': 1}},
+                       2: {'count': 1, 'fields': {'description': 0}}},
+                parent.id: {1: {'count': 1, 'fields': {'description': 0}}},
+                })
+
+    def test_cached_coverage(self):
+        Category.objects.create(name_en='cat')
+        manager = Category._meta.translation_model.objects
+        self.assertEqual(manager.cached_coverage()[1]['count'], 1)
+        Category.objects.create(name_en='cat 2')
+        self.assertEqual(manager.cached_coverage()[1]['count'], 2)
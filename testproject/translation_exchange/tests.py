@@ -0,0 +1,55 @@
+import os
+import tempfile
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from testproject.articles.models import Category
+
+
+class TranslationExchangeTestCase(TestCase):
+    def import_data(self, data, suffix):
+        fd, filename = tempfile.mkstemp(suffix)
+        os.close(fd)
+        try:
+            open(filename, 'w').write(data.encode('utf-8'))
+            call_command('import_translations', filename, verbosity=0)
+        finally:
+            os.remove(filename)
+
+    def test_round_trip(self):
+        first = Category.objects.create(name_en='cat', name_pl='kat',
+                                        description_en='A category')
+        second = Category.objects.create(name_en='dog\n"two"')
+        exported = {}
+        for format in ('xliff', 'po'):
+            fd, filename = tempfile.mkstemp()
+            os.close(fd)
+            try:
+                call_command('export_translations', 'articles.Category',
+                             target='pl', format=format, output=filename,
+                             untranslated=(format == 'po'))
+                exported[format] = open(filename).read().decode('utf-8')
+            finally:
+                os.remove(filename)
+        self.assert_(u'<target>kat</target>' in exported['xliff'])
+        self.assert_(u'msgctxt "articles.category:%d:name"\nmsgid ""\n'
+                     u'"dog\\n"\n"\\"two\\""\nmsgstr ""\n' % second.id
+                     in exported['po'])
+        # translated fields are not exported with --untranslated
+        self.failIf(u'msgid "cat"' in exported['po'])
+
+        self.import_data(exported['xliff'].replace(u'<target>kat</target>',
+                                                   u'<target>kot</target>'),
+                         '.xlf')
+        self.import_data(u'msgid ""\nmsgstr ""\n"Language: pl\\n"\n\n'
+                         u'msgctxt "articles.category:%d:description"\n'
+                         u'msgid "A category"\nmsgstr "opis"\n\n'
+                         u'msgctxt "articles.category:%d:name"\n'
+                         u'msgid "dog"\nmsgstr "pies"\n' % (first.id, second.id),
+                         '.po')
+        first = Category.objects.get(id=first.id)
+        second = Category.objects.get(id=second.id)
+        self.assertEqual((first.name_pl, first.description_pl),
+                         ('kot', 'opis'))
+        self.assertEqual(second.name_pl, 'pies')
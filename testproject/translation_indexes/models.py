@@ -0,0 +1,2 @@
+# This application has no models of its own; it only contains tests of
+# the translation_indexes management command.
@@ -0,0 +1,24 @@
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from multilingual.management.commands.translation_indexes import (
+    get_index_names, get_index_sql)
+
+from testproject.articles.models import Article, Category
+
+
+class TranslationIndexesTestCase(TestCase):
+    def test_indexes(self):
+        table = Article._meta.translation_model._meta.db_table
+        indexes = get_index_sql(Article, True)
+        self.assertEqual(len(indexes), 4)
+        self.assert_('language_id' in indexes[0][1])
+        self.assert_(indexes[1][1].endswith('= 1;'))
+        self.assertEqual(get_index_sql(Category, True), [])
+
+        call_command('translation_indexes', 'articles.Article', verbosity=0)
+        names = get_index_names(connection.cursor(), table)
+        for index_name, sql in indexes:
+            self.assert_(index_name in names)
+        # existing indexes are skipped
+        call_command('translation_indexes', 'articles.Article', verbosity=0)